@@ -1,10 +1,12 @@
 import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-import numpy_financial as npf
 import os
+from dataclasses import dataclass
+import input.code.Cash_Flow_Statement as CF
 
 
 def _get_results_path():
@@ -15,57 +17,17 @@ def _get_results_path():
     return os.path.join(output_dir, "RESULTS.xlsx")
 
 
-def CASHFLOW(CFS):
-    output_file = _get_results_path()
-    sheet_name = "CASH FLOW STATEMENT"
-
-    # 1) CFS DataFrame 저장
-    with pd.ExcelWriter(output_file) as writer:
-        CFS.to_excel(writer, sheet_name=sheet_name, index=True, header=False)
-
-    # 2) 불러오기
-    wb = load_workbook(output_file)
-    ws = wb[sheet_name]
-
-    # 3) 1행 스타일
-    for cell in ws[1]:
-        cell.fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-        cell.font = Font(name="Aptos Display", bold=True, color="FFFFFF")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    # 4) 첫 열 라벨 스타일
-    bold_rows = ["GROSS PROFIT", "EBIT", "EBT (Taxable Income)", "NET INCOME", "CASH FLOW"]
-    for i, cell in enumerate(ws['A'][2:], start=2):  # 2행부터
-        if cell.value in bold_rows:
-            cell.font = Font(name="Aptos Display", bold=True, color="000000")
-        else:
-            cell.font = Font(name="Aptos Display", bold=False, color="000000")
-        cell.alignment = Alignment(horizontal="left", vertical="center")
-
-    # 5) 첫 열 너비 자동 조정
-    max_length = max(len(str(cell.value)) for cell in ws['A'] if cell.value is not None)
-    ws.column_dimensions['A'].width = max_length + 2
-
-    # 6) 모든 셀 테두리 제거
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-        for cell in row:
-            cell.border = Border()
-
-    # 7) 주요 행 위에 굵은 상단선
-    for r, name_cell in enumerate(ws['A'], start=1):
-        if name_cell.value in bold_rows:
-            for cell in ws[r]:
-                cell.border = Border(top=Side(style="medium"))
-
-    # 8) 그리드 숨김
-    ws.sheet_view.showGridLines = False
-
-    wb.save(output_file)
-    return output_file
-
+def LCOE_COMPONENTS(CFS: pd.DataFrame, discountRate: float, electricityPrice, salesToRevenueRatio):
+    """
+    LCOE 계산만 수행 (RESULTS.xlsx 에 쓰지 않음)
+    - CFS: Cash Flow Statement DataFrame 또는 CF.CashFlowStatement
 
-def LCOE(CFS: pd.DataFrame, discountRate: float, electricityPrice, salesToRevenueRatio):
+    Returns:
+    - LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL
+    """
     def _row(row_name):
+        if isinstance(CFS, CF.CashFlowStatement):
+            return CFS[row_name]
         if row_name not in CFS.index:
             raise KeyError(f"'{row_name}' 행이 없습니다.")
         s = pd.to_numeric(CFS.loc[row_name], errors="coerce").fillna(0.0).values.astype(float)
@@ -110,198 +72,762 @@ def LCOE(CFS: pd.DataFrame, discountRate: float, electricityPrice, salesToRevenu
     LCOE_FUEL_IS = lcoe_fuel_num_is / npv_denom
     LCOE_TOTAL = LCOE_CON + LCOE_OM + LCOE_FUEL
 
-    # 엑셀 쓰기
-    path = _get_results_path()
-    sheet = "CASH FLOW STATEMENT"
-    wb = load_workbook(path)
-    ws = wb[sheet]
-
-    ws["G23"].value = float(LCOE_CON)
-    ws["I23"].value = float(LCOE_OM)
-    ws["K23"].value = float(LCOE_FUEL)
-    ws["D23"].value = float(LCOE_TOTAL)
-
-    ws["D22"].value = "LCOE"
-    ws["G22"].value = "Construction"
-    ws["I22"].value = "O&M"
-    ws["K22"].value = "Fuel"
-    ws["E23"].value = "[$/MWh]"
-    ws["F23"].value = "="
-    ws["H23"].value = "+"
-    ws["J23"].value = "+"
-
-    center_bold = Alignment(horizontal="center", vertical="center")
-    thick = Side(style="medium")
-    bold_border = Border(left=thick, right=thick, top=thick, bottom=thick)
-
-    result_cells = ["D23", "G23", "I23", "K23"]
-    for addr in result_cells:
-        cell = ws[addr]
-        cell.alignment = center_bold
-        cell.font = Font(bold=True, color="0070C0")
-        cell.fill = PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid")
-        cell.border = bold_border
-
-    label_cells = ["D22", "G22", "I22", "K22", "E23", "F23", "H23", "J23"]
-    for addr in label_cells:
-        c = ws[addr]
-        c.alignment = center_bold
-        c.font = Font(bold=True)
-
-    wb.save(path)
     return LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL
 
 
+def _cfs_row(CFS, row_name):
+    # DataFrame 또는 CF.CashFlowStatement 의 행 (float 배열)
+    if isinstance(CFS, CF.CashFlowStatement):
+        return CFS[row_name]
+    return CFS.loc[row_name].to_numpy(dtype=float)
+
+
+def _cfs_years(CFS):
+    if isinstance(CFS, CF.CashFlowStatement):
+        return CFS.years.tolist()
+    return CFS.columns.tolist()
+
+
+def LCOE(CFS: pd.DataFrame, discountRate: float, electricityPrice, salesToRevenueRatio):
+    """LCOE_COMPONENTS 와 같음 (RESULTS.xlsx 는 RESULTS 가 한 번에 작성)"""
+    return LCOE_COMPONENTS(CFS, discountRate, electricityPrice, salesToRevenueRatio)
+
+
 def IRR(CFS):
-    cash_flow = CFS.loc['CASH FLOW']
-    cashflows = cash_flow.values
+    """
+    CASH FLOW 행의 IRR (IRR_SOLVE, 해가 여러 개이면 0에 가장 가까운 해)
+
+    Returns:
+    - irr (해가 없으면 None)
+    """
     try:
-        irr = npf.irr(cashflows)
-        if np.isnan(irr):
+        irr, flag = IRR_SOLVE(_cfs_row(CFS, 'CASH FLOW'))
+        if flag[0] == IRR_NO_ROOT:
             print("IRR 계산 실패: 해가 존재하지 않음")
             return None
-
-        file_path = _get_results_path()
-        wb = load_workbook(file_path)
-        ws = wb['CASH FLOW STATEMENT']
-
-        ws['D25'].value = 'IRR'
-        ws['D25'].font = Font(bold=True)
-        ws['D25'].alignment = Alignment(horizontal='center')
-
-        ws['D26'].value = irr
-        ws['D26'].alignment = Alignment(horizontal='center')
-        ws['D26'].font = Font(bold=True, color='FF0000')
-        ws['D26'].fill = PatternFill(start_color='FFE6E6', end_color='FFE6E6', fill_type='solid')
-        ws['D26'].border = Border(
-            left=Side(style='medium'), right=Side(style='medium'),
-            top=Side(style='medium'), bottom=Side(style='medium')
-        )
-        ws['D26'].number_format = '0.00%'
-
-        ws['E26'].value = '[%]'
-        ws['E26'].font = Font(bold=True)
-        ws['E26'].alignment = Alignment(horizontal='center')
-
-        wb.save(file_path)
-        return irr
+        if flag[0] == IRR_MULTIPLE_ROOTS:
+            print("IRR 주의: 해가 여러 개 (0에 가장 가까운 해 사용)")
+        return float(irr[0])
     except Exception as e:
         print(f"IRR 계산 실패: {e}")
         return None
 
 
 def BEP(CFS):
+    """
+    누적 CASH FLOW 가 0 이 되는 연도 (연도 사이 선형 보간, 소수점 2자리)
+
+    Returns:
+    - bep (없으면 None)
+    """
     try:
-        cash_flow = CFS.loc['CASH FLOW']
-        years = CFS.columns.tolist()
-        cumulative_cash_flow = cash_flow.cumsum()
+        cumulative_cash_flow = np.cumsum(_cfs_row(CFS, 'CASH FLOW'))
+        years = _cfs_years(CFS)
 
         bep_year = None
         for i in range(len(cumulative_cash_flow) - 1):
-            if cumulative_cash_flow.iloc[i] < 0 and cumulative_cash_flow.iloc[i + 1] >= 0:
-                fraction = abs(cumulative_cash_flow.iloc[i]) / (
-                    abs(cumulative_cash_flow.iloc[i]) + cumulative_cash_flow.iloc[i + 1]
+            if cumulative_cash_flow[i] < 0 and cumulative_cash_flow[i + 1] >= 0:
+                fraction = abs(cumulative_cash_flow[i]) / (
+                    abs(cumulative_cash_flow[i]) + cumulative_cash_flow[i + 1]
                 )
                 bep_year = years[i] + fraction * (years[i + 1] - years[i])
                 break
 
         if bep_year is None:
-            if cumulative_cash_flow.iloc[-1] < 0:
+            if cumulative_cash_flow[-1] < 0:
                 print("BEP 없음: 전체 기간 손실")
                 return None
-            elif cumulative_cash_flow.iloc[0] >= 0:
+            elif cumulative_cash_flow[0] >= 0:
                 bep_year = float(years[0])
 
         if bep_year is not None:
-            bep_rounded = round(bep_year, 2)
-            file_path = _get_results_path()
-            wb = load_workbook(file_path)
-            ws = wb['CASH FLOW STATEMENT']
-
-            ws['D28'].value = 'BEP (Break Even Point)'
-            ws['D28'].font = Font(bold=True)
-            ws['D28'].alignment = Alignment(horizontal='center')
-
-            ws['D29'].value = bep_rounded
-            ws['D29'].font = Font(bold=True, color='006400')
-            ws['D29'].fill = PatternFill(start_color='E8F5E8', end_color='E8F5E8', fill_type='solid')
-            ws['D29'].border = Border(
-                left=Side(style='medium'), right=Side(style='medium'),
-                top=Side(style='medium'), bottom=Side(style='medium')
-            )
-            ws['D29'].alignment = Alignment(horizontal='center')
-            ws['D29'].number_format = '0.00'
-
-            ws['E29'].value = 'year'
-            ws['E29'].font = Font(bold=True)
-            ws['E29'].alignment = Alignment(horizontal='center')
-
-            wb.save(file_path)
-            return bep_rounded
+            return round(bep_year, 2)
         return None
     except Exception as e:
         print(f"BEP 계산 실패: {e}")
         return None
 
 
-def CONSTRUCTION_COST(CFS):
+def CONSTRUCTION_COST_COMPONENTS(CFS):
+    """
+    건설비 = CAPEX + 건설/운영 중 이자 (절대값)
+
+    Returns:
+    - construction_total, capex_total, interest_total (실패하면 None)
+    """
     try:
-        capex_total = CFS.loc['CAPEX'].sum()
-        interest_total = CFS.loc['INTEREST'].sum()
+        # 연도 순서대로 합산 (기존 DataFrame 합계와 같은 값)
+        capex_total = sum(_cfs_row(CFS, 'CAPEX').tolist())
+        interest_total = sum(_cfs_row(CFS, 'INTEREST').tolist())
         construction_total = capex_total + interest_total
-
-        file_path = _get_results_path()
-        wb = load_workbook(file_path)
-        ws = wb['CASH FLOW STATEMENT']
-
-        ws['D31'].value = 'Construction Cost'
-        ws['D31'].font = Font(bold=True)
-        ws['D31'].alignment = Alignment(horizontal='center')
-
-        ws['G31'].value = 'CAPEX'
-        ws['G31'].font = Font(bold=True)
-        ws['G31'].alignment = Alignment(horizontal='center')
-
-        ws['I31'].value = 'INTEREST'
-        ws['I31'].font = Font(bold=True)
-        ws['I31'].alignment = Alignment(horizontal='center')
-
-        ws['D32'].value = abs(construction_total)
-        ws['D32'].font = Font(bold=True, color='FF8C00')
-        ws['D32'].fill = PatternFill(start_color='FFE4B5', end_color='FFE4B5', fill_type='solid')
-        ws['D32'].alignment = Alignment(horizontal='center')
-        ws['D32'].number_format = '0.00'
-
-        ws['E32'].value = '[$M]'
-        ws['E32'].font = Font(bold=True)
-        ws['E32'].alignment = Alignment(horizontal='center')
-
-        ws['F32'].value = '='
-        ws['F32'].font = Font(bold=True)
-        ws['F32'].alignment = Alignment(horizontal='center')
-
-        ws['G32'].value = abs(capex_total)
-        ws['G32'].font = Font(bold=True, color='FF8C00')
-        ws['G32'].fill = PatternFill(start_color='FFE4B5', end_color='FFE4B5', fill_type='solid')
-        ws['G32'].alignment = Alignment(horizontal='center')
-        ws['G32'].number_format = '0.00'
-
-        ws['H32'].value = '+'
-        ws['H32'].font = Font(bold=True)
-        ws['H32'].alignment = Alignment(horizontal='center')
-
-        ws['I32'].value = abs(interest_total)
-        ws['I32'].font = Font(bold=True, color='FF8C00')
-        ws['I32'].fill = PatternFill(start_color='FFE4B5', end_color='FFE4B5', fill_type='solid')
-        ws['I32'].alignment = Alignment(horizontal='center')
-        ws['I32'].number_format = '0.00'
-
-        ws['J32'].value = '[$M]'
-        ws['J32'].font = Font(bold=True)
-        ws['J32'].alignment = Alignment(horizontal='center')
-
-        wb.save(file_path)
-        return abs(construction_total)
+        return abs(construction_total), abs(capex_total), abs(interest_total)
     except Exception as e:
         print(f"건설비 계산 실패: {e}")
         return None
+
+
+def CONSTRUCTION_COST(CFS):
+    components = CONSTRUCTION_COST_COMPONENTS(CFS)
+    return None if components is None else components[0]
+
+
+def METRICS(CFS, discountRate, electricityPrice, salesToRevenueRatio):
+    """
+    RESULTS.xlsx 에 쓰는 지표를 모두 계산 (파일 입출력 없음)
+
+    Returns:
+    - {'LCOE': (LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL), 'IRR': irr, 'BEP': bep,
+       'CONSTRUCTION_COST': (construction_total, capex_total, interest_total)}
+    """
+    return {
+        "LCOE": LCOE_COMPONENTS(CFS, discountRate, electricityPrice, salesToRevenueRatio),
+        "IRR": IRR(CFS),
+        "BEP": BEP(CFS),
+        "CONSTRUCTION_COST": CONSTRUCTION_COST_COMPONENTS(CFS),
+    }
+
+
+# RESULTS.xlsx 스타일 ###################################################################################################
+RESULTS_SHEET = "CASH FLOW STATEMENT"
+BOLD_ROWS = ["GROSS PROFIT", "EBIT", "EBT (Taxable Income)", "NET INCOME", "CASH FLOW"]
+
+_HEADER_STYLE = dict(fill=PatternFill(start_color="000000", end_color="000000", fill_type="solid"),
+                     font=Font(name="Aptos Display", bold=True, color="FFFFFF"),
+                     alignment=Alignment(horizontal="center", vertical="center"))
+_LABEL_ALIGNMENT = Alignment(horizontal="left", vertical="center")
+_CENTER = Alignment(horizontal="center")
+_MEDIUM_BOX = Border(left=Side(style="medium"), right=Side(style="medium"),
+                     top=Side(style="medium"), bottom=Side(style="medium"))
+
+
+def _label(value):
+    return dict(value=value, font=Font(bold=True), alignment=_CENTER)
+
+
+def _metric_cells(metrics):
+    """
+    지표 영역 셀 {주소: 스타일} (CFS 아래, 기존 RESULTS.xlsx 와 같은 위치)
+
+    Parameters:
+    - metrics: METRICS 의 반환값 (없는 지표는 쓰지 않음)
+    """
+    cells = {}
+
+    lcoe = metrics.get("LCOE")
+    if lcoe is not None:
+        LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = lcoe
+        center_bold = Alignment(horizontal="center", vertical="center")
+        result = dict(alignment=center_bold, font=Font(bold=True, color="0070C0"),
+                      fill=PatternFill(start_color="DDEBF7", end_color="DDEBF7", fill_type="solid"),
+                      border=Border(left=Side(style="medium"), right=Side(style="medium"),
+                                    top=Side(style="medium"), bottom=Side(style="medium")))
+        for addr, value in [("D23", LCOE_TOTAL), ("G23", LCOE_CON), ("I23", LCOE_OM), ("K23", LCOE_FUEL)]:
+            cells[addr] = dict(result, value=float(value))
+        for addr, value in [("D22", "LCOE"), ("G22", "Construction"), ("I22", "O&M"), ("K22", "Fuel"),
+                            ("E23", "[$/MWh]"), ("F23", "="), ("H23", "+"), ("J23", "+")]:
+            cells[addr] = dict(value=value, alignment=center_bold, font=Font(bold=True))
+
+    irr = metrics.get("IRR")
+    if irr is not None:
+        cells["D25"] = _label("IRR")
+        cells["D26"] = dict(value=irr, alignment=_CENTER, font=Font(bold=True, color="FF0000"),
+                            fill=PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid"),
+                            border=_MEDIUM_BOX, number_format="0.00%")
+        cells["E26"] = _label("[%]")
+
+    bep = metrics.get("BEP")
+    if bep is not None:
+        cells["D28"] = _label("BEP (Break Even Point)")
+        cells["D29"] = dict(value=bep, font=Font(bold=True, color="006400"),
+                            fill=PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid"),
+                            border=_MEDIUM_BOX, alignment=_CENTER, number_format="0.00")
+        cells["E29"] = _label("year")
+
+    construction_cost = metrics.get("CONSTRUCTION_COST")
+    if construction_cost is not None:
+        construction_total, capex_total, interest_total = construction_cost
+        cost = dict(font=Font(bold=True, color="FF8C00"),
+                    fill=PatternFill(start_color="FFE4B5", end_color="FFE4B5", fill_type="solid"),
+                    alignment=_CENTER, number_format="0.00")
+        cells["D31"] = _label("Construction Cost")
+        cells["G31"] = _label("CAPEX")
+        cells["I31"] = _label("INTEREST")
+        cells["D32"] = dict(cost, value=construction_total)
+        cells["E32"] = _label("[$M]")
+        cells["F32"] = _label("=")
+        cells["G32"] = dict(cost, value=capex_total)
+        cells["H32"] = _label("+")
+        cells["I32"] = dict(cost, value=interest_total)
+        cells["J32"] = _label("[$M]")
+
+    return cells
+
+
+def _cell_value(value):
+    # pandas.to_excel 과 같이 NaN 은 빈 셀
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def RESULTS(CFS, metrics=None, output_file=None):
+    """
+    RESULTS.xlsx 를 한 번에 작성 (스타일이 적용된 CFS 시트 + 지표 셀, write-only 로 한 번만 저장)
+
+    Parameters:
+    - CFS: Cash Flow Statement DataFrame 또는 CF.CashFlowStatement
+    - metrics: METRICS 의 반환값 (None 이면 CFS 시트만)
+    - output_file: 저장 경로 (None 이면 output/RESULTS.xlsx)
+
+    Returns:
+    - output_file
+    """
+    if isinstance(CFS, CF.CashFlowStatement):
+        CFS = CFS.to_frame()
+    output_file = _get_results_path() if output_file is None else output_file
+
+    cells = {}
+    for addr, spec in _metric_cells(metrics or {}).items():
+        column, row = coordinate_from_string(addr)
+        cells[(row, column_index_from_string(column))] = spec
+
+    labels = [str(label) for label in CFS.index]
+    n_columns = len(CFS.columns) + 1
+    n_rows = max([len(labels)] + [row for row, _ in cells])
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(RESULTS_SHEET)
+    ws.column_dimensions['A'].width = max(len(label) for label in labels) + 2  # 첫 열 너비 자동 조정
+    ws.sheet_view.showGridLines = False  # 그리드 숨김
+
+    data = CFS.to_numpy()
+    for r in range(1, n_rows + 1):
+        row = []
+        if r <= len(labels):
+            # CFS 행: 1행은 헤더 스타일, 나머지는 첫 열 라벨 스타일 + 주요 행 위에 굵은 상단선
+            label = labels[r - 1]
+            border = Border(top=Side(style="medium")) if label in BOLD_ROWS else None
+            for c, value in enumerate([label] + list(data[r - 1]), start=1):
+                cell = WriteOnlyCell(ws, value=_cell_value(value))
+                if r == 1:
+                    for key, style in _HEADER_STYLE.items():
+                        setattr(cell, key, style)
+                elif c == 1:
+                    cell.font = Font(name="Aptos Display", bold=label in BOLD_ROWS, color="000000")
+                    cell.alignment = _LABEL_ALIGNMENT
+                if border is not None:
+                    cell.border = border
+                row.append(cell)
+        row_cells = {c: spec for (cell_row, c), spec in cells.items() if cell_row == r}
+        if row_cells:
+            row += [None] * (max(row_cells) - len(row))
+            for c, spec in row_cells.items():
+                cell = WriteOnlyCell(ws, value=spec["value"])
+                for key, style in spec.items():
+                    if key != "value":
+                        setattr(cell, key, style)
+                row[c - 1] = cell
+        ws.append(row)
+
+    wb.save(output_file)
+    return output_file
+
+
+def CASHFLOW(CFS):
+    """CFS 시트만 RESULTS.xlsx 에 저장 (지표까지 쓰려면 RESULTS(CFS, METRICS(...)))"""
+    return RESULTS(CFS)
+
+
+# 여러 시나리오 (CF.CashFlowBatch) 분석 ###################################################################################
+def _npv_batch(values, discountRate):
+    """(N x 연도) 배열의 NPV (첫 열을 1년차로 할인, LCOE_COMPONENTS 와 동일)"""
+    t = np.arange(1, values.shape[1] + 1, dtype=float)
+    r = np.asarray(discountRate, dtype=float).reshape(-1, 1)
+    return np.sum(values / np.power(1.0 + r, t), axis=1)
+
+
+def LCOE_BATCH(batch, discountRate, electricityPrice, salesToRevenueRatio):
+    """
+    LCOE_COMPONENTS 의 batch 버전 (시나리오별 반복 없음)
+
+    Parameters:
+    - batch: CF.CashFlowBatch
+    - discountRate, electricityPrice, salesToRevenueRatio: 스칼라 또는 길이 N 배열
+
+    Returns:
+    - LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL (각각 길이 N 배열)
+    """
+    p = np.asarray(electricityPrice, dtype=float).reshape(-1, 1)
+    ratio = np.asarray(salesToRevenueRatio, dtype=float).reshape(-1, 1)
+
+    npv_denom = _npv_batch(- batch["REVENUE"] / (p * ratio), discountRate)
+    LCOE_CON = _npv_batch(batch["CAPEX"] + batch["INTEREST"], discountRate) / npv_denom
+    LCOE_OM = _npv_batch(batch["Capital OM Cost"] + batch["Annual OM Cost"], discountRate) / npv_denom
+    LCOE_FUEL = _npv_batch(batch["FUEL (Front-end)"], discountRate) / npv_denom
+    LCOE_FUEL_IS = _npv_batch(batch["FUEL (Interim Storage)"], discountRate) / npv_denom
+    LCOE_TOTAL = LCOE_CON + LCOE_OM + LCOE_FUEL
+
+    return LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL
+
+
+# 선형 LCOE (비용 배율 / 가격 변화는 계수의 내적) ############################################################################
+# LCOE 비용 항목 (LCOE_COMPONENTS 의 분자): CON = CAPEX + INTEREST, OM = Capital + Annual OM
+LINEAR_COST_ITEMS = ('CON', 'OM', 'FUEL', 'FUEL_IS')
+
+# FUEL (Front-end) 행에만 들어가는 입력: 연간 연료비 비율이 곧 FUEL 배율
+FUEL_COST_INPUTS = ('Feed', 'Product', 'Tail', 'totalFuelQty', 'U3O8Price', 'EnrichmentPrice', 'FabricationPrice',
+                    'ConversionPrice', 'CoreDesignFactor')
+
+
+@dataclass
+class LinearLCOE:
+    """
+    한 번 계산한 CFS 의 LCOE 선형 계수 (스케줄 / 운영기간 / discountRate / 금융 조건 고정)
+
+    LCOE_COMPONENTS 는 비용 행마다 선형이고 분모 NPV(-REVENUE/(p*ratio)) 는 electricityPrice 와 무관하므로,
+    CP별 / 항목별 비용 배율과 가격 변화는 아래 계수의 내적으로 계산된다.
+
+    - cp_list: CP 목록 (cp_coefficients 순서)
+    - weights: 연도별 할인 계수 1/(1+r)^t (t = 1, 2, ..., CFS 첫 열이 t = 1)
+    - energy: 할인된 발전량 NPV(-REVENUE/(p*ratio)) (LCOE 분모)
+    - cp_coefficients: CP별 LCOE_CON 기여 (그 CP 의 CAPEX + 부채 이자)
+    - item_coefficients: {'OM' / 'FUEL' / 'FUEL_IS': LCOE 기여}
+    """
+    cp_list: list
+    weights: np.ndarray
+    energy: float
+    cp_coefficients: np.ndarray
+    item_coefficients: dict
+
+    def cp_multipliers(self, cp_multiplier=None):
+        """CP별 배율 ({CP: 스칼라 또는 길이 N 배열} 또는 배열, 없는 CP 는 1) -> (N x CP) 배열"""
+        if cp_multiplier is None:
+            return np.ones((1, len(self.cp_list)))
+        if isinstance(cp_multiplier, dict):
+            unknown = set(cp_multiplier) - set(self.cp_list)
+            if unknown:
+                raise KeyError(f"Unknown CP: {sorted(unknown)}")
+            columns = np.broadcast_arrays(*[np.atleast_1d(np.asarray(cp_multiplier.get(cp, 1.0), dtype=float))
+                                            for cp in self.cp_list])
+            return np.column_stack(columns)
+        return np.atleast_2d(np.asarray(cp_multiplier, dtype=float))
+
+    def lcoe(self, cp_multiplier=None, item_multiplier=None, energy_scale=1.0):
+        """
+        비용 배율 / 발전량 배율을 적용한 LCOE
+
+        Parameters:
+        - cp_multiplier: CP별 비용 배율 (cp_multipliers 참고)
+        - item_multiplier: {'CON' / 'OM' / 'FUEL' / 'FUEL_IS': 스칼라 또는 길이 N 배열} (CON 은 CP 배율에 곱함)
+        - energy_scale: 발전량 배율 (capacityFactor 비율), 스칼라 또는 길이 N 배열
+
+        Returns:
+        - LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL (각각 길이 N 배열, LCOE_BATCH 와 같은 순서)
+        """
+        item_multiplier = {} if item_multiplier is None else item_multiplier
+        unknown = set(item_multiplier) - set(LINEAR_COST_ITEMS)
+        if unknown:
+            raise KeyError(f"Unknown cost item: {sorted(unknown)} (use {LINEAR_COST_ITEMS})")
+        m = lambda item: np.asarray(item_multiplier.get(item, 1.0), dtype=float)
+        scale = 1.0 / np.asarray(energy_scale, dtype=float)
+
+        LCOE_CON = self.cp_multipliers(cp_multiplier) @ self.cp_coefficients * m('CON') * scale
+        LCOE_OM = self.item_coefficients['OM'] * m('OM') * scale
+        LCOE_FUEL = self.item_coefficients['FUEL'] * m('FUEL') * scale
+        LCOE_FUEL_IS = self.item_coefficients['FUEL_IS'] * m('FUEL_IS') * scale
+        LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS = [np.atleast_1d(a) for a in np.broadcast_arrays(
+            LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS)]
+        LCOE_TOTAL = LCOE_CON + LCOE_OM + LCOE_FUEL
+
+        return LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL
+
+
+def LINEAR_LCOE(CFS, df_CAPEX, constructionPeriod, discountRate, electricityPrice, salesToRevenueRatio,
+                debtToEquityRatio, interestRate, loanTenor):
+    """
+    CFS 와 CP별 CAPEX 에서 LinearLCOE 계수 계산
+
+    Parameters:
+    - CFS: CF.CashFlowStatement (run() 의 CFS)
+    - df_CAPEX: ESCALATION.CAPEX 결과 (CP x 연도, escalation 적용된 CP별 비용)
+    - constructionPeriod, debtToEquityRatio, interestRate, loanTenor: CFS 와 같은 값 (CP별 이자 계산용)
+    - discountRate, electricityPrice, salesToRevenueRatio: LCOE_COMPONENTS 와 같음
+
+    Returns:
+    - LinearLCOE
+    """
+    years = CFS.years
+    t = np.arange(1, len(years) + 1, dtype=float)
+    weights = 1.0 / np.power(1.0 + discountRate, t)
+
+    # CP별 CAPEX 와 그 CP 의 부채 이자 (이자는 CAPEX (DEBT portion) 에 선형)
+    capex = df_CAPEX.reindex(columns=years.tolist(), fill_value=0.0).to_numpy(dtype=float)
+    n_cp = capex.shape[0]
+    construction = np.broadcast_to(years <= constructionPeriod, capex.shape)
+    operation = np.broadcast_to(years > constructionPeriod, capex.shape)
+    interest, _ = CF.DEBT_SERVICE_BATCH(capex * debtToEquityRatio, construction, operation,
+                                        np.full(n_cp, float(interestRate)), np.full(n_cp, float(loanTenor)))
+
+    energy = float((- CFS["REVENUE"] / (electricityPrice * salesToRevenueRatio)) @ weights)
+    return LinearLCOE(
+        cp_list=df_CAPEX.index.tolist(),
+        weights=weights,
+        energy=energy,
+        cp_coefficients=((-capex + interest) @ weights) / energy,
+        item_coefficients={
+            'OM': float((CFS["Capital OM Cost"] + CFS["Annual OM Cost"]) @ weights) / energy,
+            'FUEL': float(CFS["FUEL (Front-end)"] @ weights) / energy,
+            'FUEL_IS': float(CFS["FUEL (Interim Storage)"] @ weights) / energy,
+        })
+
+
+# CP별 LCOE_CON 분해 (CP_ATTRIBUTION 열 순서, 열 합계 = CP 기여, 전체 합계 = LCOE_CON)
+CP_ATTRIBUTION_COLUMNS = ('EQ', 'EQ Escalation', 'CONSTRUCTION', 'CONSTRUCTION Escalation', 'INTEREST')
+
+
+def CP_ATTRIBUTION_BATCH(statements, components, constructionPeriod, discountRate, electricityPrice,
+                         salesToRevenueRatio, debtToEquityRatio, interestRate, loanTenor):
+    """
+    N개 시나리오의 CP별 LCOE_CON 분해 (EQ / Construction 비용, 각각의 escalation, 건설 중 / 운영 중 이자)
+
+    (시나리오 x 항목 x CP x 연도) 비용 행렬과 (시나리오 x 연도) 할인 벡터의 행렬곱 한 번으로 계산한다.
+    이자는 CAPEX (DEBT portion) 에 선형이므로 CP별 escalation 적용 비용의 부채 부분으로 나눠 계산한다.
+
+    Parameters:
+    - statements: CF.CashFlowStatement 목록 (시나리오별 run() 의 CFS, 시작년도가 같아야 함)
+    - components: ESCALATION.CAPEX_COMPONENTS 결과 목록 ((4 x CP x 연도), 연도는 해당 CFS 와 같음)
+    - constructionPeriod, discountRate, electricityPrice, salesToRevenueRatio,
+      debtToEquityRatio, interestRate, loanTenor: 스칼라 또는 길이 N 배열 (CFS 와 같은 값)
+
+    Returns:
+    - (N x CP x 항목) 배열, 항목 순서는 CP_ATTRIBUTION_COLUMNS
+    """
+    batch = CF.stack_statements(statements)
+    n, n_years = len(batch), len(batch.years)
+    n_cp = components[0].shape[1]
+    (constructionPeriod, discountRate, electricityPrice, salesToRevenueRatio,
+     debtToEquityRatio, interestRate, loanTenor) = [
+        np.broadcast_to(np.asarray(a, dtype=float), (n,)) for a in (
+            constructionPeriod, discountRate, electricityPrice, salesToRevenueRatio,
+            debtToEquityRatio, interestRate, loanTenor)]
+
+    # (N x 4 x CP x 연도), 짧은 시나리오는 0
+    cost = np.zeros((n, 4, n_cp, n_years))
+    for i, component in enumerate(components):
+        cost[i, :, :, :component.shape[2]] = component[:, :, :n_years]
+    eq, eq_escalated, construction_cost, construction_escalated = cost.transpose(1, 0, 2, 3)
+
+    # CP별 이자: CFS 와 같은 건설 / 운영 구분 (시나리오별 종료년도까지)
+    in_grid = batch.years <= batch.end_year[:, None]
+    construction = in_grid & (batch.years <= constructionPeriod[:, None])
+    operation = in_grid & (batch.years > constructionPeriod[:, None])
+    capex_debt = ((eq_escalated + construction_escalated) * debtToEquityRatio[:, None, None]).reshape(n * n_cp, n_years)
+    interest, _ = CF.DEBT_SERVICE_BATCH(capex_debt, np.repeat(construction, n_cp, axis=0),
+                                        np.repeat(operation, n_cp, axis=0), np.repeat(interestRate, n_cp),
+                                        np.repeat(loanTenor, n_cp))
+    interest = interest.reshape(n, n_cp, n_years)
+
+    # 할인 벡터 / 할인된 발전량 (LCOE_COMPONENTS 의 분모)
+    t = np.arange(1, n_years + 1, dtype=float)
+    weights = 1.0 / np.power(1.0 + discountRate[:, None], t)
+    energy = np.sum(- batch["REVENUE"] / (electricityPrice * salesToRevenueRatio)[:, None] * weights, axis=1)
+
+    # 비용은 양수로 두고 분모 부호를 바꿈 (CFS 의 CAPEX / INTEREST 행은 음수, energy 도 음수)
+    stacked = np.stack([eq, eq_escalated - eq, construction_cost, construction_escalated - construction_cost,
+                        0.0 - interest], axis=1)
+    return np.einsum('nkcy,ny->nck', stacked, weights) / -energy[:, None, None]
+
+
+def CP_ATTRIBUTION(CFS, components, cp_list, constructionPeriod, discountRate, electricityPrice, salesToRevenueRatio,
+                   debtToEquityRatio, interestRate, loanTenor):
+    """
+    CP별 LCOE_CON 분해 (CP_ATTRIBUTION_BATCH 의 시나리오 1개 버전)
+
+    Returns:
+    - DataFrame (행: CP, 열: CP_ATTRIBUTION_COLUMNS + LCOE_CON), LCOE_CON 열 합계 = LCOE_CON
+    """
+    attribution = CP_ATTRIBUTION_BATCH([CFS], [components], constructionPeriod, discountRate, electricityPrice,
+                                       salesToRevenueRatio, debtToEquityRatio, interestRate, loanTenor)[0]
+    df = pd.DataFrame(attribution, index=pd.Index(cp_list, name='CP'), columns=list(CP_ATTRIBUTION_COLUMNS))
+    df['LCOE_CON'] = attribution.sum(axis=1)
+    return df
+
+
+# IRR 탐색 구간: NPV 부호가 바뀌는 구간을 찾는 격자 (npf.irr 처럼 기본은 0에 가장 가까운 해를 선택)
+IRR_GRID = np.array([-0.99, -0.9, -0.7, -0.5, -0.3, -0.2, -0.15, -0.1, -0.07, -0.04, -0.02, -0.01, 0.0,
+                     0.01, 0.02, 0.04, 0.07, 0.1, 0.15, 0.2, 0.3, 0.5, 0.7, 1.0, 2.0, 5.0, 10.0])
+
+# IRR_SOLVE 결과 flag
+IRR_OK = 0               # 해 1개
+IRR_MULTIPLE_ROOTS = 1   # 격자에서 NPV 부호가 여러 번 바뀜 (0 또는 guess 에 가장 가까운 해 반환)
+IRR_NO_ROOT = 2          # 격자 범위 안에 해 없음 (NaN)
+
+
+def _npv_at(cashflows, rate):
+    """t=0 부터 할인한 NPV (npf.irr 의 정의), rate: (N,) -- Horner 방식 (연도 수 만큼의 벡터 연산)"""
+    x = 1.0 / (1.0 + rate)
+    npv = np.zeros(cashflows.shape[0])
+    for j in range(cashflows.shape[1] - 1, -1, -1):
+        npv = npv * x + cashflows[:, j]
+    return npv
+
+
+def NPV_BATCH(batch, discountRate):
+    """
+    시나리오별 CASH FLOW 의 NPV (t=0 부터 할인, BREAK_EVEN 과 같은 기준)
+
+    Parameters:
+    - batch: CF.CashFlowBatch
+    - discountRate: 스칼라 또는 길이 N 배열
+
+    Returns:
+    - 길이 N 배열
+    """
+    cashflows = batch["CASH FLOW"]
+    rate = np.broadcast_to(np.asarray(discountRate, dtype=float), (cashflows.shape[0],))
+    return _npv_at(cashflows, rate)
+
+
+def _npv_and_slope(cashflows, rate):
+    """NPV 와 d(NPV)/d(rate) (Horner 로 함께 계산)"""
+    x = 1.0 / (1.0 + rate)
+    npv = np.zeros(cashflows.shape[0])
+    slope = np.zeros(cashflows.shape[0])  # d(NPV)/dx
+    for j in range(cashflows.shape[1] - 1, -1, -1):
+        slope = slope * x + npv
+        npv = npv * x + cashflows[:, j]
+    return npv, -slope * x * x  # dx/drate = -x^2
+
+
+def IRR_SOLVE(cashflows, guess=None, tol=1e-12, max_iter=50):
+    """
+    (N x 연도) 현금흐름의 IRR 을 모든 행에 대해 동시에 계산 (구간을 유지하는 Newton, 실패 시 이분법)
+
+    1. IRR_GRID 에서 NPV 부호가 바뀌는 구간을 찾고, 구간 수로 해 없음 / 여러 해를 표시
+    2. guess 가 없으면 선형 보간한 해가 0에 가장 가까운 구간, 있으면 guess 에 가장 가까운 구간 선택
+       (sweep 에서 이웃 시나리오의 IRR 을 guess 로 주면 같은 해 가지를 따라감)
+    3. 구간 안에서 Newton 반복, Newton 값이 구간을 벗어나면 이분법
+
+    해는 IRR_GRID 범위 [-0.99, 10] 안에서만 찾고 센다. 범위 밖의 해는 반환하지도, flag 에 반영하지도 않으므로
+    npf.irr 가 범위 밖의 해를 고르는 현금흐름에서는 결과가 다를 수 있다 (범위 안에서는 npf.irr 와 ~1e-12 일치).
+
+    Parameters:
+    - cashflows: (N x 연도) 배열 (첫 열 = t=0)
+    - guess: None, 스칼라 또는 길이 N 배열 (NaN 인 행은 guess 없음)
+    - tol: 수렴 기준 (rate 변화량, 상대값)
+    - max_iter: 최대 반복 횟수
+
+    Returns:
+    - irr: 길이 N 배열 (해 없음은 NaN)
+    - flag: 길이 N 배열 (IRR_OK / IRR_MULTIPLE_ROOTS / IRR_NO_ROOT)
+    """
+    cashflows = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    n = cashflows.shape[0]
+    rows = np.arange(n)
+    grid = IRR_GRID
+    npv = np.stack([_npv_at(cashflows, np.full(n, r)) for r in grid], axis=1)  # (N x grid)
+
+    # 부호가 바뀌는 (또는 한쪽이 정확히 0 인) 구간 [grid[k], grid[k+1]]
+    crossing = (np.sign(npv[:, :-1]) * np.sign(npv[:, 1:]) <= 0) & (npv[:, :-1] != npv[:, 1:])
+    # 격자점에서 정확히 0 인 해는 양쪽 구간에 모두 걸리므로 앞 구간에서만 셈
+    crossing[:, 1:] &= ~((npv[:, 1:-1] == 0) & crossing[:, :-1])
+    n_crossing = crossing.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estimate = grid[:-1] - npv[:, :-1] * (grid[1:] - grid[:-1]) / (npv[:, 1:] - npv[:, :-1])
+    target = np.zeros(n)
+    if guess is not None:
+        guess = np.broadcast_to(np.asarray(guess, dtype=float), (n,))
+        target = np.where(np.isfinite(guess), guess, 0.0)
+    distance = np.where(crossing, np.abs(estimate - target[:, None]), np.inf)
+    k = np.argmin(distance, axis=1)
+    found = n_crossing > 0
+
+    lo, hi = grid[k].copy(), grid[k + 1].copy()
+    npv_lo, npv_hi = npv[rows, k], npv[rows, k + 1]
+    rate = np.where(np.isfinite(estimate[rows, k]), estimate[rows, k], 0.5 * (lo + hi))
+    if guess is not None:
+        # guess 가 선택된 구간 안에 있으면 그 값에서 시작
+        inside = np.isfinite(guess) & (guess > lo) & (guess < hi)
+        rate = np.where(inside, guess, rate)
+    rate = np.where(npv_lo == 0, lo, np.where(npv_hi == 0, hi, rate))
+    active = found & (npv_lo != 0) & (npv_hi != 0)
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        r = rate[idx]
+        f, slope = _npv_and_slope(cashflows[idx], r)
+
+        # 구간 갱신 (부호가 npv_lo 와 같으면 왼쪽 끝을 r 로)
+        same_side = np.sign(f) == np.sign(npv_lo[idx])
+        lo[idx] = np.where(same_side, r, lo[idx])
+        npv_lo[idx] = np.where(same_side, f, npv_lo[idx])
+        hi[idx] = np.where(same_side, hi[idx], r)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = r - f / slope
+        outside = ~np.isfinite(newton) | (newton <= lo[idx]) | (newton >= hi[idx])
+        r_new = np.where(outside, 0.5 * (lo[idx] + hi[idx]), newton)
+
+        converged = (f == 0) | (np.abs(r_new - r) <= tol * (1 + np.abs(r))) | (hi[idx] - lo[idx] <= tol * (1 + np.abs(r)))
+        rate[idx] = np.where(f == 0, r, r_new)
+        active[idx] = ~converged
+
+    irr = np.where(found, rate, np.nan)
+    flag = np.where(~found, IRR_NO_ROOT, np.where(n_crossing > 1, IRR_MULTIPLE_ROOTS, IRR_OK))
+    return irr, flag
+
+
+def IRR_BATCH(batch, guess=None, return_flags=False):
+    """
+    CASH FLOW 행의 IRR 을 시나리오 전체에 대해 계산 (IRR_SOLVE)
+
+    Parameters:
+    - batch: CF.CashFlowBatch
+    - guess: 이웃 sweep 지점의 IRR 등 초기값 (스칼라 또는 길이 N 배열)
+    - return_flags: True 이면 (irr, flag) 반환
+
+    Returns:
+    - IRR (길이 N 배열, 해 없음은 NaN)
+    """
+    irr, flag = IRR_SOLVE(batch["CASH FLOW"], guess=guess)
+    return (irr, flag) if return_flags else irr
+
+
+def BEP_BATCH(batch):
+    """
+    BEP 의 batch 버전: 누적 CASH FLOW 가 음수 -> 0 이상으로 바뀌는 시점 (선형 보간, 반올림 안 함)
+
+    Returns:
+    - BEP (길이 N 배열, 전체 기간 손실이면 NaN)
+    """
+    years = batch.years.astype(float)
+    cumulative_cash_flow = np.cumsum(batch["CASH FLOW"], axis=1)
+    n = cumulative_cash_flow.shape[0]
+
+    crossing = (cumulative_cash_flow[:, :-1] < 0) & (cumulative_cash_flow[:, 1:] >= 0)
+    has_crossing = crossing.any(axis=1)
+    i = np.argmax(crossing, axis=1)
+    before = np.abs(cumulative_cash_flow[np.arange(n), i])
+    after = cumulative_cash_flow[np.arange(n), i + 1]
+    fraction = before / np.where(has_crossing, before + after, 1.0)
+    bep_year = years[i] + fraction * (years[i + 1] - years[i])
+
+    # 구간 내 전환이 없으면: 처음부터 끝까지 0 이상일 때만 첫 해, 그 외 (전체 기간 손실 등) NaN
+    always_positive = (cumulative_cash_flow[:, 0] >= 0) & (cumulative_cash_flow[:, -1] >= 0)
+    bep_year = np.where(has_crossing, bep_year, np.where(always_positive, years[0], np.nan))
+    return bep_year
+
+
+# 손익분기 가격 / 목표 IRR ################################################################################################
+# REVENUE 에 비례하는 입력 (CF.SCALE_REVENUE 로 CFS 재계산 없이 풀 수 있음)
+REVENUE_LINEAR_INPUTS = ('electricityPrice', 'salesToRevenueRatio', 'capacityFactor')
+
+
+def BREAK_EVEN_SCALE(batch, rate, taxRate):
+    """
+    NPV(CASH FLOW, rate) = 0 이 되는 REVENUE 배율 (시나리오별, 정확한 해)
+
+    REVENUE 배율 m 에 대해 CASH FLOW 는 연도별로 m 의 1차식이고, TAX 만 EBT > 0 인 연도에서 꺾인다.
+    꺾이는 점 (EBT = 0 이 되는 m) 을 정렬해 누적합으로 각 점의 NPV 를 구하고,
+    NPV 가 0 을 지나는 구간에서 선형 보간한다 (구간 안에서는 NPV 가 m 의 1차식이므로 정확).
+
+    NPV 는 IRR 과 같이 첫 해를 t=0 으로 할인한다. rate 에 목표 IRR 을 주면 그 IRR 을 만드는 배율이 된다.
+
+    Parameters:
+    - batch: CF.CashFlowBatch (기준 입력으로 계산한 CFS)
+    - rate: 할인율 또는 목표 IRR (스칼라 또는 길이 N 배열)
+    - taxRate: 스칼라 또는 길이 N 배열
+
+    Returns:
+    - 길이 N 배열 (m >= 0 범위에 해가 없으면 NaN)
+    """
+    revenue = batch["REVENUE"]
+    n, n_years = revenue.shape
+    rows = np.arange(n)
+    taxRate = np.broadcast_to(np.asarray(taxRate, dtype=float), (n,)).reshape(-1, 1)
+    rate = np.broadcast_to(np.asarray(rate, dtype=float), (n,)).reshape(-1, 1)
+
+    # m 에 의존하지 않는 부분: EBT(m) = ebt0 + revenue * m, CASH FLOW(m) = cf0 + revenue * m + TAX(m)
+    ebt0 = batch["EBT (Taxable Income)"] - revenue
+    cf0 = batch["CASH FLOW"] - revenue - batch["TAX"]
+    discount = np.power(1.0 + rate, -np.arange(n_years, dtype=float))
+
+    base_npv = (discount * cf0).sum(axis=1)
+    revenue_npv = (discount * revenue).sum(axis=1)
+    # REVENUE 가 없는 연도: 과세 여부가 m 과 무관
+    fixed_tax_npv = (discount * np.where((revenue == 0) & (ebt0 > 0), ebt0, 0.0)).sum(axis=1)
+
+    # REVENUE 가 있는 연도: m > kink 이면 과세
+    has_revenue = revenue > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kink = np.where(has_revenue, -ebt0 / revenue, np.inf)
+    order = np.argsort(kink, axis=1)
+    kink = np.take_along_axis(kink, order, axis=1)
+    taxed_ebt = np.cumsum(np.take_along_axis(np.where(has_revenue, discount * ebt0, 0.0), order, axis=1), axis=1)
+    taxed_revenue = np.cumsum(np.take_along_axis(np.where(has_revenue, discount * revenue, 0.0), order, axis=1), axis=1)
+
+    def npv_at(m, n_taxed):
+        # 앞에서 n_taxed 개 연도가 과세되는 구간의 NPV(m)
+        k = np.maximum(n_taxed - 1, 0)
+        taxed = n_taxed > 0
+        e = np.where(taxed, taxed_ebt[rows, k], 0.0)
+        r = np.where(taxed, taxed_revenue[rows, k], 0.0)
+        return base_npv + revenue_npv * m - taxRate[:, 0] * (fixed_tax_npv + e + r * m)
+
+    # 후보 점: m = 0, 양수인 kink 들 (정렬됨)
+    finite = np.isfinite(kink)
+    n_negative = (finite & (kink <= 0)).sum(axis=1)
+    npv_zero = npv_at(np.zeros(n), n_negative)
+    candidate = np.where(finite & (kink > 0), kink, np.nan)
+    npv_candidate = np.stack([npv_at(candidate[:, j], np.full(n, j + 1)) for j in range(n_years)], axis=1)
+
+    # NPV 는 m 에 대해 증가 (taxRate < 1): NPV >= 0 이 되는 첫 후보
+    reached = np.nan_to_num(npv_candidate, nan=-np.inf) >= 0
+    has_crossing = reached.any(axis=1)
+    j = np.argmax(reached, axis=1)
+    m_b, npv_b = candidate[rows, j], npv_candidate[rows, j]
+    previous = np.where(j > 0, j - 1, 0)
+    use_zero = (j == 0) | np.isnan(candidate[rows, previous])
+    m_a = np.where(use_zero, 0.0, candidate[rows, previous])
+    npv_a = np.where(use_zero, npv_zero, npv_candidate[rows, previous])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inside = m_a - npv_a * (m_b - m_a) / (npv_b - npv_a)
+
+        # 마지막 kink 이후: 모든 REVENUE 연도가 과세되는 1차식
+        last = np.where(finite & (kink > 0), np.arange(n_years), -1).max(axis=1)
+        m_last = np.where(last >= 0, candidate[rows, np.maximum(last, 0)], 0.0)
+        npv_last = np.where(last >= 0, npv_candidate[rows, np.maximum(last, 0)], npv_zero)
+        n_all = finite.sum(axis=1)
+        slope = revenue_npv - taxRate[:, 0] * np.where(n_all > 0, taxed_revenue[rows, np.maximum(n_all - 1, 0)], 0.0)
+        beyond = np.where(slope > 0, m_last - npv_last / slope, np.nan)
+
+    scale = np.where(has_crossing, inside, beyond)
+    scale = np.where(npv_zero >= 0, np.where(npv_zero == 0, 0.0, np.nan), scale)  # 수입 없이도 NPV >= 0
+    return scale
+
+
+def BREAK_EVEN(CFS, value, taxRate, discountRate=None, target_irr=None):
+    """
+    NPV(discountRate) = 0 또는 IRR = target_irr 이 되는 REVENUE 비례 입력값 (electricityPrice 등)
+
+    Parameters:
+    - CFS: CF.CashFlowBatch, CF.CashFlowStatement 또는 그 목록 (value 로 계산한 CFS)
+    - value: CFS 를 계산할 때 사용한 입력값 (REVENUE_LINEAR_INPUTS 중 하나, 스칼라 또는 길이 N 배열)
+    - taxRate: 스칼라 또는 길이 N 배열
+    - discountRate / target_irr: 둘 중 하나
+
+    Returns:
+    - 길이 N 배열 (해가 없으면 NaN)
+    """
+    if (discountRate is None) == (target_irr is None):
+        raise ValueError("Give exactly one of discountRate or target_irr")
+    if isinstance(CFS, CF.CashFlowStatement):
+        CFS = [CFS]
+    if not isinstance(CFS, CF.CashFlowBatch):
+        CFS = CF.stack_statements(list(CFS))
+    rate = discountRate if target_irr is None else target_irr
+    return np.asarray(value, dtype=float) * BREAK_EVEN_SCALE(CFS, rate, taxRate)
@@ -1,3 +1,8 @@
+import numpy as np
+
+import input.code.EQcost as EQ
+
+
 def scaling(df_CP_List, df_scaling_power, df_country_specific, 
                         Country, moduleNumber, ElectricCapacityPerModule):
     """
@@ -17,46 +22,10 @@ def scaling(df_CP_List, df_scaling_power, df_country_specific,
     
     result_df = df_CP_List.copy()
     
-    # 1) Power scaling exponent 딕셔너리 생성
-    power_scaling_dict = dict(zip(df_scaling_power.iloc[:, 0], df_scaling_power.iloc[:, 1]))
-    
-    # 2) Country factor 딕셔너리 생성 (LABOR 열 사용)
-    country_labor_dict = dict(zip(df_country_specific['Country'], df_country_specific['LABOR']))
-    
-    # 3) Total Power 계산
-    total_power = moduleNumber * ElectricCapacityPerModule
-    
-    scaling_factors = []
-    
-    for idx, row in result_df.iterrows():
-        # 4-1) Power Scaling Factor
-        power_description = row['POWER_SCALING']
-        exponent = power_scaling_dict.get(power_description, 1.0)
-        
-        # POWER_SCALING_CAPACITY에 따라 분기
-        capacity_type = row['POWER_SCALING_CAPACITY']
-        if capacity_type == 'TOTAL':
-            power_factor = (total_power / 1400) ** exponent
-        else:  # 'MODULE'인 경우
-            power_factor = (ElectricCapacityPerModule / 1400) ** exponent
-        
-        # 4-2) Module Factor (EQ.scaling과 동일)
-        module_description = row['MODULE_FACTOR']
-        if module_description == 'O':
-            module_factor = moduleNumber/2 # 기준이 2모듈이므로 2로 나눔
-        else:  # 'X'인 경우
-            module_factor = 2/2        # 기준이 2모듈이므로 2로 나눔
-        
-        # 4-3) Country Factor (LABOR 열 사용)
-        country_description = row['COUNTRY-SPECIFIC']
-        if country_description == 'X':
-            country_factor = 1.0
-        else:  # 'O'인 경우
-            country_factor = country_labor_dict.get(Country, 1.0)
-        
-        # 총 스케일링 계수
-        total_scaling = power_factor * module_factor * country_factor/1000000 # million USD로 변환
-        scaling_factors.append(total_scaling)
+    # 행별 스케일링 속성 (exponent / TOTAL / MODULE / COUNTRY) 과 국가별 LABOR factor 를 배열로 조회
+    flags = row_scaling_flags(result_df, df_scaling_power)
+    scaling_factors = scaling_factor_matrix(flags, [moduleNumber], [ElectricCapacityPerModule],
+                                            labor_factors(Country, df_country_specific))[0]
     
     # 새로운 scaled 열 생성
     result_df['scaled_APR1400_CONSTRUCTIONcost_2025USD'] = (
@@ -64,3 +33,100 @@ def scaling(df_CP_List, df_scaling_power, df_country_specific,
     )
     
     return result_df
+
+
+def scaling_batch(df_CP_List, df_scaling_power, df_country_specific,
+                  Country, moduleNumber, ElectricCapacityPerModule, groups=None):
+    """
+    scaling 을 N개 시나리오에 대해 한 번에 계산 (EQ.scaling_batch 와 같은 형태)
+
+    Parameters:
+    - Country, moduleNumber, ElectricCapacityPerModule: 스칼라 또는 길이 N 배열 (서로 broadcast)
+    - groups: 미리 계산한 scaling_groups 결과 (None 이면 여기서 계산)
+
+    Returns:
+    - (N x CP) scaled_APR1400_CONSTRUCTIONcost_2025USD 배열 (million USD), 열 순서는 df_CP_List 행 순서
+    """
+    country, module_number, capacity = np.broadcast_arrays(
+        np.asarray(Country, dtype=object), np.asarray(moduleNumber, dtype=float),
+        np.asarray(ElectricCapacityPerModule, dtype=float))
+
+    if groups is None:
+        groups = scaling_groups(df_CP_List, df_scaling_power)
+    return grouped_cost(groups, np.atleast_1d(module_number), np.atleast_1d(capacity),
+                        labor_factors(country, df_country_specific))
+
+
+# 행별 스케일링 속성 (시나리오와 무관) #####################################################################################
+def row_scaling_flags(df_CP_List, df_scaling_power):
+    """
+    CP_List 행별 스케일링 속성을 배열로 변환
+
+    Returns:
+    - exponent: POWER_SCALING exponent (없는 이름은 1.0)
+    - total: POWER_SCALING_CAPACITY == 'TOTAL' (전체 용량 기준, 아니면 모듈 용량 기준)
+    - module: MODULE_FACTOR == 'O'
+    - country: COUNTRY-SPECIFIC != 'X'
+    """
+    exponent_dict = EQ.power_scaling_dict(df_scaling_power)
+    return {
+        'exponent': np.array([exponent_dict.get(EQ.scaling_key(v), 1.0) for v in df_CP_List['POWER_SCALING']], dtype=float),
+        'total': (df_CP_List['POWER_SCALING_CAPACITY'] == 'TOTAL').to_numpy(),
+        'module': (df_CP_List['MODULE_FACTOR'] == 'O').to_numpy(),
+        'country': (df_CP_List['COUNTRY-SPECIFIC'] != 'X').to_numpy(),
+    }
+
+
+def scaling_factor_matrix(flags, moduleNumber, ElectricCapacityPerModule, labor_factor):
+    """
+    (시나리오 N x 행 R) 스케일링 계수 = power * module * country / 1e6 (million USD)
+
+    Parameters:
+    - flags: row_scaling_flags 결과
+    - moduleNumber, ElectricCapacityPerModule, labor_factor: (N,) 배열
+    """
+    module_number = np.asarray(moduleNumber, dtype=float)[:, None]
+    capacity = np.asarray(ElectricCapacityPerModule, dtype=float)[:, None]
+    labor_factor = np.asarray(labor_factor, dtype=float)[:, None]
+
+    # 1) Power Scaling Factor: TOTAL 이면 전체 용량, MODULE 이면 모듈 용량 기준
+    total_power = module_number * capacity
+    power_factor = np.where(flags['total'], total_power / 1400, capacity / 1400) ** flags['exponent']
+    # 2) Module Factor: 기준이 2모듈이므로 2로 나눔
+    module_factor = np.where(flags['module'], module_number / 2, 2 / 2)
+    # 3) Country Factor (LABOR 열 사용)
+    country_factor = np.where(flags['country'], labor_factor, 1.0)
+
+    return power_factor * module_factor * country_factor / 1000000 # million USD로 변환
+
+
+def labor_factors(Country, df_country_specific):
+    """Country (스칼라 또는 배열) -> LABOR country factor 배열 (없는 국가는 1.0)"""
+    country_labor_dict = dict(zip(df_country_specific['Country'], df_country_specific['LABOR']))
+    return np.array([country_labor_dict.get(c, 1.0) for c in np.atleast_1d(np.asarray(Country, dtype=object))], dtype=float)
+
+
+
+# Scaling group 별 closed-form 모델 (EQ.scaling_groups 와 같은 방식) #####################################################
+def scaling_groups(df_CP_List, df_scaling_power):
+    """
+    Construction Cost 의 scaling group 별 base cost (시나리오와 무관, 한 번만 계산)
+
+    Returns:
+    - EQ.group_by_flags 결과 ('base' 는 {'CON': (G x CP) 배열}, 열 순서는 df_CP_List 행 순서)
+    """
+    flags = row_scaling_flags(df_CP_List, df_scaling_power)
+    cost = df_CP_List['APR1400_CONSTRUCTIONcost_2025USD'].to_numpy(dtype=float)
+    # CP_List 는 한 행이 하나의 CP
+    return EQ.group_by_flags(flags, {'CON': cost}, np.eye(len(df_CP_List)))
+
+
+def grouped_cost(groups, moduleNumber, ElectricCapacityPerModule, labor_factor):
+    """
+    scaling_groups 결과로 (N x CP) Construction Cost (million USD) 계산
+
+    Parameters:
+    - moduleNumber, ElectricCapacityPerModule, labor_factor: (N,) 배열
+    """
+    factors = scaling_factor_matrix(groups['flags'], moduleNumber, ElectricCapacityPerModule, labor_factor)
+    return factors @ groups['base']['CON']
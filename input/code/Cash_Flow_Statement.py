@@ -1,72 +1,126 @@
+"""
+Cash Flow Statement (CFS)
+
+행 순서가 고정된 (행 x 연도) float 배열에 각 항목을 직접 계산해 넣는다.
+pandas DataFrame 은 출력(엑셀 저장 / 분석) 할 때 to_frame() 으로 한 번만 만든다.
+"""
+
 import pandas as pd
+import numpy as np
 import math
+from dataclasses import dataclass
+from enum import IntEnum
 import input.code.Fuel_Cost_Input as Fuel
+import input.code.Year_Fraction as YF
+
+
+class ROW(IntEnum):
+    """CFS 행 위치 (to_frame() 출력 순서와 동일, YEAR 행 제외)"""
+    REVENUE = 0
+    ANNUAL_OM = 1
+    FUEL_FRONTEND = 2
+    FUEL_INTERIM_STORAGE = 3
+    GROSS_PROFIT = 4
+    DNA_SUB = 5
+    EBIT = 6
+    INTEREST = 7
+    EBT = 8
+    TAX = 9
+    NET_INCOME = 10
+    DNA_ADD = 11
+    CAPITAL_OM = 12
+    CAPEX = 13
+    CAPEX_DEBT = 14
+    DEBT_REPAYMENT = 15
+    CASH_FLOW = 16
+
+
+# 행 위치 -> CFS 행 이름
+ROW_NAMES = {
+    ROW.REVENUE: 'REVENUE',
+    ROW.ANNUAL_OM: 'Annual OM Cost',
+    ROW.FUEL_FRONTEND: 'FUEL (Front-end)',
+    ROW.FUEL_INTERIM_STORAGE: 'FUEL (Interim Storage)',
+    ROW.GROSS_PROFIT: 'GROSS PROFIT',
+    ROW.DNA_SUB: 'Depreciation and Amortization (sub)',
+    ROW.EBIT: 'EBIT',
+    ROW.INTEREST: 'INTEREST',
+    ROW.EBT: 'EBT (Taxable Income)',
+    ROW.TAX: 'TAX',
+    ROW.NET_INCOME: 'NET INCOME',
+    ROW.DNA_ADD: 'Depreciation and Amortization (add)',
+    ROW.CAPITAL_OM: 'Capital OM Cost',
+    ROW.CAPEX: 'CAPEX',
+    ROW.CAPEX_DEBT: 'CAPEX (DEBT portion)',
+    ROW.DEBT_REPAYMENT: 'DEBT repayment',
+    ROW.CASH_FLOW: 'CASH FLOW',
+}
+ROW_BY_NAME = {name: row for row, name in ROW_NAMES.items()}
+
+
+@dataclass
+class CashFlowStatement:
+    """
+    연도별 Cash Flow Statement
+
+    - years: 연도 (int 배열, -ceil(건설준비기간) ~ ceil(건설기간 + 운영기간))
+    - values: (len(ROW) x len(years)) float 배열, 행 위치는 ROW
+    """
+    years: np.ndarray
+    values: np.ndarray
+
+    def __getitem__(self, row):
+        """행 값 (ROW 또는 CFS 행 이름)"""
+        if isinstance(row, str):
+            row = ROW_BY_NAME[row]
+        return self.values[row]
+
+    def copy(self):
+        """값을 복사한 CashFlowStatement (캐시된 CFS 를 수정하지 않고 뒤 행을 다시 계산할 때)"""
+        return CashFlowStatement(years=self.years.copy(), values=self.values.copy())
+
+    def to_frame(self):
+        """기존 CFS 와 같은 형태의 DataFrame (YEAR 행 + 항목 행, 열: 연도)"""
+        year_row = ['Year ' + str(year) for year in self.years]
+        data = [year_row] + [self.values[row].tolist() for row in ROW]
+        index = ['YEAR'] + [ROW_NAMES[row] for row in ROW]
+        return pd.DataFrame(data, index=index, columns=self.years.tolist(), dtype=object)
 
 
 def YEARS(prep_period, construction_period, operation_period):
     """
-    Cash Flow Statement의 연도 행(YEAR) 생성
+    Cash Flow Statement 생성 (연도 + 0으로 채운 항목 행)
     """
-    
+
     # 시작년도: -(건설준비기간 올림)
     start_year = -math.ceil(prep_period)
-    
+
     # 종료년도: (건설기간 + 운영기간 올림)
     end_year = math.ceil(construction_period + operation_period)
-    
-    # 연도 리스트 생성
-    years = list(range(start_year, end_year + 1))
-    
-    # DataFrame 생성 (연도들을 열로, YEAR 행 추가)
-    cashflow_df = pd.DataFrame(index=['YEAR'], columns=years)
-    
-    # YEAR 행에 'Year' + 연도 값 입력
-    cashflow_df.loc['YEAR'] = ['Year ' + str(year) for year in years]
-    
-    #print(cashflow_df)  # 디버깅용 출력
-    
-    return cashflow_df
+
+    # 연도 배열 생성
+    years = np.arange(start_year, end_year + 1)
+
+    return CashFlowStatement(years=years, values=np.zeros((len(ROW), len(years))))
 
 
 
 def REVENUE(cashflow_df, ElectricCapacityPerModule, moduleNumber, electricityPrice, salesToRevenueRatio, capacityFactor, year_start, year_end):
     """
     Revenue를 Cash Flow에 매핑 (소수점 고려한 분배)
-    
+
     Parameters:
-    - cashflow_df: 연도별 Cash Flow DataFrame (YEAR 행 있는 상태)
+    - cashflow_df: 연도별 Cash Flow Statement
     - ElectricCapacityPerModule, moduleNumber, electricityPrice, salesToRevenueRatio, capacityFactor: 수익 계산 변수들
     - year_start: 운영 시작 시점 (소수점 가능)
     - year_end: 운영 종료 시점 (소수점 가능)
-    
+
     Returns:
-    - REVENUE 행이 추가된 Cash Flow DataFrame
+    - REVENUE 행이 채워진 Cash Flow Statement
     """
     annual_revenue = ElectricCapacityPerModule * moduleNumber * electricityPrice * salesToRevenueRatio * capacityFactor * 8760 / 1000000  # in million USD
-    # 기존 DataFrame에 REVENUE 행 추가 (YEAR 행은 유지)
-    cashflow_df.loc['REVENUE'] = 0.0
-    
-    # 운영 시작 연도의 정수 부분과 소수 부분
-    start_year_int = math.ceil(year_start)
-    start_fraction = start_year_int - year_start  # 첫 해 운영 비율
-    
-    # 운영 종료 연도의 정수 부분과 소수 부분  
-    end_year_int = math.floor(year_end)
-    end_fraction = year_end - end_year_int  # 마지막 해 운영 비율
-    
-    # 첫 번째 운영 연도 (부분 운영)
-    if start_year_int in cashflow_df.columns:
-        cashflow_df.loc['REVENUE', start_year_int] = annual_revenue * start_fraction
-    
-    # 중간 완전 운영 연도들
-    for year in range(start_year_int + 1, end_year_int + 1):
-        if year in cashflow_df.columns:
-            cashflow_df.loc['REVENUE', year] = annual_revenue
-    
-    # 마지막 운영 연도 (부분 운영)
-    if end_fraction > 0 and (end_year_int + 1) in cashflow_df.columns:
-        cashflow_df.loc['REVENUE', end_year_int + 1] = annual_revenue * end_fraction
-    
+    weights, _ = YF.window(cashflow_df.years, year_start, year_end)  # 소수점 고려한 연도별 운영 비율
+    cashflow_df.values[ROW.REVENUE] = annual_revenue * weights
     return cashflow_df
 
 
@@ -74,52 +128,24 @@ def REVENUE(cashflow_df, ElectricCapacityPerModule, moduleNumber, electricityPri
 def OM_ANNUAL(SNU, cashflow_df, year_start, year_end,ElectricCapacityPerModule, moduleNumber):
     """
     OM Cost를 Cash Flow에 매핑 (연도별 상관식 적용)
-    
+
     Parameters:
-    - cashflow_df: 기존 Cash Flow DataFrame
+    - cashflow_df: 기존 Cash Flow Statement
     - year_start: 운영 시작 시점 (소수점 가능)
     - year_end: 운영 종료 시점 (소수점 가능)
-    
+
     Returns:
-    - 'OM Cost' 행이 추가된 Cash Flow DataFrame
-    """
-    
-    # 기존 DataFrame에 OM Cost 행 추가
-    cashflow_df.loc['Annual OM Cost'] = 0.0
-    
-    # 운영 시작 연도의 정수 부분과 소수 부분
-    start_year_int = math.ceil(year_start)
-    start_fraction = start_year_int - year_start
-    
-    # 운영 종료 연도의 정수 부분과 소수 부분
-    end_year_int = math.floor(year_end)
-    end_fraction = year_end - end_year_int
-    
-    # 첫 번째 운영 연도 (부분 운영)
-    if start_year_int in cashflow_df.columns:
-        age = start_fraction  # 첫 해는 부분 연도만큼의 AGE
-        om_cost = (116 + 0.56 * age)*ElectricCapacityPerModule*moduleNumber/1000 if age <= 50 else (91 + 0.56 * age)*ElectricCapacityPerModule*moduleNumber/1000 # in million USD
-        if SNU:
-            om_cost = om_cost * 0.9
-        cashflow_df.loc['Annual OM Cost', start_year_int] = -1* om_cost * start_fraction
-    
-    # 중간 완전 운영 연도들
-    current_age = 1.0  # 두 번째 해부터는 AGE=1부터 시작
-    for year in range(start_year_int + 1, end_year_int + 1):
-        if year in cashflow_df.columns:
-            om_cost = (116 + 0.56 * current_age)*ElectricCapacityPerModule*moduleNumber/1000 if current_age <= 50 else (91 + 0.56 * current_age)*ElectricCapacityPerModule*moduleNumber/1000
-            if SNU:
-                om_cost = om_cost * 0.9
-            cashflow_df.loc['Annual OM Cost', year] = -1* om_cost
-            current_age += 1.0
-    
-    # 마지막 운영 연도 (부분 운영)
-    if end_fraction > 0 and (end_year_int + 1) in cashflow_df.columns:
-        om_cost = (116 + 0.56 * current_age)*ElectricCapacityPerModule*moduleNumber/1000 if current_age <= 50 else (91 + 0.56 * current_age)*ElectricCapacityPerModule*moduleNumber/1000
-        if SNU:
-            om_cost = om_cost * 0.9
-        cashflow_df.loc['Annual OM Cost', end_year_int + 1] = -1* om_cost * end_fraction
-    
+    - 'Annual OM Cost' 행이 채워진 Cash Flow Statement
+    """
+    weights, age = YF.window(cashflow_df.years, year_start, year_end)
+
+    # AGE 50년 이하 / 초과 상관식 (in million USD)
+    om_cost = np.where(age <= 50,
+                       (116 + 0.56 * age)*ElectricCapacityPerModule*moduleNumber/1000,
+                       (91 + 0.56 * age)*ElectricCapacityPerModule*moduleNumber/1000)
+    if SNU:
+        om_cost = om_cost * 0.9
+    cashflow_df.values[ROW.ANNUAL_OM] = -1* om_cost * weights
     return cashflow_df
 
 
@@ -127,43 +153,20 @@ def OM_ANNUAL(SNU, cashflow_df, year_start, year_end,ElectricCapacityPerModule,
 def FUEL_FRONTEND(cashflow_df,year_start, year_end, Feed, Product, Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice,moduleNumber,BatchNumber, BatchCycleLength, CoreDesignFactor):
     """
     Fuel Cost를 Cash Flow에 매핑 (소수점 고려한 분배)
-    
+
     Parameters:
-    - cashflow_df: 기존 Cash Flow DataFrame
-    - annual_fuel_cost: 연간 연료 비용
+    - cashflow_df: 기존 Cash Flow Statement
     - year_start: 운영 시작 시점 (소수점 가능)
     - year_end: 운영 종료 시점 (소수점 가능)
-    
+
     Returns:
-    - 'FUEL_FRONTEND' 행이 추가된 Cash Flow DataFrame
+    - 'FUEL (Front-end)' 행이 채워진 Cash Flow Statement, 연료비 구성 비율
     """
-    
+
     annual_fuel_cost, ratio = Fuel.FrontEnd(Feed, Product, Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice,moduleNumber,BatchNumber, BatchCycleLength, CoreDesignFactor)
 
-    # 기존 DataFrame에 FUEL_FRONTEND 행 추가
-    cashflow_df.loc['FUEL (Front-end)'] = 0.0
-    
-    # 운영 시작 연도의 정수 부분과 소수 부분
-    start_year_int = math.ceil(year_start)
-    start_fraction = start_year_int - year_start  # 첫 해 운영 비율
-    
-    # 운영 종료 연도의 정수 부분과 소수 부분  
-    end_year_int = math.floor(year_end)
-    end_fraction = year_end - end_year_int  # 마지막 해 운영 비율
-    
-    # 첫 번째 운영 연도 (부분 운영)
-    if start_year_int in cashflow_df.columns:
-        cashflow_df.loc['FUEL (Front-end)', start_year_int] = -1* annual_fuel_cost * start_fraction
-    
-    # 중간 완전 운영 연도들
-    for year in range(start_year_int + 1, end_year_int + 1):
-        if year in cashflow_df.columns:
-            cashflow_df.loc['FUEL (Front-end)', year] = -1* annual_fuel_cost
-    
-    # 마지막 운영 연도 (부분 운영)
-    if end_fraction > 0 and (end_year_int + 1) in cashflow_df.columns:
-        cashflow_df.loc['FUEL (Front-end)', end_year_int + 1] = -1* annual_fuel_cost * end_fraction
-    
+    weights, _ = YF.window(cashflow_df.years, year_start, year_end)
+    cashflow_df.values[ROW.FUEL_FRONTEND] = -1* annual_fuel_cost * weights
     return cashflow_df, ratio
 
 
@@ -171,90 +174,51 @@ def FUEL_FRONTEND(cashflow_df,year_start, year_end, Feed, Product, Tail, totalFu
 def FUEL_INTERIM_STORAGE(CFS, initial_investment, annual_cask_cost, annual_om_cost, operation_start, operation_end, dry_storage_period, batch_length):
     """
     Fuel Interim Storage 비용을 Cash Flow Statement에 추가
-    
+
     Parameters:
     - CFS: 기존 Cash Flow Statement
     - initial_investment: 초기 투자비
-    - annual_cask_cost: 연간 Cask 비용  
+    - annual_cask_cost: 연간 Cask 비용
     - annual_om_cost: 연간 OM 비용
     - operation_start: 원전 운영 시작 시점
     - operation_end: 원전 운영 종료 시점
     - dry_storage_period: 건식저장 보관 기간
     - batch_length: 배치 길이
-    
+
     Returns:
-    - FUEL (Interim Storage) 행이 추가된 CFS
-    """
-    
-    result_CFS = CFS.copy()
-    years = CFS.columns.tolist()
-    
-    # FUEL (Interim Storage) 행 초기화
-    fuel_interim_values = pd.Series(0.0, index=years)
-    
+    - FUEL (Interim Storage) 행이 채워진 CFS
+    """
+
+    years = CFS.years
+    fuel_interim_values = CFS.values[ROW.FUEL_INTERIM_STORAGE]
+    fuel_interim_values[:] = 0.0
+
     # 1. 초기 투자비: 원전 운영 시작 시점에 1회성
     start_year_int = math.ceil(operation_start)
-    if start_year_int in years:
-        fuel_interim_values[start_year_int] += -initial_investment  # 비용이므로 음수
-    
+    fuel_interim_values[years == start_year_int] += -initial_investment  # 비용이므로 음수
+
     # 2. 연간 Cask 비용: 운영 시작 + batch_length부터 운영 종료까지
     cask_start = operation_start + batch_length/12  # batch_length는 개월 단위이므로 12로 나눔
     cask_start_int = math.ceil(cask_start)
     operation_end_int = math.floor(operation_end)
-    
-    for year in range(cask_start_int, operation_end_int + 1):
-        if year in years:
-            fuel_interim_values[year] += -annual_cask_cost  # 비용이므로 음수
-    
+    fuel_interim_values[(years >= cask_start_int) & (years <= operation_end_int)] += -annual_cask_cost  # 비용이므로 음수
+
     # 3. 연간 OM 비용: 운영 시작부터 운영 종료 + 건식저장 기간까지
     om_end = operation_end + dry_storage_period
     om_end_int = math.floor(om_end)
-    
-    for year in range(start_year_int, om_end_int + 1):
-        if year in years:
-            fuel_interim_values[year] += -annual_om_cost  # 비용이므로 음수
-    
-    # 4. 'FUEL (Front-end)' 행 아래에 'FUEL (Interim Storage)' 행 삽입
-    current_index = result_CFS.index.tolist()
-    
-    try:
-        fuel_frontend_idx = current_index.index('FUEL_FRONTEND')
-        fuel_interim_row = pd.DataFrame([fuel_interim_values], index=['FUEL (Interim Storage)'])
-        
-        # FUEL_FRONTEND 다음에 삽입
-        top_part = result_CFS.iloc[:fuel_frontend_idx + 1]
-        bottom_part = result_CFS.iloc[fuel_frontend_idx + 1:]
-        result_CFS = pd.concat([top_part, fuel_interim_row, bottom_part], axis=0)
-        
-    except ValueError:
-        # FUEL_FRONTEND 행이 없는 경우 맨 뒤에 추가
-        fuel_interim_row = pd.DataFrame([fuel_interim_values], index=['FUEL (Interim Storage)'])
-        result_CFS = pd.concat([result_CFS, fuel_interim_row], axis=0)
-    
-    return result_CFS
+    fuel_interim_values[(years >= start_year_int) & (years <= om_end_int)] += -annual_om_cost  # 비용이므로 음수
+
+    return CFS
 
 
 
 def GROSS_PROFIT(cashflow_df):
     """
     Gross Profit 행을 Cash Flow에 추가
-    Gross Profit = REVENUE - OM Cost - FUEL_FRONTEND
-    
-    Parameters:
-    - cashflow_df: 기존 Cash Flow DataFrame (REVENUE, OM Cost, FUEL_FRONTEND 행 포함)
-    
-    Returns:
-    - 'Gross Profit' 행이 추가된 Cash Flow DataFrame
-    """
-    
-    # Gross Profit 행 추가
-    cashflow_df.loc['GROSS PROFIT'] = (
-        cashflow_df.loc['REVENUE'] + 
-        cashflow_df.loc['Annual OM Cost'] + 
-        cashflow_df.loc['FUEL (Front-end)'] + 
-        cashflow_df.loc['FUEL (Interim Storage)']
-    )
-    
+    Gross Profit = REVENUE - OM Cost - FUEL_FRONTEND - FUEL (Interim Storage)
+    """
+    v = cashflow_df.values
+    v[ROW.GROSS_PROFIT] = v[ROW.REVENUE] + v[ROW.ANNUAL_OM] + v[ROW.FUEL_FRONTEND] + v[ROW.FUEL_INTERIM_STORAGE]
     return cashflow_df
 
 
@@ -262,46 +226,19 @@ def GROSS_PROFIT(cashflow_df):
 def OM_CAPITAL(cashflow_df, year_start, year_end, ElectricCapacityPerModule, moduleNumber):
     """
     Capital OM Cost를 Cash Flow에 매핑 (연도별 상관식 적용)
-    
+
     Parameters:
-    - cashflow_df: 기존 Cash Flow DataFrame
+    - cashflow_df: 기존 Cash Flow Statement
     - year_start: 운영 시작 시점 (소수점 가능)
     - year_end: 운영 종료 시점 (소수점 가능)
-    
+
     Returns:
-    - 'Capital OM Cost' 행이 추가된 Cash Flow DataFrame
-    """
-    
-    # 기존 DataFrame에 Capital OM Cost 행 추가
-    cashflow_df.loc['Capital OM Cost'] = 0.0
-    
-    # 운영 시작 연도의 정수 부분과 소수 부분
-    start_year_int = math.ceil(year_start)
-    start_fraction = start_year_int - year_start
-    
-    # 운영 종료 연도의 정수 부분과 소수 부분
-    end_year_int = math.floor(year_end)
-    end_fraction = year_end - end_year_int
-    
-    # 첫 번째 운영 연도 (부분 운영)
-    if start_year_int in cashflow_df.columns:
-        age = start_fraction  # 첫 해는 부분 연도만큼의 AGE
-        capital_om_cost = (17 + 1.25 * age)*ElectricCapacityPerModule*moduleNumber/1000 # in million USD
-        cashflow_df.loc['Capital OM Cost', start_year_int] = -1* capital_om_cost * start_fraction
-    
-    # 중간 완전 운영 연도들
-    current_age = 1.0  # 두 번째 해부터는 AGE=1부터 시작
-    for year in range(start_year_int + 1, end_year_int + 1):
-        if year in cashflow_df.columns:
-            capital_om_cost = (17 + 1.25 * current_age)*ElectricCapacityPerModule*moduleNumber/1000
-            cashflow_df.loc['Capital OM Cost', year] = -1* capital_om_cost
-            current_age += 1.0
-    
-    # 마지막 운영 연도 (부분 운영)
-    if end_fraction > 0 and (end_year_int + 1) in cashflow_df.columns:
-        capital_om_cost = (17 + 1.25 * current_age)*ElectricCapacityPerModule*moduleNumber/1000
-        cashflow_df.loc['Capital OM Cost', end_year_int + 1] = -1* capital_om_cost * end_fraction
-    
+    - 'Capital OM Cost' 행이 채워진 Cash Flow Statement
+    """
+    weights, age = YF.window(cashflow_df.years, year_start, year_end)
+
+    capital_om_cost = (17 + 1.25 * age)*ElectricCapacityPerModule*moduleNumber/1000 # in million USD
+    cashflow_df.values[ROW.CAPITAL_OM] = -1* capital_om_cost * weights
     return cashflow_df
 
 
@@ -309,473 +246,409 @@ def OM_CAPITAL(cashflow_df, year_start, year_end, ElectricCapacityPerModule, mod
 def CAPEX(CFS, df_afterESCALATION):
     """
     CAPEX 데이터를 Cash Flow Statement에 추가
-    
+
     Parameters:
-    - CFS: 기존 Cash Flow Statement DataFrame
-    - df_afterESCALATION: CAPEX 함수의 반환값 (CP별 연도별 비용)
-    
+    - CFS: 기존 Cash Flow Statement
+    - df_afterESCALATION: CAPEX 함수의 반환값 (CP별 연도별 비용, 열: CFS 와 같은 연도)
+
     Returns:
-    - CAPEX 행이 추가된 Cash Flow Statement
+    - CAPEX 행이 채워진 Cash Flow Statement
     """
-    
-    # 1단계: CAPEX 데이터를 열방향으로 sum하여 1행 DataFrame 생성
-    capex_sum = df_afterESCALATION.sum(axis=0)  # 각 열(연도)별 합계
-    
-    # 2단계: 1행 DataFrame 생성 (행 인덱스는 'CAPEX')
-    capex_row = pd.DataFrame([-1*capex_sum], index=['CAPEX'])
-    
-    # 3단계: CFS 하단에 CAPEX 행 추가
-    result_CFS = pd.concat([CFS, capex_row], axis=0)
-    
-    return result_CFS
+
+    # CAPEX 데이터를 열방향으로 sum (각 열(연도)별 합계)
+    capex_sum = df_afterESCALATION.sum(axis=0).reindex(CFS.years.tolist())
+    CFS.values[ROW.CAPEX] = -1*capex_sum.to_numpy(dtype=float)
+    return CFS
 
 
 
 def CAPEX_DEBT(debtToEquityRatio, CFS_with_CAPEX):
     """
     CAPEX의 부채 부분을 Cash Flow Statement에 추가
-    
+
     Parameters:
     - debtToEquityRatio: 부채/자기자본 비율
-    - CFS_with_CAPEX: CAPEX 행이 포함된 Cash Flow Statement
-    
+    - CFS_with_CAPEX: CAPEX 행이 채워진 Cash Flow Statement
+
     Returns:
-    - 'CAPEX (DEBT portion)' 행이 추가된 Cash Flow Statement
-    """
-    
-    # 1단계: 기존 CFS 복사
-    result_CFS = CFS_with_CAPEX.copy()
-    
-    # 2단계: CAPEX 행의 값들 가져오기
-    capex_values = CFS_with_CAPEX.loc['CAPEX']
-    
-    # 3단계: debtToEquityRatio와 -1을 곱한 값 계산
-    capex_debt_values = capex_values * debtToEquityRatio * (-1)
-    
-    # 4단계: 새로운 행 생성 (인덱스 이름: 'CAPEX (DEBT portion)')
-    capex_debt_row = pd.DataFrame([capex_debt_values], index=['CAPEX (DEBT portion)'])
-    
-    # 5단계: CFS 맨 아래에 추가
-    result_CFS = pd.concat([result_CFS, capex_debt_row], axis=0)
-    
-    return result_CFS
+    - 'CAPEX (DEBT portion)' 행이 채워진 Cash Flow Statement
+    """
+    v = CFS_with_CAPEX.values
+    v[ROW.CAPEX_DEBT] = v[ROW.CAPEX] * debtToEquityRatio * (-1)
+    return CFS_with_CAPEX
 
 
 
 def INTERESTnDEBTrepayment(CFS, interestRate, loanTenor, constructionPeriod):
     """
     Interest 및 Debt Repayment를 Cash Flow Statement에 추가
+    (연도별 잔액에 의존하는 점화식이므로 연도 순서대로 계산)
     """
-    
-    result_CFS = CFS.copy()
-    years = CFS.columns.tolist()
-    
+
+    years = CFS.years.tolist()
+
     # 건설기간과 운영기간 구분
     construction_end = constructionPeriod
-    construction_years = [year for year in years if year <= construction_end]
-    operation_years = [year for year in years if year > construction_end]
-    
+    construction_years = [i for i, year in enumerate(years) if year <= construction_end]
+    operation_years = [i for i, year in enumerate(years) if year > construction_end]
+
     # CAPEX (DEBT portion) 행 가져오기
-    capex_debt_values = CFS.loc['CAPEX (DEBT portion)']
-    
+    capex_debt_values = CFS.values[ROW.CAPEX_DEBT].tolist()
+
     # 1단계: 건설기간 중 이자 계산
-    interest_values = pd.Series(0.0, index=years)
+    interest_values = [0.0] * len(years)
     cumulative_debt = 0.0
-    
-    for i, year in enumerate(construction_years):
-        current_debt = capex_debt_values[year] if capex_debt_values[year] > 0 else 0
-        
+
+    for i in construction_years:
+        current_debt = capex_debt_values[i] if capex_debt_values[i] > 0 else 0
+
         if cumulative_debt > 0:
             current_year_interest = cumulative_debt * interestRate
-            interest_values[year] = -current_year_interest
-        
+            interest_values[i] = -current_year_interest
+
         cumulative_debt = cumulative_debt * (1 + interestRate) + current_debt
-    
+
     total_debt = cumulative_debt
-    
+
     # 3단계: 운영기간 중 상환 계산
-    debt_repayment_values = pd.Series(0.0, index=years)
-    
+    debt_repayment_values = [0.0] * len(years)
+
     if len(operation_years) > 0 and total_debt > 0:
         repayment_years = operation_years[:loanTenor] if len(operation_years) >= loanTenor else operation_years
-        
+
         if len(repayment_years) > 0:
             annual_repayment = total_debt / len(repayment_years)
-            
-            for year in repayment_years:
-                debt_repayment_values[year] = -annual_repayment
-        
+
+            for i in repayment_years:
+                debt_repayment_values[i] = -annual_repayment
+
         # 운영기간 중 이자 계산
         remaining_debt = total_debt
-        for year in operation_years:
+        for i in operation_years:
             if remaining_debt > 0:
                 current_year_interest = remaining_debt * interestRate
-                interest_values[year] = -current_year_interest
-                
-                if year in repayment_years:
+                interest_values[i] = -current_year_interest
+
+                if i in repayment_years:
                     remaining_debt -= annual_repayment
                     if remaining_debt < 0:
                         remaining_debt = 0
-    
-    # INTEREST 행을 'Gross Profit'과 'Capital OM Cost' 사이에 삽입
-    current_index = result_CFS.index.tolist()
-    
-    try:
-        capital_om_idx = current_index.index('Capital OM Cost')
-        interest_row = pd.DataFrame([interest_values], index=['INTEREST'])
-        
-        # Capital OM Cost 앞에 INTEREST 삽입
-        top_part = result_CFS.iloc[:capital_om_idx]
-        bottom_part = result_CFS.iloc[capital_om_idx:]
-        result_CFS = pd.concat([top_part, interest_row, bottom_part], axis=0)
-        
-    except ValueError:
-        # Capital OM Cost 행이 없는 경우 맨 뒤에 추가
-        interest_row = pd.DataFrame([interest_values], index=['INTEREST'])
-        result_CFS = pd.concat([result_CFS, interest_row], axis=0)
-    
-    debt_repayment_row = pd.DataFrame([debt_repayment_values], index=['DEBT repayment'])
-    result_CFS = pd.concat([result_CFS, debt_repayment_row], axis=0)
-    
-    return result_CFS
+
+    CFS.values[ROW.INTEREST] = interest_values
+    CFS.values[ROW.DEBT_REPAYMENT] = debt_repayment_values
+    return CFS
 
 
 
 def DEPRECIATIONandAMORTIZATION(CFS, constructionPeriod, plantLifetime):
     """
     Depreciation and Amortization을 Cash Flow Statement에 추가
-    
+
     Parameters:
     - CFS: 기존 Cash Flow Statement
     - constructionPeriod: 건설 기간 (운영 시작점)
     - plantLifetime: 발전소 운영 기간
-    
+
     Returns:
-    - DnA (sub), DnA (add) 행이 추가된 CFS
-    """
-    
-    result_CFS = CFS.copy()
-    years = CFS.columns.tolist()
-    
-    # 1단계: CAPEX 행의 총합 계산
-    capex_values = CFS.loc['CAPEX']
-    total_capex = capex_values.sum()  # 음수가 될 것
-    
+    - DnA (sub), DnA (add) 행이 채워진 CFS
+    """
+
+    # 1단계: CAPEX 행의 총합 계산 (연도 순서대로 합산)
+    total_capex = 0.0
+    for value in CFS.values[ROW.CAPEX].tolist():
+        total_capex += value  # 음수가 될 것
+
     # 2단계: 운영기간 설정 (REVENUE 함수와 동일)
     operation_start = constructionPeriod
     operation_end = constructionPeriod + plantLifetime
-    
+
     # 3단계: DnA 값을 운영기간에 균등 분배 (소수점 고려)
-    dna_sub_values = pd.Series(0.0, index=years)
-    
-    # 운영 시작 연도의 정수 부분과 소수 부분
-    start_year_int = math.ceil(operation_start)
-    start_fraction = start_year_int - operation_start
-    
-    # 운영 종료 연도의 정수 부분과 소수 부분  
-    end_year_int = math.floor(operation_end)
-    end_fraction = operation_end - end_year_int
-    
-    # 총 운영기간
     total_operation_period = operation_end - operation_start
     annual_dna = total_capex / total_operation_period if total_operation_period > 0 else 0
-    
-    # 첫 번째 운영 연도 (부분 운영)
-    if start_year_int in years:
-        dna_sub_values[start_year_int] = annual_dna * start_fraction
-    
-    # 중간 완전 운영 연도들
-    for year in range(start_year_int + 1, end_year_int + 1):
-        if year in years:
-            dna_sub_values[year] = annual_dna
-    
-    # 마지막 운영 연도 (부분 운영)
-    if end_fraction > 0 and (end_year_int + 1) in years:
-        dna_sub_values[end_year_int + 1] = annual_dna * end_fraction
-    
+
+    weights, _ = YF.window(CFS.years, operation_start, operation_end)
+    v = CFS.values
+    v[ROW.DNA_SUB] = annual_dna * weights
+
     # 4단계: DnA (add) 값 생성 (sub의 -1배)
-    dna_add_values = -dna_sub_values
-    
-    # 5단계: 행 삽입
-    current_index = result_CFS.index.tolist()
-    
-    # 'Depreciation and Amortization (sub)'를 'GROSS PROFIT'과 'INTEREST' 사이에 삽입
-    try:
-        interest_idx = current_index.index('INTEREST')
-        dna_sub_row = pd.DataFrame([dna_sub_values], index=['Depreciation and Amortization (sub)'])
-        
-        # INTEREST 앞에 삽입
-        top_part = result_CFS.iloc[:interest_idx]
-        bottom_part = result_CFS.iloc[interest_idx:]
-        result_CFS = pd.concat([top_part, dna_sub_row, bottom_part], axis=0)
-        
-        # 인덱스 업데이트 (새로운 행이 추가되었으므로)
-        current_index = result_CFS.index.tolist()
-        
-    except ValueError:
-        # INTEREST 행이 없는 경우 맨 뒤에 추가
-        dna_sub_row = pd.DataFrame([dna_sub_values], index=['Depreciation and Amortization (sub)'])
-        result_CFS = pd.concat([result_CFS, dna_sub_row], axis=0)
-        current_index = result_CFS.index.tolist()
-    
-    # 'Depreciation and Amortization (add)'를 'INTEREST'와 'Capital OM Cost' 사이에 삽입
-    try:
-        capital_om_idx = current_index.index('Capital OM Cost')
-        dna_add_row = pd.DataFrame([dna_add_values], index=['Depreciation and Amortization (add)'])
-        
-        # Capital OM Cost 앞에 삽입
-        top_part = result_CFS.iloc[:capital_om_idx]
-        bottom_part = result_CFS.iloc[capital_om_idx:]
-        result_CFS = pd.concat([top_part, dna_add_row, bottom_part], axis=0)
-        
-    except ValueError:
-        # Capital OM Cost 행이 없는 경우 맨 뒤에 추가
-        dna_add_row = pd.DataFrame([dna_add_values], index=['Depreciation and Amortization (add)'])
-        result_CFS = pd.concat([result_CFS, dna_add_row], axis=0)
-    
-    return result_CFS
+    v[ROW.DNA_ADD] = -v[ROW.DNA_SUB]
+    return CFS
 
 
 
 def EBIT(CFS):
     """
-    GROSS PROFIT와 Depreciation and Amortization (sub)을 합산해 EBIT 행을 만들고,
-    'Depreciation and Amortization (sub)'과 'INTEREST' 사이에 삽입한다.
-
-    Parameters
-    ----------
-    CFS : pd.DataFrame
-        Cash Flow Statement DataFrame (행 인덱스: 항목, 열: 기간)
-
-    Returns
-    -------
-    pd.DataFrame
-        EBIT 행이 추가 또는 갱신된 DataFrame
+    GROSS PROFIT와 Depreciation and Amortization (sub)을 합산해 EBIT 행을 만든다.
     """
-    df = CFS.copy()
-
-    # 필요한 행 존재 여부 체크
-    if "GROSS PROFIT" not in df.index:
-        raise KeyError("'GROSS PROFIT' 행이 없습니다.")
-    if "Depreciation and Amortization (sub)" not in df.index:
-        raise KeyError("'Depreciation and Amortization (sub)' 행이 없습니다.")
-
-    # EBIT 계산
-    ebit_values = df.loc["GROSS PROFIT"] + df.loc["Depreciation and Amortization (sub)"]
-    ebit_row = pd.DataFrame([ebit_values], index=["EBIT"])
-
-    # 기존 EBIT가 있으면 제거 후 교체
-    if "EBIT" in df.index:
-        df = df.drop(index="EBIT")
-
-    idx_list = df.index.tolist()
-
-    # 삽입 위치 결정
-    if "INTEREST" in idx_list and "Depreciation and Amortization (sub)" in idx_list:
-        insert_pos = idx_list.index("INTEREST")
-    elif "Depreciation and Amortization (sub)" in idx_list:
-        insert_pos = idx_list.index("Depreciation and Amortization (sub)") + 1
-    elif "INTEREST" in idx_list:
-        insert_pos = idx_list.index("INTEREST")
-    else:
-        insert_pos = len(idx_list)
-
-    # 삽입
-    top = df.iloc[:insert_pos]
-    bottom = df.iloc[insert_pos:]
-    result = pd.concat([top, ebit_row, bottom], axis=0)
-
-    return result
+    v = CFS.values
+    v[ROW.EBIT] = v[ROW.GROSS_PROFIT] + v[ROW.DNA_SUB]
+    return CFS
 
 
 
 def EBT(CFS):
     """
-    EBIT와 INTEREST를 합산해 'EBT (Taxable Income)' 행을 만들고,
-    'Depreciation and Amortization (add)' 위에 삽입한다.
-
-    Parameters
-    ----------
-    CFS : pd.DataFrame
-        Cash Flow Statement DataFrame (행 인덱스: 항목, 열: 기간)
-
-    Returns
-    -------
-    pd.DataFrame
-        'EBT (Taxable Income)' 행이 추가 또는 갱신된 DataFrame
+    EBIT와 INTEREST를 합산해 'EBT (Taxable Income)' 행을 만든다.
     """
-    df = CFS.copy()
-
-    # 필요한 행 존재 여부 체크
-    if "EBIT" not in df.index:
-        raise KeyError("'EBIT' 행이 없습니다.")
-    if "INTEREST" not in df.index:
-        raise KeyError("'INTEREST' 행이 없습니다.")
-
-    # EBT 계산
-    ebt_values = df.loc["EBIT"] + df.loc["INTEREST"]
-    ebt_row = pd.DataFrame([ebt_values], index=["EBT (Taxable Income)"])
-
-    # 기존 EBT가 있으면 제거 후 교체
-    if "EBT (Taxable Income)" in df.index:
-        df = df.drop(index="EBT (Taxable Income)")
-
-    idx_list = df.index.tolist()
-
-    # 삽입 위치 결정
-    if "Depreciation and Amortization (add)" in idx_list:
-        insert_pos = idx_list.index("Depreciation and Amortization (add)")
-    else:
-        insert_pos = len(idx_list)  # 없으면 맨 뒤에 추가
-
-    # 삽입
-    top = df.iloc[:insert_pos]
-    bottom = df.iloc[insert_pos:]
-    result = pd.concat([top, ebt_row, bottom], axis=0)
-
-    return result
+    v = CFS.values
+    v[ROW.EBT] = v[ROW.EBIT] + v[ROW.INTEREST]
+    return CFS
 
 
 
 def TAX(CFS, taxRate):
     """
-    'EBT (Taxable Income)'에 -1*taxRate를 곱해 'TAX' 행을 만들고,
-    'Depreciation and Amortization (add)' 위에 삽입한다.
+    'EBT (Taxable Income)'에 -1*taxRate를 곱해 'TAX' 행을 만든다.
     단, EBT가 음수일 경우 세금은 0으로 처리한다.
-
-    Parameters
-    ----------
-    CFS : pd.DataFrame
-        Cash Flow Statement DataFrame (행 인덱스: 항목, 열: 기간)
-    taxRate : float
-        세율 (예: 0.21)
-
-    Returns
-    -------
-    pd.DataFrame
-        'TAX' 행이 추가 또는 갱신된 DataFrame
     """
-    df = CFS.copy()
+    v = CFS.values
+    ebt_values = v[ROW.EBT]
+    v[ROW.TAX] = np.where(ebt_values > 0, -taxRate * ebt_values, 0.0)
+    return CFS
 
-    # 필요한 행 존재 여부 체크
-    if "EBT (Taxable Income)" not in df.index:
-        raise KeyError("'EBT (Taxable Income)' 행이 없습니다.")
 
-    # TAX 계산: EBT>0인 경우만 세금 부과
-    ebt_values = df.loc["EBT (Taxable Income)"]
-    tax_values = ebt_values.apply(lambda x: -taxRate * x if x > 0 else 0)
-    tax_row = pd.DataFrame([tax_values], index=["TAX"])
 
-    # 기존 TAX가 있으면 제거 후 교체
-    if "TAX" in df.index:
-        df = df.drop(index="TAX")
-
-    idx_list = df.index.tolist()
-
-    # 삽입 위치 결정
-    if "Depreciation and Amortization (add)" in idx_list:
-        insert_pos = idx_list.index("Depreciation and Amortization (add)")
-    else:
-        insert_pos = len(idx_list)  # 없으면 맨 뒤에 추가
+def NI(CFS):
+    """
+    'EBT (Taxable Income)' + 'TAX'를 계산해 'NET INCOME' 행을 만든다.
+    """
+    v = CFS.values
+    v[ROW.NET_INCOME] = v[ROW.EBT] + v[ROW.TAX]
+    return CFS
 
-    # 삽입
-    top = df.iloc[:insert_pos]
-    bottom = df.iloc[insert_pos:]
-    result = pd.concat([top, tax_row, bottom], axis=0)
 
-    return result
+def CASH_FLOW(CFS):
+    """
+    'NET INCOME', 'Depreciation and Amortization (add)',
+    'Capital OM Cost', 'CAPEX', 'CAPEX (DEBT portion)', 'DEBT repayment'
+    을 합산하여 'CASH FLOW' 행을 만든다.
+    """
+    v = CFS.values
+    v[ROW.CASH_FLOW] = (v[ROW.NET_INCOME] + v[ROW.DNA_ADD] + v[ROW.CAPITAL_OM]
+                        + v[ROW.CAPEX] + v[ROW.CAPEX_DEBT] + v[ROW.DEBT_REPAYMENT])
+    return CFS
 
 
 
-def NI(CFS):
+# 여러 시나리오 CFS 를 한 번에 계산 (batch) ##################################################################################
+@dataclass
+class CashFlowBatch:
     """
-    'EBT (Taxable Income)' + 'TAX'를 계산해 'NET INCOME' 행을 만들고,
-    'Depreciation and Amortization (add)' 위에 삽입한다.
+    N개 시나리오의 Cash Flow Statement
 
-    Parameters
-    ----------
-    CFS : pd.DataFrame
-        Cash Flow Statement DataFrame (행 인덱스: 항목, 열: 기간)
-
-    Returns
-    -------
-    pd.DataFrame
-        'NET INCOME' 행이 추가 또는 갱신된 DataFrame
+    - years: 공통 연도 (int 배열, -ceil(건설준비기간) ~ 시나리오 중 가장 늦은 종료년도)
+    - values: (N x len(ROW) x len(years)) float 배열, 시나리오별 종료년도 이후 열은 0
+    - end_year: 시나리오별 종료년도 ceil(건설기간 + 운영기간) (N,)
     """
-    df = CFS.copy()
+    years: np.ndarray
+    values: np.ndarray
+    end_year: np.ndarray
 
-    # 필요한 행 존재 여부 체크
-    if "EBT (Taxable Income)" not in df.index:
-        raise KeyError("'EBT (Taxable Income)' 행이 없습니다.")
-    if "TAX" not in df.index:
-        raise KeyError("'TAX' 행이 없습니다.")
+    def __getitem__(self, row):
+        """행 값 (N x 연도), row: ROW 또는 CFS 행 이름"""
+        if isinstance(row, str):
+            row = ROW_BY_NAME[row]
+        return self.values[:, row, :]
 
-    # NET INCOME 계산
-    ni_values = df.loc["EBT (Taxable Income)"] + df.loc["TAX"]
-    ni_row = pd.DataFrame([ni_values], index=["NET INCOME"])
+    def __len__(self):
+        return self.values.shape[0]
 
-    # 기존 NET INCOME이 있으면 제거 후 교체
-    if "NET INCOME" in df.index:
-        df = df.drop(index="NET INCOME")
+    def statement(self, i):
+        """i번째 시나리오의 CashFlowStatement (자신의 종료년도까지)"""
+        n_years = int(self.end_year[i] - self.years[0]) + 1
+        return CashFlowStatement(years=self.years[:n_years].copy(), values=self.values[i, :, :n_years].copy())
 
-    idx_list = df.index.tolist()
 
-    # 삽입 위치 결정
-    if "Depreciation and Amortization (add)" in idx_list:
-        insert_pos = idx_list.index("Depreciation and Amortization (add)")
-    else:
-        insert_pos = len(idx_list)  # 없으면 맨 뒤에 추가
+def stack_statements(statements):
+    """
+    CashFlowStatement 목록 -> CashFlowBatch (시작년도가 같아야 함, 짧은 CFS 는 0으로 채움)
 
-    # 삽입
-    top = df.iloc[:insert_pos]
-    bottom = df.iloc[insert_pos:]
-    result = pd.concat([top, ni_row, bottom], axis=0)
+    Parameters:
+    - statements: CashFlowStatement 목록
 
-    return result
+    Returns:
+    - CashFlowBatch
+    """
+    start_year = statements[0].years[0]
+    if any(statement.years[0] != start_year for statement in statements):
+        raise ValueError("Cash flow statements must share the same start year")
+    end_year = np.array([statement.years[-1] for statement in statements])
+    years = np.arange(start_year, end_year.max() + 1)
+    values = np.zeros((len(statements), len(ROW), len(years)))
+    for i, statement in enumerate(statements):
+        values[i, :, :len(statement.years)] = statement.values
+    return CashFlowBatch(years=years, values=values, end_year=end_year)
 
 
-def CASH_FLOW(CFS):
+def SCALE_REVENUE(batch, scale, taxRate):
     """
-    'NET INCOME', 'Depreciation and Amortization (add)', 
-    'Capital OM Cost', 'CAPEX', 'CAPEX (DEBT portion)', 'DEBT repayment'
-    을 합산하여 'CASH FLOW' 행을 만들고, DataFrame 최하단에 추가한다.
+    REVENUE 에 scale 을 곱하고 REVENUE 에 의존하는 행만 다시 계산 (나머지 행은 그대로 재사용)
 
-    Parameters
-    ----------
-    CFS : pd.DataFrame
-        Cash Flow Statement DataFrame (행 인덱스: 항목, 열: 기간)
+    REVENUE 는 electricityPrice, salesToRevenueRatio, capacityFactor 에 비례하므로
+    이 값들을 바꾼 CFS 는 REVENUE -> GROSS PROFIT -> EBIT -> EBT -> TAX -> NET INCOME -> CASH FLOW 만 바뀐다.
 
-    Returns
-    -------
-    pd.DataFrame
-        'CASH FLOW' 행이 추가 또는 갱신된 DataFrame
-    """
-    df = CFS.copy()
+    Parameters:
+    - batch: CashFlowBatch
+    - scale: 스칼라 또는 길이 N 배열
+    - taxRate: 스칼라 또는 길이 N 배열
+
+    Returns:
+    - 새 CashFlowBatch
+    """
+    values = batch.values.copy()
+    v = lambda row: values[:, row, :]
+    scale = np.asarray(scale, dtype=float).reshape(-1, 1)
+    taxRate = np.asarray(taxRate, dtype=float).reshape(-1, 1)
+
+    revenue_change = v(ROW.REVENUE) * (scale - 1)
+    v(ROW.REVENUE)[:] += revenue_change
+    v(ROW.GROSS_PROFIT)[:] += revenue_change
+    v(ROW.EBIT)[:] += revenue_change
+    v(ROW.EBT)[:] += revenue_change
+    v(ROW.TAX)[:] = np.where(v(ROW.EBT) > 0, -taxRate * v(ROW.EBT), 0.0)
+    v(ROW.NET_INCOME)[:] = v(ROW.EBT) + v(ROW.TAX)
+    v(ROW.CASH_FLOW)[:] = (v(ROW.NET_INCOME) + v(ROW.DNA_ADD) + v(ROW.CAPITAL_OM)
+                           + v(ROW.CAPEX) + v(ROW.CAPEX_DEBT) + v(ROW.DEBT_REPAYMENT))
+    return CashFlowBatch(years=batch.years, values=values, end_year=batch.end_year)
+
+
+def _stack_by_year(rows, n, n_years):
+    """연도별 값(첫 열 = 시작년도) 목록 또는 2차원 배열 -> (N x 연도) 배열 (짧은 행은 0으로 채움)"""
+    if isinstance(rows, (pd.Series, np.ndarray)):
+        rows = list(rows) if rows.ndim == 2 else [rows] * n
+    elif len(rows) > 0 and np.isscalar(rows[0]):
+        rows = [rows] * n
+    out = np.zeros((n, n_years))
+    for i, row in enumerate(rows):
+        row = np.asarray(row, dtype=float)[:n_years]
+        out[i, :len(row)] = row
+    return out
+
+
+def DEBT_SERVICE_BATCH(capex_debt, construction, operation, interestRate, loanTenor):
+    """
+    INTERESTnDEBTrepayment 의 batch 버전 (연도 순서 점화식, 시나리오 방향으로 vectorize)
 
-    required_rows = [
-        "NET INCOME",
-        "Depreciation and Amortization (add)",
-        "Capital OM Cost",
-        "CAPEX",
-        "CAPEX (DEBT portion)",
-        "DEBT repayment",
-    ]
+    Parameters:
+    - capex_debt: (N x 연도) CAPEX (DEBT portion)
+    - construction, operation: (N x 연도) 건설기간 / 운영기간 여부
+    - interestRate, loanTenor: 길이 N 배열
+
+    Returns:
+    - INTEREST, DEBT REPAYMENT: (N x 연도) 배열
+    """
+    n, n_years = capex_debt.shape
+    col = lambda a: a[:, None]
+    interest = np.zeros((n, n_years))
+    cumulative_debt = np.zeros(n)
+    for j in range(n_years):
+        current_debt = np.where(capex_debt[:, j] > 0, capex_debt[:, j], 0)
+        interest[:, j] = np.where(construction[:, j] & (cumulative_debt > 0), -(cumulative_debt * interestRate), interest[:, j])
+        cumulative_debt = np.where(construction[:, j], cumulative_debt * (1 + interestRate) + current_debt, cumulative_debt)
+    total_debt = cumulative_debt
 
-    # 모든 필수 행이 있는지 확인
-    missing = [row for row in required_rows if row not in df.index]
-    if missing:
-        raise KeyError(f"필수 행이 누락되었습니다: {missing}")
+    n_operation = operation.sum(axis=1)
+    repay = operation & (np.cumsum(operation, axis=1) <= col(loanTenor))
+    n_repay = repay.sum(axis=1)
+    has_debt = (n_operation > 0) & (total_debt > 0)
+    annual_repayment = np.divide(total_debt, n_repay, out=np.zeros(n), where=n_repay > 0)
+    debt_repayment = np.where(col(has_debt) & repay, -col(annual_repayment), 0.0)
 
-    # CASH FLOW 계산
-    cashflow_values = sum(df.loc[row] for row in required_rows)
-    cashflow_row = pd.DataFrame([cashflow_values], index=["CASH FLOW"])
+    remaining_debt = total_debt.copy()
+    for j in range(n_years):
+        active = has_debt & operation[:, j] & (remaining_debt > 0)
+        interest[:, j] = np.where(active, -(remaining_debt * interestRate), interest[:, j])
+        remaining_debt = np.where(active & repay[:, j], remaining_debt - annual_repayment, remaining_debt)
+        remaining_debt = np.where(remaining_debt < 0, 0, remaining_debt)
+    return interest, debt_repayment
 
-    # 기존 CASH FLOW가 있으면 제거 후 교체
-    if "CASH FLOW" in df.index:
-        df = df.drop(index="CASH FLOW")
 
-    # 맨 아래에 삽입
-    result = pd.concat([df, cashflow_row], axis=0)
+def CASH_FLOW_BATCH(prep_period, constructionPeriod, plantLifetime, SNU,
+                    ElectricCapacityPerModule, moduleNumber, electricityPrice, salesToRevenueRatio, capacityFactor,
+                    annual_fuel_cost, interim_initial, annual_cask_cost, interim_om, dry_storage_period, batch_length,
+                    capex, debtToEquityRatio, interestRate, loanTenor, taxRate):
+    """
+    N개 시나리오의 CFS 를 (N x 행 x 연도) 배열로 한 번에 계산 (YEARS ~ CASH_FLOW 와 같은 계산)
 
-    return result
+    Parameters:
+    - prep_period: 건설 준비 기간 (모든 시나리오 공통, 연도 시작점이 같아야 LCOE 할인 시점이 같음)
+    - constructionPeriod, plantLifetime, SNU, ElectricCapacityPerModule, ..., taxRate:
+      스칼라 또는 길이 N 배열 (서로 broadcast)
+    - annual_fuel_cost: Fuel.FrontEnd 의 연간 연료비 (million USD)
+    - capex: 연도별 CAPEX (양수, CP 합계), 첫 열이 -ceil(prep_period) 년도.
+      (N x 연도) 배열, 시나리오별 1차원 배열 목록, 또는 모든 시나리오 공통 1차원 배열
 
+    Returns:
+    - CashFlowBatch
+    """
+    (constructionPeriod, plantLifetime, SNU, capacity, moduleNumber, electricityPrice, salesToRevenueRatio,
+     capacityFactor, annual_fuel_cost, interim_initial, annual_cask_cost, interim_om, dry_storage_period,
+     batch_length, debtToEquityRatio, interestRate, loanTenor, taxRate) = [
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            constructionPeriod, plantLifetime, SNU, ElectricCapacityPerModule, moduleNumber, electricityPrice,
+            salesToRevenueRatio, capacityFactor, annual_fuel_cost, interim_initial, annual_cask_cost, interim_om,
+            dry_storage_period, batch_length, debtToEquityRatio, interestRate, loanTenor, taxRate)]
+    n = len(constructionPeriod)
+
+    # 공통 연도 (시나리오별 종료년도 이후는 계산에서 제외)
+    operation_start = constructionPeriod
+    operation_end = constructionPeriod + plantLifetime
+    end_year = np.ceil(operation_end).astype(int)
+    years = np.arange(-math.ceil(prep_period), end_year.max() + 1)
+    in_grid = years <= end_year[:, None]
+
+    values = np.zeros((n, len(ROW), len(years)))
+    v = lambda row: values[:, row, :]
+    col = lambda a: a[:, None]
+
+    weights, age = YF.allocate(years, operation_start, operation_end)
+
+    # REVENUE / OM / FUEL (Front-end) / Capital OM
+    annual_revenue = capacity * moduleNumber * electricityPrice * salesToRevenueRatio * capacityFactor * 8760 / 1000000
+    v(ROW.REVENUE)[:] = col(annual_revenue) * weights
+    om_cost = np.where(age <= 50,
+                       (116 + 0.56 * age)*col(capacity)*col(moduleNumber)/1000,
+                       (91 + 0.56 * age)*col(capacity)*col(moduleNumber)/1000)
+    om_cost = np.where(col(SNU) != 0, om_cost * 0.9, om_cost)
+    v(ROW.ANNUAL_OM)[:] = -1* om_cost * weights
+    v(ROW.FUEL_FRONTEND)[:] = -1* col(annual_fuel_cost) * weights
+
+    # FUEL (Interim Storage): 초기 투자비 + 연간 Cask 비용 + 연간 OM 비용
+    start_year_int = col(np.ceil(operation_start))
+    cask_start_int = col(np.ceil(operation_start + batch_length/12))
+    operation_end_int = col(np.floor(operation_end))
+    om_end_int = col(np.floor(operation_end + dry_storage_period))
+    fuel_interim = v(ROW.FUEL_INTERIM_STORAGE)
+    fuel_interim += np.where(in_grid & (years == start_year_int), -col(interim_initial), 0.0)
+    fuel_interim += np.where(in_grid & (years >= cask_start_int) & (years <= operation_end_int), -col(annual_cask_cost), 0.0)
+    fuel_interim += np.where(in_grid & (years >= start_year_int) & (years <= om_end_int), -col(interim_om), 0.0)
+
+    v(ROW.GROSS_PROFIT)[:] = v(ROW.REVENUE) + v(ROW.ANNUAL_OM) + v(ROW.FUEL_FRONTEND) + v(ROW.FUEL_INTERIM_STORAGE)
+    v(ROW.CAPITAL_OM)[:] = -1* (17 + 1.25 * age)*col(capacity)*col(moduleNumber)/1000 * weights
+
+    # CAPEX / CAPEX (DEBT portion)
+    v(ROW.CAPEX)[:] = np.where(in_grid, -1*_stack_by_year(capex, n, len(years)), 0.0)
+    v(ROW.CAPEX_DEBT)[:] = v(ROW.CAPEX) * col(debtToEquityRatio) * (-1)
+
+    # INTEREST / DEBT repayment
+    construction = in_grid & (years <= col(constructionPeriod))
+    operation = in_grid & (years > col(constructionPeriod))
+    v(ROW.INTEREST)[:], v(ROW.DEBT_REPAYMENT)[:] = DEBT_SERVICE_BATCH(v(ROW.CAPEX_DEBT), construction, operation,
+                                                                      interestRate, loanTenor)
+
+    # Depreciation and Amortization
+    total_capex = v(ROW.CAPEX).sum(axis=1)
+    total_operation_period = operation_end - operation_start
+    annual_dna = np.divide(total_capex, total_operation_period, out=np.zeros(n), where=total_operation_period > 0)
+    v(ROW.DNA_SUB)[:] = col(annual_dna) * weights
+    v(ROW.DNA_ADD)[:] = -v(ROW.DNA_SUB)
+
+    # EBIT / EBT / TAX / NET INCOME / CASH FLOW
+    v(ROW.EBIT)[:] = v(ROW.GROSS_PROFIT) + v(ROW.DNA_SUB)
+    v(ROW.EBT)[:] = v(ROW.EBIT) + v(ROW.INTEREST)
+    v(ROW.TAX)[:] = np.where(v(ROW.EBT) > 0, -col(taxRate) * v(ROW.EBT), 0.0)
+    v(ROW.NET_INCOME)[:] = v(ROW.EBT) + v(ROW.TAX)
+    v(ROW.CASH_FLOW)[:] = (v(ROW.NET_INCOME) + v(ROW.DNA_ADD) + v(ROW.CAPITAL_OM)
+                           + v(ROW.CAPEX) + v(ROW.CAPEX_DEBT) + v(ROW.DEBT_REPAYMENT))
+
+    return CashFlowBatch(years=years, values=values, end_year=end_year)
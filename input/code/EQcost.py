@@ -6,6 +6,8 @@
 """
 
 # input_reader.py
+import datetime
+import hashlib
 import pandas as pd
 import inspect
 import numpy as np
@@ -16,6 +18,47 @@ warnings.simplefilter(action='ignore', category=FutureWarning)
 
 
 # 환율 적용 ############################################################################################################
+def exchange_rate_index(df_currency):
+    """
+    환율 데이터를 날짜순으로 정렬한 배열로 변환 (이진 탐색용)
+
+    Returns:
+    - rate_dates: 정렬된 날짜 (datetime64[us] 의 int64 값)
+    - rates: 같은 순서의 환율
+    """
+    df_currency_sorted = df_currency.dropna(subset=['DATE']).sort_values('DATE', kind='stable')
+    rate_dates = df_currency_sorted['DATE'].to_numpy(dtype='datetime64[us]').astype(np.int64)
+    rates = df_currency_sorted['CURRENCY'].to_numpy(dtype=float)
+    return rate_dates, rates
+
+
+def closest_date_index(rate_dates, target_dates):
+    """
+    target_dates 각각에 대해 가장 가까운 날짜의 위치 반환 (정확히 같은 날짜 우선)
+    거리가 같으면 이전 날짜를, 같은 날짜가 여러 개면 첫 번째를 선택 (idxmin과 동일)
+    """
+    n = len(rate_dates)
+    right = np.searchsorted(rate_dates, target_dates, side='left')  # target 이상인 첫 위치
+    left = np.clip(right - 1, 0, n - 1)
+    right = np.clip(right, 0, n - 1)
+    use_left = np.abs(target_dates - rate_dates[left]) <= np.abs(rate_dates[right] - target_dates)
+    closest = np.where(use_left, left, right)
+    return np.searchsorted(rate_dates, rate_dates[closest], side='left')
+
+
+def _as_datetime64(values):
+    """
+    datetime 값만 int64 (datetime64[us]) 로 변환
+    Returns: (변환값, 유효한 날짜 여부 mask)
+    """
+    is_date = values.map(lambda v: isinstance(v, (datetime.datetime, np.datetime64)) and not pd.isna(v))
+    date_ok = is_date.to_numpy(dtype=bool)
+    dates = np.zeros(len(values), dtype=np.int64)
+    if date_ok.any():
+        dates[date_ok] = pd.to_datetime(values[date_ok]).to_numpy(dtype='datetime64[us]').astype(np.int64)
+    return dates, date_ok
+
+
 def convert_currency(df_EQcost_original, df_currency):
     """
     procurement_SK34 열의 원화 비용을 달러로 변환
@@ -42,19 +85,8 @@ def convert_currency(df_EQcost_original, df_currency):
         print(f"NaN 개수: {result_df['procurement_SK34'].isna().sum()}")
     '''''
 
-    # 환율 데이터 정렬 (날짜순)
-    df_currency_sorted = df_currency.sort_values('DATE').reset_index(drop=True)
-    
-    def find_closest_exchange_rate(target_date):
-        """가장 가까운 날짜의 환율을 찾는 함수"""
-        if target_date in df_currency_sorted['DATE'].values:
-            # 정확히 매칭되는 날짜가 있는 경우
-            return df_currency_sorted[df_currency_sorted['DATE'] == target_date]['CURRENCY'].iloc[0]
-        else:
-            # 가장 가까운 날짜 찾기
-            date_diffs = abs(df_currency_sorted['DATE'] - target_date)
-            closest_idx = date_diffs.idxmin()
-            return df_currency_sorted.loc[closest_idx, 'CURRENCY']
+    # 환율 데이터 정렬 (날짜순): datetime64 정수 배열 + 환율 배열
+    rate_dates, rates = exchange_rate_index(df_currency)
     
     # 처리할 열 목록
     columns_to_convert = [
@@ -66,15 +98,18 @@ def convert_currency(df_EQcost_original, df_currency):
     
     for procurement_col, contract_col, usd_col in columns_to_convert:
         if procurement_col in result_df.columns and contract_col in result_df.columns:
-            def convert_row(row):
-                try:
-                    procurement_val = float(row[procurement_col])
-                    exchange_rate = find_closest_exchange_rate(row[contract_col])
-                    return (procurement_val / exchange_rate) / 1000000
-                except (ValueError, TypeError):
-                    return 0  # 숫자가 아닌 경우 0으로 처리
-            
-            result_df[usd_col] = result_df.apply(convert_row, axis=1)
+            # 숫자가 아닌 비용은 0으로 처리 (빈 칸은 NaN 유지)
+            procurement = pd.to_numeric(result_df[procurement_col], errors='coerce')
+            procurement_ok = procurement.notna() | result_df[procurement_col].isna()
+
+            # 날짜가 아닌 계약일(문자열, 연도 숫자, 빈 칸)도 0으로 처리
+            contract_dates, date_ok = _as_datetime64(result_df[contract_col])
+            exchange_rate = np.ones(len(result_df))
+            if date_ok.any():
+                exchange_rate[date_ok] = rates[closest_date_index(rate_dates, contract_dates[date_ok])]
+
+            usd = (procurement.to_numpy(dtype=float) / exchange_rate) / 1000000
+            result_df[usd_col] = np.where(procurement_ok.to_numpy() & date_ok, usd, 0.0)
             #print(f"{usd_col} 열 추가 완료")
         else:
             None
@@ -158,93 +193,259 @@ def mergeEQcost(df_EQcost_original):
 
 
 
+# 시나리오와 무관한 EQ 기준 비용 (환율 + 달러가치 + min/Mean/MAX) #############################################################
+# 원본 데이터 내용 해시 -> 결과 (ReactorConfig 와 무관하므로 프로세스 당 한 번만 계산)
+_base_cost_cache = {}
+
+
+def frame_fingerprint(df):
+    """DataFrame 내용(열 이름 + 값 + 인덱스) 해시"""
+    h = hashlib.sha256()
+    h.update(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def base_cost(df_EQcost_original, df_currency, df_dollarValue):
+    """
+    convert_currency -> adjust_dollar_value -> mergeEQcost 를 한 번에 수행 (결과는 캐시)
+
+    Parameters:
+    - df_EQcost_original: EQ Cost 원본 데이터 (수정하지 않음)
+    - df_currency: 환율 데이터
+    - df_dollarValue: 달러 가치 데이터
+
+    Returns:
+    - APR1400_EQcost_2025USD_min/Mean/MAX 열이 추가된 데이터프레임
+      (여러 호출이 같은 DataFrame을 공유하므로 수정하지 말 것. scaling()은 복사본에서 작업함)
+    """
+    key = (frame_fingerprint(df_EQcost_original), frame_fingerprint(df_currency), frame_fingerprint(df_dollarValue))
+    if key not in _base_cost_cache:
+        df_base = convert_currency(df_EQcost_original, df_currency) # 환율 변환 후 우측에 4개 열 추가
+        df_base = adjust_dollar_value(df_base, df_dollarValue) # 딜러가치 변환 우측에 4개 열 추가
+        _base_cost_cache[key] = mergeEQcost(df_base) # min / Mean / MAX 구하기
+    return _base_cost_cache[key]
+
+
+
+# Power scaling exponent 조회 ###########################################################################################
+def power_scaling_dict(df_scaling_power):
+    """
+    SCALING_POWER_EXPONENT 시트 -> {NAME_Scaling: Exponent}
+    빈 칸(NaN)은 None 키로 통일 (NaN 객체 동일성에 의존하지 않고 빈 칸끼리 매칭되도록)
+    """
+    return {scaling_key(name): exponent
+            for name, exponent in zip(df_scaling_power.iloc[:, 0], df_scaling_power.iloc[:, 1])}
+
+
+def scaling_key(power_description):
+    """power_scaling_dict 조회용 키 (빈 칸 -> None)"""
+    return None if pd.isna(power_description) else power_description
+
+
+
+# 행별 스케일링 속성 (시나리오와 무관) #####################################################################################
+DESIGN_CATEGORIES = ['PIPING', 'VALVES', 'PUMPS', 'CABLES', 'MECH']  # DesignSimplification_safety* 순서
+MIN_MEAN_MAX = ['min', 'Mean', 'MAX']
+
+
+def row_scaling_flags(df_EQcost, df_scaling_power):
+    """
+    EQcost 행별 스케일링 속성을 배열로 변환
+
+    Returns:
+    - exponent: POWER_SCALING exponent (없는 이름은 1.0)
+    - module: MODULE_FACTOR == 'O'
+    - design: DESIGN_SIMPLIFICATIONS 의 DESIGN_CATEGORIES 위치 ('X' / 알 수 없는 값은 -1 -> 1.0)
+    - country: COUNTRY-SPECIFIC != 'X'
+    """
+    exponent_dict = power_scaling_dict(df_scaling_power)
+    return {
+        'exponent': np.array([exponent_dict.get(scaling_key(v), 1.0) for v in df_EQcost['POWER_SCALING']], dtype=float),
+        'module': (df_EQcost['MODULE_FACTOR'] == 'O').to_numpy(),
+        'design': np.array([DESIGN_CATEGORIES.index(v) if v in DESIGN_CATEGORIES else -1
+                            for v in df_EQcost['DESIGN_SIMPLIFICATIONS']], dtype=int),
+        'country': (df_EQcost['COUNTRY-SPECIFIC'] != 'X').to_numpy(),
+    }
+
+
+def scaling_factor_matrix(flags, ElectricCapacityPerModule, ModuleNumber, country_factor, design_factors):
+    """
+    (시나리오 N x 행 R) 스케일링 계수 = power * module * design * country
+
+    Parameters:
+    - flags: row_scaling_flags 결과
+    - ElectricCapacityPerModule, ModuleNumber, country_factor: (N,) 배열
+    - design_factors: (N, 5) 배열 (DESIGN_CATEGORIES 순서, None -> NaN)
+    """
+    capacity = np.asarray(ElectricCapacityPerModule, dtype=float)[:, None]
+    module_number = np.asarray(ModuleNumber, dtype=float)[:, None]
+    country_factor = np.asarray(country_factor, dtype=float)[:, None]
+    design_factors = np.asarray(design_factors, dtype=float)
+
+    # 1) Power scaling factor
+    power_factor = (capacity / 1400) ** flags['exponent']
+    # 2) Module factor: 기준이 2모듈이므로 2로 나눔
+    module_factor = np.where(flags['module'], module_number / 2, 2 / 2)
+    # 3) Design simplification factor
+    design = flags['design']
+    design_factor = np.where(design >= 0, design_factors[:, np.clip(design, 0, None)], 1.0)
+    # 4) Country factor
+    country_factor = np.where(flags['country'], country_factor, 1.0)
+
+    total_scaling = power_factor * module_factor * design_factor * country_factor
+    # design factor 가 None 인 행은 기본값 1.0 사용
+    return np.where(np.isnan(design_factor), 1.0, total_scaling)
+
+
+def country_factors(Country, df_country_specific):
+    """Country (스칼라 또는 배열) -> EQ country factor 배열 (없는 국가는 1.0)"""
+    country_factor_dict = dict(zip(df_country_specific['Country'], df_country_specific['EQ']))
+    return np.array([country_factor_dict.get(c, 1.0) for c in np.atleast_1d(np.asarray(Country, dtype=object))], dtype=float)
+
+
+
 # EQ Cost Scaling 작업
 def scaling(Country, df_EQcost_original, df_scaling_power, df_country_specific, ElectricCapacityPerModule, ModuleNumber, 
                  DesignSimplification_safetyPIPING, DesignSimplification_safetyVALVES, 
                  DesignSimplification_safetyPUMPS, DesignSimplification_safetyCABLES, 
-                 DesignSimplification_safetyMECH):
+                 DesignSimplification_safetyMECH, export=True):
     """
     EQ Cost 스케일링 함수
+    - export: True 이면 작업 폴더의 result_df_output.xlsx, 경로이면 그 경로로 저장 (False 이면 저장 안 함)
     """
     
     result_df = df_EQcost_original.copy()
     
-    # Power scaling exponent 딕셔너리 생성
-    power_scaling_dict = dict(zip(df_scaling_power.iloc[:, 0], df_scaling_power.iloc[:, 1]))
-    
-    # Country factor 딕셔너리 생성
-    country_factor_dict = dict(zip(df_country_specific['Country'], df_country_specific['EQ']))
-    
-    # Design simplification 변수들
-    design_factors = {
-        'PIPING': DesignSimplification_safetyPIPING,
-        'VALVES': DesignSimplification_safetyVALVES,
-        'PUMPS': DesignSimplification_safetyPUMPS,
-        'CABLES': DesignSimplification_safetyCABLES,
-        'MECH': DesignSimplification_safetyMECH
-    }
+    # Design simplification 변수들 (DESIGN_CATEGORIES 순서)
+    design_factors = [DesignSimplification_safetyPIPING, DesignSimplification_safetyVALVES,
+                      DesignSimplification_safetyPUMPS, DesignSimplification_safetyCABLES,
+                      DesignSimplification_safetyMECH]
+    if any(f is None for f in design_factors):
+        print(f"None 발견! design factors={design_factors} (해당 행은 scaling 1.0 사용)")
     
-    # 각 행별로 스케일링 계수 계산
-    scaling_factors = []
+    # 각 행별로 스케일링 계수 계산 (시나리오 1개)
+    flags = row_scaling_flags(result_df, df_scaling_power)
+    scaling_factors = scaling_factor_matrix(flags, [ElectricCapacityPerModule], [ModuleNumber],
+                                            country_factors(Country, df_country_specific), [design_factors])[0]
     
-    for idx, row in result_df.iterrows():
-        # 1) Power scaling factor
-        power_description = row['POWER_SCALING']
-        exponent = power_scaling_dict.get(power_description, 1.0)
-        power_factor = (ElectricCapacityPerModule / 1400) ** exponent
-        
-        # 2) Module factor
-        module_description = row['MODULE_FACTOR']
-        if module_description == 'O':
-            module_factor = ModuleNumber/2  # 기준이 2모듈이므로 2로 나눔
-        else:  # 'X'인 경우
-            module_factor = 2/2   # 기준이 2모듈이므로 2로 나눔
-        
-        # 3) Design simplification factor
-        design_description = row['DESIGN_SIMPLIFICATIONS']
-        if design_description == 'X':
-            design_factor = 1.0
-        else:
-            design_factor = design_factors.get(design_description, 1.0)
-        
-        # 4) Country factor
-        country_description = row['COUNTRY-SPECIFIC']
-        if country_description == 'X':
-            country_factor = 1.0
-        else:  # 'O'인 경우
-            country_factor = country_factor_dict.get(Country, 1.0)
-        
-
-        # 디버깅 출력
-        #print(f"Row {idx}: power_factor={power_factor}, module_factor={module_factor}, design_factor={design_factor}, country_factor={country_factor}")
-        
-        # None 체크
-        if power_factor is None or module_factor is None or design_factor is None or country_factor is None:
-            print(f"None 발견! power_description='{power_description}', module_description='{module_description}', design_description='{design_description}', country_description='{country_description}'")
-            total_scaling = 1.0  # 기본값 사용
-        else:
-            total_scaling = power_factor * module_factor * design_factor * country_factor
-        
-
-        scaling_factors.append(total_scaling)
-    
-    
-    # print(f"Scaling factors: {scaling_factors}")
-    # print(f"Scaling factors length: {len(scaling_factors)}")
-    # print(f"Scaling factors type: {type(scaling_factors)}")
-    # print(f"result_df:{result_df}")
-    # exit()
     # 새로운 scaled 열들 생성
     result_df['scaled_APR1400_EQcost_2025USD_min'] = result_df['APR1400_EQcost_2025USD_min'] * scaling_factors
     result_df['scaled_APR1400_EQcost_2025USD_Mean'] = result_df['APR1400_EQcost_2025USD_Mean'] * scaling_factors
     result_df['scaled_APR1400_EQcost_2025USD_MAX'] = result_df['APR1400_EQcost_2025USD_MAX'] * scaling_factors
 
     #print(result_df)
-    result_df.to_excel('result_df_output.xlsx', index=False)    
+    if export:
+        result_df.to_excel('result_df_output.xlsx' if export is True else export, index=False)
     return result_df
 
 
 
+# 여러 시나리오 EQ Cost 스케일링 + CP별 합산 (batch) ########################################################################
+def cp_indicator(cp_values, df_cp_list):
+    """(행 R x CP_List K) 0/1 행렬: sum_by_CP 의 pivot + left join 과 같은 매칭"""
+    cp_values = np.asarray(cp_values, dtype=object)
+    cp_list = df_cp_list.iloc[:, 0].to_numpy(dtype=object)
+    return (cp_values[:, None] == cp_list[None, :]).astype(float)
+
+
+# Scaling group 별 closed-form 모델 ######################################################################################
+# 행별 scaled cost = base cost * (용량/1400)^exponent * module * design * country 이므로
+# 같은 스케일링 속성(group)을 가진 행들의 base cost 를 CP별로 미리 합산해 두면
+# 시나리오 당 계산은 group 수만큼의 power 계산 + (N x G) @ (G x CP) 로 끝남
+def group_by_flags(flags, costs, indicator):
+    """
+    스케일링 속성이 같은 행들을 하나의 group으로 묶고 base cost 를 CP별로 합산
+
+    Parameters:
+    - flags: {속성 이름: (R,) 배열} (row_scaling_flags 결과)
+    - costs: {이름: (R,) base cost 배열} (NaN 없음)
+    - indicator: (R x K) 행 -> CP 0/1 행렬
+
+    Returns:
+    - {'flags': {속성 이름: (G,) 배열}, 'base': {이름: (G x K) 배열}}
+    """
+    names = list(flags)
+    keys = np.column_stack([np.asarray(flags[name], dtype=float) for name in names])
+    unique_keys, group_of_row = np.unique(keys, axis=0, return_inverse=True)
+    group_of_row = group_of_row.reshape(-1)
+    membership = np.zeros((len(unique_keys), len(group_of_row)))
+    membership[group_of_row, np.arange(len(group_of_row))] = 1.0
+
+    group_flags = {name: unique_keys[:, i].astype(np.asarray(flags[name]).dtype) for i, name in enumerate(names)}
+    base = {name: membership @ (np.asarray(cost, dtype=float)[:, None] * indicator) for name, cost in costs.items()}
+    return {'flags': group_flags, 'base': base}
+
+
+def scaling_groups(df_EQcost_base, df_scaling_power, df_cp_list):
+    """
+    EQ Cost 의 scaling group 별 CP 합산 base cost (시나리오와 무관, 한 번만 계산)
+
+    Parameters:
+    - df_EQcost_base: base_cost 결과 (APR1400_EQcost_2025USD_min/Mean/MAX 포함)
+    - df_scaling_power: SCALING_POWER_EXPONENT 데이터
+    - df_cp_list: CP_List (결과 열 순서)
+
+    Returns:
+    - group_by_flags 결과 ('base' 는 min / Mean / MAX 별 (G x CP) 배열)
+    """
+    flags = row_scaling_flags(df_EQcost_base, df_scaling_power)
+    indicator = cp_indicator(df_EQcost_base['CP'], df_cp_list)
+    # pivot_table sum 과 같이 NaN 비용은 0으로 취급
+    costs = {minMeanMAX: np.nan_to_num(df_EQcost_base['APR1400_EQcost_2025USD_' + minMeanMAX].to_numpy(dtype=float))
+             for minMeanMAX in MIN_MEAN_MAX}
+    return group_by_flags(flags, costs, indicator)
+
+
+def grouped_cost(groups, ElectricCapacityPerModule, ModuleNumber, country_factor, design_factors):
+    """
+    scaling_groups 결과로 (N x CP) EQ Cost 계산
+
+    Parameters:
+    - ElectricCapacityPerModule, ModuleNumber, country_factor: (N,) 배열
+    - design_factors: (N, 5) 배열 (DESIGN_CATEGORIES 순서)
+
+    Returns:
+    - {'min' / 'Mean' / 'MAX': (N x CP) 배열}
+    """
+    factors = scaling_factor_matrix(groups['flags'], ElectricCapacityPerModule, ModuleNumber, country_factor, design_factors)
+    return {minMeanMAX: factors @ base for minMeanMAX, base in groups['base'].items()}
+
+
+def scaling_batch(df_EQcost_base, df_scaling_power, df_country_specific, df_cp_list,
+                  ElectricCapacityPerModule, ModuleNumber, Country,
+                  DesignSimplification_safetyPIPING, DesignSimplification_safetyVALVES,
+                  DesignSimplification_safetyPUMPS, DesignSimplification_safetyCABLES,
+                  DesignSimplification_safetyMECH, groups=None):
+    """
+    scaling + sum_by_CP 를 N개 시나리오에 대해 한 번에 계산
+
+    Parameters:
+    - df_EQcost_base: base_cost 결과 (APR1400_EQcost_2025USD_min/Mean/MAX 포함)
+    - df_cp_list: CP_List (결과 열 순서)
+    - ElectricCapacityPerModule, ModuleNumber, Country, DesignSimplification_safety*:
+      스칼라 또는 길이 N 배열 (서로 broadcast)
+    - groups: 미리 계산한 scaling_groups 결과 (None 이면 여기서 계산)
+
+    Returns:
+    - {'min' / 'Mean' / 'MAX': (N x CP) 배열}, 열 순서는 df_cp_list 행 순서 (sum_by_CP 의 EQ_Cost_2025USD 와 같음)
+    """
+    (capacity, module_number, country,
+     piping, valves, pumps, cables, mech) = np.broadcast_arrays(
+        np.asarray(ElectricCapacityPerModule, dtype=float), np.asarray(ModuleNumber, dtype=float),
+        np.asarray(Country, dtype=object),
+        *[np.asarray(f, dtype=float) for f in (DesignSimplification_safetyPIPING, DesignSimplification_safetyVALVES,
+                                               DesignSimplification_safetyPUMPS, DesignSimplification_safetyCABLES,
+                                               DesignSimplification_safetyMECH)])
+    design_factors = np.column_stack([np.atleast_1d(f) for f in (piping, valves, pumps, cables, mech)])
+
+    if groups is None:
+        groups = scaling_groups(df_EQcost_base, df_scaling_power, df_cp_list)
+    return grouped_cost(groups, np.atleast_1d(capacity), np.atleast_1d(module_number),
+                        country_factors(country, df_country_specific), design_factors)
+
+
+
 # CP별 합산한 값 반환 ######################################################################################################
 def sum_by_CP(df_eqcost_processed, df_cp_list, minMeanMAX):
 
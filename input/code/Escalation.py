@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import math
+import input.code.Year_Fraction as YF
 
 def CAPEX_w0_schedule(CPpivot, CPconst):
     """
@@ -54,6 +55,90 @@ def addSCHEDULE(CAPEX, df_schedule):
 
 
 
+# CP별 EQ Cost escalation 구분 (표에 없는 CP는 DEFAULT_ESCALATION_CATEGORY)
+ESCALATION_CATEGORY = {
+    'CP-M3': 'TG',
+    'CP-M5': 'NSSS',
+}
+DEFAULT_ESCALATION_CATEGORY = 'BOP'
+ESCALATION_CATEGORIES = ['NSSS', 'TG', 'BOP']
+
+
+def escalation_category(cp_list):
+    """CP 목록 -> escalation 구분 목록 (NSSS / TG / BOP)"""
+    return [ESCALATION_CATEGORY.get(cp, DEFAULT_ESCALATION_CATEGORY) for cp in cp_list]
+
+
+def escalation_factors(rate, years):
+    """
+    연도별 escalation 계수 (1 + rate) ** year (음수 연도는 할인, 양수 연도는 할증)
+
+    Parameters:
+    - rate: escalation 비율 (스칼라 또는 길이 N 배열)
+    - years: 연도 목록
+
+    Returns:
+    - 스칼라 rate: (연도,) 배열, 배열 rate: (N x 연도) 배열
+    """
+    if np.ndim(rate) == 0:
+        # 스칼라는 기존 셀 단위 계산과 같은 값이 나오도록 Python pow 사용
+        return np.array([(1 + rate) ** year for year in years], dtype=float)
+    rate = np.asarray(rate, dtype=float).reshape(-1, 1)
+    return np.power(1 + rate, np.asarray(years, dtype=float))
+
+
+def _years(prep_period, construction_period, operation_period):
+    # CF.YEARS와 동일한 방식으로 연도 생성
+    start_year = -math.ceil(prep_period)
+    end_year = math.ceil(construction_period + operation_period)
+    return list(range(start_year, end_year + 1))
+
+
+def _spread(df_CAPEX, years):
+    # CP별 (START, END) 기간에 EQ Cost / Construction Cost 분배 (소수점 고려, CFS 와 같은 분배 규칙)
+    start_time = df_CAPEX['START'].to_numpy(dtype=float)
+    end_time = df_CAPEX['END'].to_numpy(dtype=float)
+    total_duration = end_time - start_time
+    weights, _ = YF.allocate(years, start_time, end_time)
+    weights[~(total_duration > 0)] = 0.0  # 기간이 0 이하인 CP는 분배하지 않음
+    duration = np.where(total_duration > 0, total_duration, 1.0)[:, None]
+
+    eq_cost = df_CAPEX['EQ_Cost_2025USD'].to_numpy(dtype=float)[:, None]
+    construction_cost = df_CAPEX['CONSTRUCTION_Cost_2025USD'].to_numpy(dtype=float)[:, None]
+    return eq_cost * weights / duration, construction_cost * weights / duration
+
+
+# CAPEX_COMPONENTS 의 순서
+CAPEX_COMPONENT_NAMES = ('EQ', 'EQ Escalated', 'CONSTRUCTION', 'CONSTRUCTION Escalated')
+
+
+def CAPEX_COMPONENTS(df_CAPEX, prep_period, construction_period, operation_period,
+                     escalationNSSS, escalationTG, escalationBOP, escalationLabor):
+    """
+    CP별 연도별 EQ / Construction 비용 (escalation 전 / 후)
+
+    Parameters:
+    - CAPEX 와 같음
+
+    Returns:
+    - (4 x CP x 연도) 배열, 순서는 CAPEX_COMPONENT_NAMES, 연도는 CAPEX 결과의 열과 같음
+    """
+    years = _years(prep_period, construction_period, operation_period)
+    
+    # CP별 비용 분배 (EQ Cost와 Construction Cost 따로)
+    cp_list = df_CAPEX['CPlist'].tolist()
+    eq_spread, construction_spread = _spread(df_CAPEX, years)
+    
+    # EQ Cost에 CP별 ESCALATION 적용 (구분별 연도 계수를 한 번만 계산)
+    rates = {'NSSS': escalationNSSS, 'TG': escalationTG, 'BOP': escalationBOP}
+    factors = {category: escalation_factors(rates[category], years) for category in ESCALATION_CATEGORIES}
+    eq_factor = np.array([factors[category] for category in escalation_category(cp_list)]).reshape(len(cp_list), len(years))
+
+    # CONSTRUCTION Cost에 ESCALATION 적용 (모든 CP에 동일)
+    labor_factor = escalation_factors(escalationLabor, years)
+    return np.stack([eq_spread, eq_spread * eq_factor, construction_spread, construction_spread * labor_factor])
+
+
 def CAPEX(df_CAPEX, prep_period, construction_period, operation_period,
           escalationNSSS, escalationTG, escalationBOP, escalationLabor):
     """
@@ -70,79 +155,66 @@ def CAPEX(df_CAPEX, prep_period, construction_period, operation_period,
     - df_afterESCALATION: escalation이 적용된 총 비용 Cash Flow
     """
     
-    # 1단계: CF.YEARS와 동일한 방식으로 연도 생성
-    start_year = -math.ceil(prep_period)
-    end_year = math.ceil(construction_period + operation_period)
-    years = list(range(start_year, end_year + 1))
-    
-    # 2단계: EQ Cost와 Construction Cost 분리해서 처리할 DataFrame 생성
+    # 1~5단계: 연도 생성, CP별 비용 분배, ESCALATION 적용
+    years = _years(prep_period, construction_period, operation_period)
     cp_list = df_CAPEX['CPlist'].tolist()
-    df_EQ = pd.DataFrame(0.0, index=cp_list, columns=years)
-    df_CONSTRUCTION = pd.DataFrame(0.0, index=cp_list, columns=years)
-    
-    # 3단계: 각 CP별로 비용 분배 (EQ Cost와 Construction Cost 따로)
-    for idx, row in df_CAPEX.iterrows():
-        cp = row['CPlist']
-        start_time = row['START']
-        end_time = row['END']
-        eq_cost = row['EQ_Cost_2025USD']
-        construction_cost = row['CONSTRUCTION_Cost_2025USD']
-        
-        total_duration = end_time - start_time
-        if total_duration <= 0:
-            continue
-            
-        # 시작/종료 연도의 정수 부분과 소수 부분 계산
-        start_year_int = math.ceil(start_time)
-        start_fraction = start_year_int - start_time
-        end_year_int = math.floor(end_time)
-        end_fraction = end_time - end_year_int
-        
-        # 첫 번째 연도 (부분 기간)
-        if start_year_int in years:
-            df_EQ.loc[cp, start_year_int] = eq_cost * start_fraction / total_duration
-            df_CONSTRUCTION.loc[cp, start_year_int] = construction_cost * start_fraction / total_duration
-        
-        # 중간 연도들 (완전 기간)
-        for year in range(start_year_int + 1, end_year_int + 1):
-            if year in years:
-                df_EQ.loc[cp, year] = eq_cost * 1.0 / total_duration
-                df_CONSTRUCTION.loc[cp, year] = construction_cost * 1.0 / total_duration
-        
-        # 마지막 연도 (부분 기간)
-        if end_fraction > 0 and (end_year_int + 1) in years:
-            df_EQ.loc[cp, end_year_int + 1] = eq_cost * end_fraction / total_duration
-            df_CONSTRUCTION.loc[cp, end_year_int + 1] = construction_cost * end_fraction / total_duration
-    
-    # 4단계: EQ Cost에 CP별 ESCALATION 적용
-    df_EQ_escalated = df_EQ.copy()
-    #print(df_EQ_escalated)
-    
-    for cp in cp_list:
-        for year in years:
-            year_index = year  # year 자체를 인덱스로 사용 (음수면 할인, 양수면 할증)
-            
-            if cp == 'CP-M3':
-                df_EQ_escalated.loc[cp, year] *= (1 + escalationTG) ** year_index
-            elif cp == 'CP-M5':
-                df_EQ_escalated.loc[cp, year] *= (1 + escalationNSSS) ** year_index
-            else:  # 나머지 CP들
-                df_EQ_escalated.loc[cp, year] *= (1 + escalationBOP) ** year_index
-    
-
-
-    #print(df_EQ_escalated)
-
-    # 5단계: CONSTRUCTION Cost에 ESCALATION 적용 (모든 CP에 동일)
-    df_CONSTRUCTION_escalated = df_CONSTRUCTION.copy()
-    
-    # 모든 Construction Cost에 escalationLabor 적용
-    for year in years:
-        year_index = year  # year 자체를 인덱스로 사용
-        df_CONSTRUCTION_escalated[year] *= (1 + escalationLabor) ** year_index
+    _, eq_escalated, _, construction_escalated = CAPEX_COMPONENTS(
+        df_CAPEX, prep_period, construction_period, operation_period,
+        escalationNSSS, escalationTG, escalationBOP, escalationLabor)
+    df_EQ_escalated = pd.DataFrame(eq_escalated, index=cp_list, columns=years)
+    df_CONSTRUCTION_escalated = pd.DataFrame(construction_escalated, index=cp_list, columns=years)
     
     # 6단계: EQ Cost (escalated) + Construction Cost (escalated) 합계
     df_afterESCALATION = df_EQ_escalated + df_CONSTRUCTION_escalated
     
     #print(df_afterESCALATION)
     return df_afterESCALATION
+
+
+def _unit_spread(df_CAPEX, years):
+    # 비용 1 당 CP별 연도 분배 (CP x 연도), CP별 비용이 시나리오마다 다를 때 사용
+    unit = pd.DataFrame({'CPlist': df_CAPEX['CPlist'], 'EQ_Cost_2025USD': 1.0, 'CONSTRUCTION_Cost_2025USD': 1.0,
+                         'START': df_CAPEX['START'], 'END': df_CAPEX['END']})
+    return _spread(unit, years)[0]
+
+
+def CAPEX_BATCH(df_CAPEX, prep_period, construction_period, operation_period,
+                escalationNSSS, escalationTG, escalationBOP, escalationLabor,
+                eq_cost=None, construction_cost=None):
+    """
+    escalation 비율 N개 조합의 연도별 총 CAPEX (스케줄은 공통, sweep 용)
+
+    CP별 분배는 한 번만 하고, 구분별 (NSSS / TG / BOP / Labor) 연도 합계에 계수를 곱한다.
+
+    Parameters:
+    - df_CAPEX: CP별 비용과 START, END 정보가 있는 데이터프레임
+    - prep_period, construction_period, operation_period: 기간
+    - escalationNSSS, escalationTG, escalationBOP, escalationLabor: 스칼라 또는 길이 N 배열
+    - eq_cost, construction_cost: 시나리오별 CP 비용 (N x CP, df_CAPEX 행 순서).
+      None 이면 df_CAPEX 의 EQ_Cost_2025USD / CONSTRUCTION_Cost_2025USD 를 모든 시나리오에 사용
+
+    Returns:
+    - (N x 연도) 배열 (CF.CASH_FLOW_BATCH 의 capex 입력), CAPEX(...).sum() 과 같은 값
+    """
+    years = _years(prep_period, construction_period, operation_period)
+    cp_category = np.array(escalation_category(df_CAPEX['CPlist'].tolist()), dtype=object)
+    if eq_cost is None and construction_cost is None:
+        eq_spread, construction_spread = _spread(df_CAPEX, years)
+        category_spread = lambda mask: eq_spread[mask].sum(axis=0)
+        labor_spread = construction_spread.sum(axis=0)
+    else:
+        # 시나리오별 CP 비용: (N x CP) @ (CP x 연도)
+        unit = _unit_spread(df_CAPEX, years)
+        eq_cost = np.atleast_2d(np.asarray(df_CAPEX['EQ_Cost_2025USD'] if eq_cost is None else eq_cost, dtype=float))
+        construction_cost = np.atleast_2d(np.asarray(df_CAPEX['CONSTRUCTION_Cost_2025USD'] if construction_cost is None
+                                                     else construction_cost, dtype=float))
+        category_spread = lambda mask: eq_cost[:, mask] @ unit[mask]
+        labor_spread = construction_cost @ unit
+
+    rates = np.broadcast_arrays(*(np.atleast_1d(np.asarray(rate, dtype=float))
+                                  for rate in (escalationNSSS, escalationTG, escalationBOP, escalationLabor)))
+    total = np.zeros((len(rates[0]), len(years)))
+    for category, rate in zip(ESCALATION_CATEGORIES, rates[:3]):
+        total = total + escalation_factors(rate, years) * category_spread(cp_category == category)
+    total = total + escalation_factors(rates[3], years) * labor_spread
+    return total
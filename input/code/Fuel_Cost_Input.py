@@ -1,36 +1,48 @@
-import math
 import numpy as np
 
 
-def FrontEnd(x_Feed, x_Product, x_Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice,moduleNumber,BatchNumber, BatchCycleLength, CoreDesignFactor):
+def _front_end_quantities(x_Feed, x_Product, x_Tail, totalFuelQty, moduleNumber, BatchNumber, BatchCycleLength, CoreDesignFactor):
+    """
+    연간 front-end 물량 (FrontEnd / FrontEnd_BATCH 공통, 스칼라 또는 배열)
 
-    # 여기에 계산 로직 작성
+    Returns:
+    - tU3O8, tUCNV, tSWU, tUFAB
+    """
     # totalFuelQty: Initial Core Inventory [tU/(module*one fuel charging)]
 
-    # (4) Fabrication Cost: tUFAB*FabricationPrice
+    # (4) Fabrication: tUFAB
     tUFAB = totalFuelQty*moduleNumber*(12/(BatchNumber*BatchCycleLength))*CoreDesignFactor
-    FabricationCost = tUFAB*FabricationPrice
-    # (3) Enrichment Cost: tSWU*EnrichmentPrice
-    V_Feed = (2*x_Feed-1)*math.log(x_Feed/(1-x_Feed))
-    V_Product = (2*x_Product-1)*math.log(x_Product/(1-x_Product))
-    V_Tail = (2*x_Tail-1)*math.log(x_Tail/(1-x_Tail))
+    # (3) Enrichment: tSWU
+    value = lambda x: (2*x-1)*np.log(x/(1-x))
     FtoP = (x_Product-x_Tail)/(x_Feed-x_Tail)
     #TtoP = (x_Product-x_Feed)/(x_Feed-x_Tail)
-    SWUtoP = (V_Product-V_Tail) - FtoP*(V_Feed-V_Tail) # [SWU/tU]
-
+    SWUtoP = (value(x_Product)-value(x_Tail)) - FtoP*(value(x_Feed)-value(x_Tail)) # [SWU/tU]
     tSWU = SWUtoP * tUFAB
-    EnrichmentCost = tSWU*EnrichmentPrice
-    # (2) Conversion Cost: tUCNV*ConversionPrice
+    # (2) Conversion: tUCNV
     tUCNV = FtoP * tUFAB
-    ConversionCost = tUCNV*ConversionPrice
-    # (1) Natural Uranium Cost: tU3O8*U3O8Price
+    # (1) Natural Uranium: tU3O8
     U238 = 238.051
     U235 = 235.044
     O16 = 15.999
     U3O8toF = (x_Feed*U235 + (1-x_Feed)*U238)/((x_Feed*U235 + (1-x_Feed)*U238)+O16*8/3)
-
     tU3O8 = tUCNV / U3O8toF
+    return tU3O8, tUCNV, tSWU, tUFAB
+
+
+def FrontEnd(x_Feed, x_Product, x_Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice,moduleNumber,BatchNumber, BatchCycleLength, CoreDesignFactor):
+
+    tU3O8, tUCNV, tSWU, tUFAB = _front_end_quantities(x_Feed, x_Product, x_Tail, totalFuelQty, moduleNumber,
+                                                      BatchNumber, BatchCycleLength, CoreDesignFactor)
+    tU3O8, tUCNV, tSWU, tUFAB = float(tU3O8), float(tUCNV), float(tSWU), float(tUFAB)
+
+    # (1) Natural Uranium Cost: tU3O8*U3O8Price
     NaturalUraniumCost = tU3O8*U3O8Price
+    # (2) Conversion Cost: tUCNV*ConversionPrice
+    ConversionCost = tUCNV*ConversionPrice
+    # (3) Enrichment Cost: tSWU*EnrichmentPrice
+    EnrichmentCost = tSWU*EnrichmentPrice
+    # (4) Fabrication Cost: tUFAB*FabricationPrice
+    FabricationCost = tUFAB*FabricationPrice
 
     print("-----------")
     print(f"tU3O8: {tU3O8}")
@@ -41,14 +53,32 @@ def FrontEnd(x_Feed, x_Product, x_Tail, totalFuelQty, U3O8Price, EnrichmentPrice
 
     AnnualFuelCost = NaturalUraniumCost + ConversionCost + EnrichmentCost + FabricationCost
     ratio = {"U3O8": NaturalUraniumCost/AnnualFuelCost, "Conversion": ConversionCost/AnnualFuelCost, "Enrichment": EnrichmentCost/AnnualFuelCost, "Fabrication": FabricationCost/AnnualFuelCost}
-    # (1) Natural Uranium Cost: tU3O8*U3O8Price
-    # (2) Conversion Cost: tUCNV*ConversionPrice
-    # (3) Enrichment Cost: tSWU*EnrichmentPrice
-    # (4) Fabrication Cost: tUFAB*FabricationPrice
 
     return AnnualFuelCost/1000, ratio  # in million USD
 
 
+def FrontEnd_BATCH(x_Feed, x_Product, x_Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice, moduleNumber, BatchNumber, BatchCycleLength, CoreDesignFactor):
+    """
+    FrontEnd 의 연간 연료비를 N개 시나리오에 대해 한 번에 계산 (출력 없음)
+
+    Parameters:
+    - FrontEnd 와 같음, 각각 스칼라 또는 길이 N 배열
+
+    Returns:
+    - 길이 N 배열: 연간 연료비 (million USD)
+    """
+    (x_Feed, x_Product, x_Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice,
+     moduleNumber, BatchNumber, BatchCycleLength, CoreDesignFactor) = [
+        np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+            x_Feed, x_Product, x_Tail, totalFuelQty, U3O8Price, EnrichmentPrice, FabricationPrice, ConversionPrice,
+            moduleNumber, BatchNumber, BatchCycleLength, CoreDesignFactor)]
+    tU3O8, tUCNV, tSWU, tUFAB = _front_end_quantities(x_Feed, x_Product, x_Tail, totalFuelQty, moduleNumber,
+                                                      BatchNumber, BatchCycleLength, CoreDesignFactor)
+
+    AnnualFuelCost = tU3O8*U3O8Price + tUCNV*ConversionPrice + tSWU*EnrichmentPrice + tUFAB*FabricationPrice
+    return AnnualFuelCost/1000  # in million USD
+
+
 def InterimStorage(COSTperHM, HMperASSEMBLY,BatchNumber, BatchCycleLength, ASSEMBLYperCORE, moduleNumber):
 
     annualASSEMBLY = ASSEMBLYperCORE/BatchNumber*(12/BatchCycleLength) #Assembly per Core 같은 경우 APR1400 = 241 기준
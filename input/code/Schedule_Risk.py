@@ -0,0 +1,253 @@
+"""
+건설 공기 Monte Carlo 위험 분석 (Scheduling.TaskGraph 위에서 모든 sample 을 한 번에 계산)
+
+- 작업별 DURATION 분포 (triangular / PERT) 또는 Rate (BASEMAT, IN-CV, CNT) 분포에서 sample
+- 모든 sample 의 CPM 을 한 번에 계산 (Scheduling.solve, sample 방향으로 vectorize)
+- 건설 기간 분위수, 작업별 criticality index (critical 경로에 포함된 sample 비율)
+- 건설 기간 sample -> CF.CASH_FLOW_BATCH -> ANALYSIS.LCOE_BATCH (LCOE 분포)
+
+작업별 분포 범위는 스케줄 시트의 'DURATION MIN', 'DURATION MAX' 열 (year) 이 있으면 그 값을,
+없으면 결정론적 DURATION 에 대한 비율 (low, high) 을 사용한다. 최빈값은 결정론적 DURATION.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import input.code.Scheduling as SCHEDULING
+import input.code.Escalation as ESCALATION
+import input.code.Cash_Flow_Statement as CF
+import input.code.Analysis as ANALYSIS
+import input.code.Fuel_Cost_Input as Fuel
+
+# main: constructionPeriod = max(critical_path_duration, 10.45)
+MIN_CONSTRUCTION_PERIOD = 10.45
+
+# 스케줄 시트의 작업별 분포 범위 열 (없으면 비율 사용)
+DURATION_RANGE_COLUMNS = ('DURATION MIN', 'DURATION MAX')
+
+DISTRIBUTIONS = ('triangular', 'pert')
+
+
+def sample_distribution(low, mode, high, n, method='triangular', rng=None, pert_lambda=4.0):
+    """
+    (low, mode, high) 3점 분포 sample
+
+    Parameters:
+    - low, mode, high: 스칼라 또는 길이 K 배열 (low == high 이면 mode 고정)
+    - n: sample 수
+    - method: 'triangular' 또는 'pert' (Beta-PERT)
+    - rng: np.random.Generator
+    - pert_lambda: PERT 형상 계수 (보통 4)
+
+    Returns:
+    - (n x K) 배열
+    """
+    if method not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {method} (expected one of {DISTRIBUTIONS})")
+    rng = np.random.default_rng() if rng is None else rng
+    low, mode, high = [np.atleast_1d(np.asarray(a, dtype=float)) for a in np.broadcast_arrays(low, mode, high)]
+    if np.any((mode < low) | (mode > high)):
+        raise ValueError("Distribution mode must lie between low and high")
+
+    span = high - low
+    spread = span > 0
+    safe_span = np.where(spread, span, 1.0)
+    if method == 'triangular':
+        # 역변환: F(mode) = (mode - low) / span
+        c = np.where(spread, (mode - low) / safe_span, 0.0)
+        u = rng.random((n, len(low)))
+        x = np.where(u < c, np.sqrt(u * c), 1 - np.sqrt((1 - u) * (1 - c)))
+    else:
+        alpha = 1 + pert_lambda * np.where(spread, (mode - low) / safe_span, 0.5)
+        beta = 1 + pert_lambda * np.where(spread, (high - mode) / safe_span, 0.5)
+        x = rng.beta(alpha, beta, size=(n, len(low)))
+    return np.where(spread, low + x * span, mode)
+
+
+def _rate_distribution(rate):
+    # 스칼라 -> 고정값, (min, mode, max) -> 분포
+    rate = np.asarray(rate, dtype=float)
+    if rate.ndim == 0:
+        return rate, rate, rate
+    if rate.shape != (3,):
+        raise ValueError("Rate distribution must be a scalar or (min, mode, max)")
+    return rate[0], rate[1], rate[2]
+
+
+def rate_samples(n, Rate_BASEMAT, Rate_INCV, Rate_CNT, method='triangular', rng=None):
+    """
+    콘크리트 타설 Rate sample
+
+    Parameters:
+    - n: sample 수
+    - Rate_BASEMAT, Rate_INCV, Rate_CNT: 스칼라 (고정) 또는 (min, mode, max)
+    - method, rng: sample_distribution 과 같음
+
+    Returns:
+    - (n x 3) 배열 (BASEMAT, IN-CV, CNT)
+    """
+    low, mode, high = zip(*[_rate_distribution(rate) for rate in (Rate_BASEMAT, Rate_INCV, Rate_CNT)])
+    return sample_distribution(low, mode, high, n, method=method, rng=rng)
+
+
+def duration_ranges(df, graph, base_durations, low=1.0, high=1.0):
+    """
+    작업별 DURATION 분포 범위 (위상 정렬 순서)
+
+    Parameters:
+    - df: 노형별 스케줄 시트 (DURATION_RANGE_COLUMNS 가 있으면 그 값 우선)
+    - graph: Scheduling.TaskGraph
+    - base_durations: (작업,) 결정론적 DURATION (최빈값)
+    - low, high: 시트 값이 없는 작업의 범위 = DURATION x (low, high), 스칼라 또는 (작업,) 배열
+
+    Returns:
+    - duration_min, duration_max: (작업,) 배열
+    """
+    duration_min = base_durations * np.asarray(low, dtype=float)
+    duration_max = base_durations * np.asarray(high, dtype=float)
+    for column, target in zip(DURATION_RANGE_COLUMNS, (duration_min, duration_max)):
+        if column in df.columns:
+            sheet_value = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)[graph.rows]
+            target[:] = np.where(np.isnan(sheet_value), target, sheet_value)
+    # 최빈값이 범위 밖이면 범위를 넓힘
+    return np.minimum(duration_min, base_durations), np.maximum(duration_max, base_durations)
+
+
+@dataclass
+class ScheduleRisk:
+    """
+    Monte Carlo 공기 분석 결과
+
+    - schedule: 모든 sample 의 Scheduling.Schedule
+    - rates: (n x 3) 사용한 Rate sample (BASEMAT, IN-CV, CNT)
+    """
+    schedule: SCHEDULING.Schedule
+    rates: np.ndarray
+
+    def __len__(self):
+        return len(self.schedule)
+
+    @property
+    def critical_path_duration(self):
+        """sample 별 최장 경로의 총 기간"""
+        return self.schedule.project_duration
+
+    @property
+    def construction_period(self):
+        """sample 별 건설 기간 (main 과 같은 최소값 적용)"""
+        return np.maximum(self.schedule.project_duration, MIN_CONSTRUCTION_PERIOD)
+
+    def quantiles(self, q=(0.05, 0.1, 0.5, 0.9, 0.95)):
+        """건설 기간 / 최장 경로 분위수"""
+        q = list(q)
+        return pd.DataFrame({
+            'Critical Path (Year)': np.quantile(self.critical_path_duration, q),
+            'Construction Period (Year)': np.quantile(self.construction_period, q),
+        }, index=pd.Index(q, name='Quantile'))
+
+    def criticality_index(self):
+        """작업별 critical 경로에 포함된 sample 비율 (높은 순)"""
+        index = pd.Series(self.schedule.critical.mean(axis=0), index=self.schedule.graph.names,
+                          name='Criticality Index')
+        return index.sort_values(ascending=False, kind='stable')
+
+
+def simulate(df, n, Rate_BASEMAT, Rate_INCV, Rate_CNT, method='triangular', low=1.0, high=1.0, seed=None):
+    """
+    건설 공기 Monte Carlo
+
+    Parameters:
+    - df: 노형별 스케줄 시트
+    - n: sample 수
+    - Rate_BASEMAT, Rate_INCV, Rate_CNT: 스칼라 (고정) 또는 (min, mode, max) 분포
+    - method: 'triangular' 또는 'pert'
+    - low, high: 작업별 DURATION 분포 범위 비율 (duration_ranges 참고, 1.0 이면 Rate 분포만 반영)
+    - seed: 난수 seed
+
+    Returns:
+    - ScheduleRisk
+    """
+    rng = np.random.default_rng(seed)
+    graph = SCHEDULING.task_graph(df)
+    rates = rate_samples(n, Rate_BASEMAT, Rate_INCV, Rate_CNT, method=method, rng=rng)
+    durations = SCHEDULING.task_durations(graph, rates[:, 0], rates[:, 1], rates[:, 2])
+
+    # 작업별 변동: 결정론적 DURATION (Rate 최빈값) 대비 비율을 곱함
+    base = _mode_durations(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT)
+    duration_min, duration_max = duration_ranges(df, graph, base, low, high)
+    if np.any(duration_min != duration_max):
+        safe_base = np.where(base > 0, base, 1.0)
+        factor = sample_distribution(np.where(base > 0, duration_min / safe_base, 1.0), 1.0,
+                                     np.where(base > 0, duration_max / safe_base, 1.0),
+                                     n, method=method, rng=rng)
+        durations = durations * factor
+
+    return ScheduleRisk(schedule=SCHEDULING.solve(graph, durations), rates=rates)
+
+
+def _mode_durations(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT):
+    # Rate 분포의 최빈값으로 계산한 결정론적 DURATION
+    modes = [_rate_distribution(rate)[1] for rate in (Rate_BASEMAT, Rate_INCV, Rate_CNT)]
+    return SCHEDULING.task_durations(graph, *modes)[0]
+
+
+def cash_flow_batch(df_CAPEX, construction_period, prep_period, config, ElectricCapacityPerModule,
+                    annualCost_CASK, SNU):
+    """
+    건설 기간 sample 별 CFS (CF.CASH_FLOW_BATCH)
+
+    CP별 CAPEX 는 SCHEDULE 시트의 START/END 로 정해지므로 건설 기간과 무관하다.
+    가장 긴 건설 기간의 연도 grid 로 한 번만 계산해 모든 sample 이 공유한다.
+
+    Parameters:
+    - df_CAPEX: ESCALATION.addSCHEDULE 결과 (escalation 적용 전, CP별 START/END 포함)
+    - construction_period: 길이 N 배열
+    - prep_period: 건설 준비 기간
+    - config: ReactorConfig
+    - ElectricCapacityPerModule, annualCost_CASK, SNU: run() 의 값
+
+    Returns:
+    - CF.CashFlowBatch
+    """
+    construction_period = np.atleast_1d(np.asarray(construction_period, dtype=float))
+    capex = ESCALATION.CAPEX_BATCH(df_CAPEX, prep_period, construction_period.max(), config.plantLifetime,
+                                   config.escalationNSSS, config.escalationTG, config.escalationBOP,
+                                   config.escalationLabor)[0]
+    annual_fuel_cost, _ = Fuel.FrontEnd(config.Feed, config.Product, config.Tail, config.totalFuelQty,
+                                        config.U3O8Price, config.EnrichmentPrice, config.FabricationPrice,
+                                        config.ConversionPrice, config.moduleNumber, config.BatchNumber,
+                                        config.BatchCycleLength, config.CoreDesignFactor)
+    return CF.CASH_FLOW_BATCH(prep_period, construction_period, config.plantLifetime, SNU,
+                              ElectricCapacityPerModule, config.moduleNumber, config.electricityPrice,
+                              config.salesToRevenueRatio, config.capacityFactor, annual_fuel_cost,
+                              config.interimCOST_initial, annualCost_CASK, config.interimCOST_OM,
+                              config.yearsForInterimStorage, config.BatchCycleLength, capex,
+                              config.debtToEquityRatio, config.interestRate, config.loanTenor, config.taxRate)
+
+
+def lcoe_distribution(risk, df_CAPEX, prep_period, config, ElectricCapacityPerModule, annualCost_CASK, SNU):
+    """
+    공기 sample 별 LCOE
+
+    Parameters:
+    - risk: ScheduleRisk
+    - 나머지: cash_flow_batch 와 같음
+
+    Returns:
+    - DataFrame (sample 별 Construction Period, LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL)
+    """
+    construction_period = risk.construction_period
+    batch = cash_flow_batch(df_CAPEX, construction_period, prep_period, config, ElectricCapacityPerModule,
+                            annualCost_CASK, SNU)
+    LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = ANALYSIS.LCOE_BATCH(
+        batch, config.discountRate, config.electricityPrice, config.salesToRevenueRatio)
+    return pd.DataFrame({
+        'Construction Period': construction_period,
+        'LCOE_CON': LCOE_CON,
+        'LCOE_OM': LCOE_OM,
+        'LCOE_FUEL': LCOE_FUEL,
+        'LCOE_FUEL_IS': LCOE_FUEL_IS,
+        'LCOE_TOTAL': LCOE_TOTAL,
+    })
@@ -1,13 +1,18 @@
 
 
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
 import os
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
 
 """"""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""""
 
 def visualize_task_network(df):
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
     # Create directed graph
     G = nx.DiGraph()
     
@@ -50,6 +55,9 @@ if __name__ == "__main__":
 
 
 def visualize_task_network_improved(df):
+    import networkx as nx
+    import matplotlib.pyplot as plt
+
     G = nx.DiGraph()
     
     # Normalize task names and add nodes
@@ -114,140 +122,454 @@ if __name__ == "__main__":
 
 
 
-def Rate(df, Rate_BASEMAT, Rate_INCV, Rate_CNT):
+# Sub-Class -> 콘크리트 타설 Rate 구분 (앞에서부터 먼저 포함되는 것 사용)
+RATE_SUBCLASSES = ['BASEMAT', 'IN-CV', 'CNT']
+
+# 시트 내용 해시 -> TaskGraph (같은 시트는 한 번만 컴파일)
+_task_graph_cache = {}
+
+
+@dataclass
+class TaskGraph:
     """
-    Calculate DURATION for each task based on Concrete Volume and Rate
-    Then perform CPM analysis to find the critical path (최장 경로)
+    시트 하나의 작업 네트워크 (위상 정렬 순서 + CSR 선행작업 배열)
+
+    - names: 작업 이름 (위상 정렬 순서)
+    - rows: 각 작업의 DURATION 을 가져오는 시트 행 번호
+    - rate_kind: RATE_SUBCLASSES 번호 (-1 이면 시트 DURATION 고정값)
+    - volume: 콘크리트 물량 (CY)
+    - duration: 고정 DURATION (year)
+    - pred_ptr, pred_idx: 작업 i 의 선행작업 = pred_idx[pred_ptr[i]:pred_ptr[i+1]]
+    - succ_ptr, succ_idx: 작업 i 의 후행작업 (같은 CSR 형식)
+    - index: 정규화된 작업 이름 (strip + lower) -> 위상 정렬 번호
+    - row_kind, row_volume: 시트 행별 Rate 구분과 물량 (DURATION 열 갱신용)
+    """
+    names: list
+    rows: np.ndarray
+    rate_kind: np.ndarray
+    volume: np.ndarray
+    duration: np.ndarray
+    pred_ptr: np.ndarray
+    pred_idx: np.ndarray
+    succ_ptr: np.ndarray
+    succ_idx: np.ndarray
+    index: dict
+    row_kind: np.ndarray
+    row_volume: np.ndarray
+    _cones: dict = field(default_factory=dict, repr=False)  # (작업, 방향) -> 영향 범위
+
+    def __len__(self):
+        return len(self.names)
+
+    def predecessors(self, t):
+        return self.pred_idx[self.pred_ptr[t]:self.pred_ptr[t + 1]]
+
+    def successors(self, t):
+        return self.succ_idx[self.succ_ptr[t]:self.succ_ptr[t + 1]]
+
+    def position(self, task):
+        """작업 이름 (대소문자/공백 무시) 또는 번호 -> 위상 정렬 번호"""
+        if isinstance(task, str):
+            key = task.strip().lower()
+            if key not in self.index:
+                raise KeyError(f"Unknown schedule task: {task}")
+            return self.index[key]
+        return int(task)
+
+    def cone(self, t, downstream=True):
+        """
+        작업 t 와 그 후행 (downstream) 또는 선행 (upstream) 작업 전체
+
+        Returns:
+        - 위상 정렬 번호 배열 (downstream 은 오름차순, upstream 은 내림차순 = 계산 순서)
+        """
+        key = (t, downstream)
+        if key not in self._cones:
+            neighbours = self.successors if downstream else self.predecessors
+            seen = {t}
+            stack = [t]
+            while stack:
+                for u in neighbours(stack.pop()):
+                    if u not in seen:
+                        seen.add(u)
+                        stack.append(int(u))
+            cone = np.array(sorted(seen, reverse=not downstream), dtype=int)
+            cone.setflags(write=False)
+            self._cones[key] = cone
+        return self._cones[key]
+
+
+def _rate_kind(sub_class, concrete_volume):
+    # 시트 행 하나의 (Rate 구분, 물량); Rate 를 쓰지 않는 행은 (-1, nan)
+    if pd.isna(concrete_volume) or pd.isna(sub_class):
+        return -1, np.nan
+    try:
+        concrete_volume = float(concrete_volume)
+    except (ValueError, TypeError):
+        return -1, np.nan
+    sub_class = str(sub_class).upper()
+    for kind, name in enumerate(RATE_SUBCLASSES):
+        if name in sub_class:
+            return kind, concrete_volume
+    return -1, np.nan
+
+
+def _compile(df):
+    row_kind, row_volume = zip(*[_rate_kind(sub_class, volume) for sub_class, volume
+                                 in zip(df['Sub-Class'], df['Concrete Volume (CY)'])]) if len(df) else ((), ())
+    row_kind = np.array(row_kind, dtype=int)
+    row_volume = np.array(row_volume, dtype=float)
+
+    # 노드: 정규화된 이름의 첫 행, DURATION 이 있는 작업만 (Rate 로 계산되는 작업은 물량이 있으면 포함)
+    first_row = {}
+    for i, task in enumerate(df['NAME']):
+        if pd.notna(task):
+            first_row.setdefault(str(task).strip().lower(), i)
+    sheet_duration = pd.to_numeric(df['DURATION'], errors='coerce').to_numpy(dtype=float)
+    nodes = {}
+    for key, i in first_row.items():
+        has_duration = not np.isnan(row_volume[i]) if row_kind[i] >= 0 else pd.notna(df['DURATION'].iloc[i])
+        if has_duration:
+            nodes[key] = i
+
+    # 선행 관계: 양쪽 작업이 모두 노드일 때만
+    preds = {key: set() for key in nodes}
+    for task, predecessor in zip(df['NAME'], df['PREDECESSOR']):
+        if isinstance(predecessor, str) and pd.notna(task):
+            task_key = str(task).strip().lower()
+            if task_key not in nodes:
+                continue
+            for pred in predecessor.split(','):
+                pred_key = pred.strip().lower()
+                if pred_key in nodes:
+                    preds[task_key].add(pred_key)
+
+    # 위상 정렬 (Kahn, 시트 순서 유지)
+    successors = {key: [] for key in nodes}
+    remaining = {key: len(p) for key, p in preds.items()}
+    for key, p in preds.items():
+        for pred in p:
+            successors[pred].append(key)
+    queue = deque(key for key in nodes if remaining[key] == 0)
+    order = []
+    while queue:
+        key = queue.popleft()
+        order.append(key)
+        for succ in successors[key]:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                queue.append(succ)
+    if len(order) != len(nodes):
+        cycle = [key for key in nodes if remaining[key] > 0]
+        raise ValueError(f"Schedule network contains a cycle: {[str(df['NAME'].iloc[nodes[k]]) for k in cycle]}")
+
+    position = {key: t for t, key in enumerate(order)}
+    pred_lists = [sorted(position[pred] for pred in preds[key]) for key in order]
+    pred_ptr = np.zeros(len(order) + 1, dtype=int)
+    pred_ptr[1:] = np.cumsum([len(p) for p in pred_lists])
+    pred_idx = np.array([t for p in pred_lists for t in p], dtype=int)
+    succ_lists = [[] for _ in order]
+    for t, p in enumerate(pred_lists):
+        for u in p:
+            succ_lists[u].append(t)
+    succ_ptr = np.zeros(len(order) + 1, dtype=int)
+    succ_ptr[1:] = np.cumsum([len(p) for p in succ_lists])
+    succ_idx = np.array([t for p in succ_lists for t in p], dtype=int)
+
+    rows = np.array([nodes[key] for key in order], dtype=int)
+    return TaskGraph(
+        names=[str(df['NAME'].iloc[i]) for i in rows],
+        rows=rows,
+        rate_kind=row_kind[rows],
+        volume=row_volume[rows],
+        duration=sheet_duration[rows],
+        pred_ptr=pred_ptr,
+        pred_idx=pred_idx,
+        succ_ptr=succ_ptr,
+        succ_idx=succ_idx,
+        index=position,
+        row_kind=row_kind,
+        row_volume=row_volume,
+    )
+
+
+def task_graph(df):
+    """
+    시트의 작업 네트워크 (시트 내용이 같으면 캐시된 TaskGraph 반환)
 
     Parameters:
-    df: DataFrame - SOURCE_DATA 엑셀 파일
-    Rate_BASEMAT: float - BASEMAT 작업용 Rate
-    Rate_INCV: float - IN-CV 작업용 Rate
-    Rate_CNT: float - CNT 작업용 Rate
+    - df: 노형별 스케줄 시트 (NAME, PREDECESSOR, Sub-Class, Concrete Volume (CY), DURATION)
+    """
+    columns = ['NAME', 'PREDECESSOR', 'Sub-Class', 'Concrete Volume (CY)', 'DURATION']
+    key = repr([df[column].tolist() for column in columns])  # float repr 는 정확한 값이므로 내용 비교로 충분
+    if key not in _task_graph_cache:
+        _task_graph_cache[key] = _compile(df)
+    return _task_graph_cache[key]
 
-    Returns:
-    df: DataFrame - DURATION 열이 업데이트된 DataFrame
-    critical_path_duration: float - 최장 경로의 총 기간 (CPM)
+
+def task_durations(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT):
     """
+    Rate 조합별 작업 DURATION (year) = (콘크리트 물량 / Rate) / 12
 
-    # Make a copy to avoid modifying original
-    df = df.copy()
+    Parameters:
+    - graph: TaskGraph
+    - Rate_BASEMAT, Rate_INCV, Rate_CNT: 스칼라 또는 길이 N 배열
 
-    # Calculate DURATION based on Sub-Class
-    for idx, row in df.iterrows():
-        sub_class = row['Sub-Class']
-        concrete_volume = row['Concrete Volume (CY)']
-
-        # Skip if no concrete volume or sub-class
-        if pd.isna(concrete_volume) or pd.isna(sub_class):
-            continue
-
-        # Convert concrete_volume to float if it's a string
-        try:
-            concrete_volume = float(concrete_volume)
-        except (ValueError, TypeError):
-            continue  # Skip if conversion fails
-
-        # Determine which rate to use based on Sub-Class
-        # Calculate duration in years (divide by 12 to convert months to years)
-        if 'BASEMAT' in str(sub_class).upper():
-            duration = (concrete_volume / Rate_BASEMAT) / 12
-        elif 'IN-CV' in str(sub_class).upper():
-            duration = (concrete_volume / Rate_INCV) / 12
-        elif 'CNT' in str(sub_class).upper():
-            duration = (concrete_volume / Rate_CNT) / 12
-        else:
-            continue  # Skip other types
+    Returns:
+    - (N x 작업) DURATION 배열 (위상 정렬 순서)
+    """
+    rates = np.column_stack(np.broadcast_arrays(*(np.atleast_1d(np.asarray(rate, dtype=float))
+                                                  for rate in (Rate_BASEMAT, Rate_INCV, Rate_CNT))))
+    rated = graph.rate_kind >= 0
+    durations = np.broadcast_to(graph.duration, (len(rates), len(graph))).copy()
+    durations[:, rated] = (graph.volume[rated] / rates[:, graph.rate_kind[rated]]) / 12
+    return durations
 
-        # Update DURATION column (now in years)
-        df.at[idx, 'DURATION'] = duration
 
-    # Build directed graph using same logic as visualize_task_network_improved
-    G = nx.DiGraph()
+def forward_pass(graph, durations):
+    """
+    CPM forward pass (최장 경로): 작업별 earliest start / finish
 
-    # Normalize task names and add nodes with duration
-    task_mapping = {}
-    task_durations = {}  # Store durations for each normalized task
+    Parameters:
+    - graph: TaskGraph
+    - durations: (N x 작업) DURATION 배열
 
-    for idx, row in df.iterrows():
-        task = row['NAME']
-        if pd.notna(task):
-            normalized_task = str(task).strip().lower()
-            if normalized_task not in task_mapping:
-                task_mapping[normalized_task] = str(task)
+    Returns:
+    - earliest_start, earliest_finish: (N x 작업) 배열
+    """
+    earliest_start = np.zeros_like(durations)
+    earliest_finish = np.zeros_like(durations)
+    _forward(graph, durations, earliest_start, earliest_finish, range(len(graph)))
+    return earliest_start, earliest_finish
 
-                # Store duration for this task
-                duration = row['DURATION']
-                if pd.notna(duration):
-                    task_durations[normalized_task] = duration
-                    G.add_node(task_mapping[normalized_task], duration=duration)
 
-    # Add edges with normalized names
-    for idx, row in df.iterrows():
-        if isinstance(row['PREDECESSOR'], str) and pd.notna(row['NAME']):
-            predecessors = row['PREDECESSOR'].split(',')
-            for pred in predecessors:
-                pred_normalized = pred.strip().lower()
-                task_normalized = str(row['NAME']).strip().lower()
+def _forward(graph, durations, earliest_start, earliest_finish, tasks):
+    # tasks (위상 정렬 순서) 만 다시 계산, 배열은 제자리 갱신
+    for t in tasks:
+        preds = graph.predecessors(t)
+        if len(preds):
+            earliest_start[:, t] = earliest_finish[:, preds].max(axis=1)
+        earliest_finish[:, t] = earliest_start[:, t] + durations[:, t]
 
-                # Only add edge if both nodes exist in graph (have durations)
-                if (pred_normalized in task_mapping and
-                    task_normalized in task_mapping and
-                    pred_normalized in task_durations and
-                    task_normalized in task_durations):
-                    G.add_edge(task_mapping[pred_normalized], task_mapping[task_normalized])
 
-    # Calculate earliest finish times using topological sort (CPM forward pass)
-    earliest_start = {}
-    earliest_finish = {}
+def backward_pass(graph, durations, project_duration):
+    """
+    CPM backward pass: 작업별 latest start / finish (전체 공기를 늘리지 않는 가장 늦은 시점)
 
-    try:
-        # Topological sort ensures we process nodes in dependency order
-        for node in nx.topological_sort(G):
-            # Find maximum earliest finish time of all predecessors
-            pred_finish_times = [earliest_finish.get(pred, 0) for pred in G.predecessors(node)]
-
-            if pred_finish_times:
-                earliest_start[node] = max(pred_finish_times)
-            else:
-                earliest_start[node] = 0  # Start node
-
-            # Calculate earliest finish time
-            node_duration = G.nodes[node]['duration']
-            earliest_finish[node] = earliest_start[node] + node_duration
-
-        # Critical path duration is the maximum earliest finish time
-        if earliest_finish:
-            critical_path_duration = max(earliest_finish.values())
+    Parameters:
+    - graph: TaskGraph
+    - durations: (N x 작업) DURATION 배열
+    - project_duration: 길이 N 배열 (forward pass 의 최장 경로)
+
+    Returns:
+    - latest_start, latest_finish: (N x 작업) 배열
+    """
+    latest_start = np.zeros_like(durations)
+    latest_finish = np.zeros_like(durations)
+    _backward(graph, durations, project_duration, latest_start, latest_finish, range(len(graph) - 1, -1, -1))
+    return latest_start, latest_finish
+
+
+def _backward(graph, durations, project_duration, latest_start, latest_finish, tasks):
+    # tasks (위상 정렬 역순) 만 다시 계산, 배열은 제자리 갱신
+    for t in tasks:
+        succs = graph.successors(t)
+        if len(succs):
+            latest_finish[:, t] = latest_start[:, succs].min(axis=1)
         else:
-            critical_path_duration = 0
+            latest_finish[:, t] = project_duration
+        latest_start[:, t] = latest_finish[:, t] - durations[:, t]
 
-    except nx.NetworkXError as e:
-        print(f"Error in topological sort: {e}")
-        print("Graph may contain cycles or other issues")
-        critical_path_duration = 0
 
+# total float 이 이 값 (전체 공기 대비) 이하이면 critical 작업
+CRITICAL_TOLERANCE = 1e-9
 
-    # Create DataFrame with start time, finish time, and duration for each task (in years)
-    schedule_data = []
-    for node in G.nodes():
-        schedule_data.append({
-            'Task': node,
-            'Start Time (Year)': earliest_start.get(node, 0),
-            'Finish Time (Year)': earliest_finish.get(node, 0),
-            'Duration (Year)': G.nodes[node].get('duration', 0)
+
+@dataclass
+class Schedule:
+    """
+    CPM 결과 (N 개 시나리오 x 작업, 작업은 위상 정렬 순서)
+
+    - graph: TaskGraph
+    - durations: 작업 DURATION (year)
+    - earliest_start, earliest_finish, latest_start, latest_finish: CPM 시점 (year)
+    - project_duration: 길이 N, 최장 경로의 총 기간
+    """
+    graph: TaskGraph
+    durations: np.ndarray
+    earliest_start: np.ndarray
+    earliest_finish: np.ndarray
+    latest_start: np.ndarray
+    latest_finish: np.ndarray
+    project_duration: np.ndarray
+
+    def __len__(self):
+        return len(self.durations)
+
+    @property
+    def total_float(self):
+        """공기를 늘리지 않고 작업을 늦출 수 있는 여유 (LS - ES)"""
+        return self.latest_start - self.earliest_start
+
+    @property
+    def critical(self):
+        """(N x 작업) critical 여부"""
+        tolerance = CRITICAL_TOLERANCE * np.maximum(1.0, np.abs(self.project_duration))[:, None]
+        return self.total_float <= tolerance
+
+    def critical_tasks(self, i=0):
+        """시나리오 i 의 critical 작업 이름 (위상 정렬 순서)"""
+        return [name for name, flag in zip(self.graph.names, self.critical[i]) if flag]
+
+    def to_frame(self, i=0):
+        """시나리오 i 의 작업별 일정표 (시작 시점 순)"""
+        df_schedule = pd.DataFrame({
+            'Task': self.graph.names,
+            'Start Time (Year)': self.earliest_start[i],
+            'Finish Time (Year)': self.earliest_finish[i],
+            'Duration (Year)': self.durations[i],
+            'Late Start (Year)': self.latest_start[i],
+            'Late Finish (Year)': self.latest_finish[i],
+            'Total Float (Year)': self.total_float[i],
+            'Critical': self.critical[i],
         })
+        return df_schedule.sort_values('Start Time (Year)', kind='stable').reset_index(drop=True)
+
+
+def _project_duration(graph, earliest_finish):
+    if len(graph) == 0:
+        return np.zeros(len(earliest_finish))
+    return earliest_finish.max(axis=1)
+
+
+def solve(graph, durations):
+    """
+    전체 CPM (forward + backward pass)
+
+    Parameters:
+    - graph: TaskGraph
+    - durations: (N x 작업) 또는 (작업,) DURATION 배열 (위상 정렬 순서)
+
+    Returns:
+    - Schedule
+    """
+    durations = np.atleast_2d(np.asarray(durations, dtype=float)).copy()
+    earliest_start, earliest_finish = forward_pass(graph, durations)
+    project_duration = _project_duration(graph, earliest_finish)
+    latest_start, latest_finish = backward_pass(graph, durations, project_duration)
+    return Schedule(graph, durations, earliest_start, earliest_finish,
+                    latest_start, latest_finish, project_duration)
+
+
+def update_duration(schedule, task, duration):
+    """
+    작업 하나의 DURATION 만 바꾼 새 Schedule (영향 범위만 다시 계산)
+
+    forward pass 는 작업의 후행 작업들만, backward pass 는 전체 공기가 그대로인 시나리오에서는
+    작업과 그 선행 작업들만 다시 계산한다 (후행 작업의 late 시점은 바뀌지 않음).
+
+    Parameters:
+    - schedule: 기존 Schedule (수정하지 않음)
+    - task: 작업 이름 또는 위상 정렬 번호
+    - duration: 새 DURATION (스칼라 또는 길이 N 배열)
+
+    Returns:
+    - Schedule
+    """
+    graph = schedule.graph
+    t = graph.position(task)
+    durations = schedule.durations.copy()
+    durations[:, t] = duration
+
+    earliest_start = schedule.earliest_start.copy()
+    earliest_finish = schedule.earliest_finish.copy()
+    _forward(graph, durations, earliest_start, earliest_finish, graph.cone(t, downstream=True))
+    project_duration = _project_duration(graph, earliest_finish)
+
+    latest_start = schedule.latest_start.copy()
+    latest_finish = schedule.latest_finish.copy()
+    changed = project_duration != schedule.project_duration
+    if changed.any():
+        # 전체 공기가 바뀐 시나리오는 모든 late 시점이 바뀜
+        ls, lf = backward_pass(graph, durations[changed], project_duration[changed])
+        latest_start[changed] = ls
+        latest_finish[changed] = lf
+    same = ~changed
+    if same.any():
+        ls, lf = latest_start[same], latest_finish[same]
+        _backward(graph, durations[same], project_duration[same], ls, lf, graph.cone(t, downstream=False))
+        latest_start[same] = ls
+        latest_finish[same] = lf
+
+    return Schedule(graph, durations, earliest_start, earliest_finish,
+                    latest_start, latest_finish, project_duration)
+
+
+def CPM(df, Rate_BASEMAT, Rate_INCV, Rate_CNT):
+    """
+    Rate 조합 N개의 전체 CPM 일정 (ES/EF/LS/LF, total float, critical 작업)
+
+    Parameters:
+    - df: 노형별 스케줄 시트
+    - Rate_BASEMAT, Rate_INCV, Rate_CNT: 스칼라 또는 길이 N 배열
+
+    Returns:
+    - Schedule
+    """
+    graph = task_graph(df)
+    return solve(graph, task_durations(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT))
+
+
+def Rate_BATCH(df, Rate_BASEMAT, Rate_INCV, Rate_CNT):
+    """
+    Rate 조합 N개의 최장 경로 기간 (CPM), 작업 네트워크는 시트당 한 번만 컴파일
+
+    Parameters:
+    - df: 노형별 스케줄 시트
+    - Rate_BASEMAT, Rate_INCV, Rate_CNT: 스칼라 또는 길이 N 배열
+
+    Returns:
+    - 길이 N 배열: 최장 경로의 총 기간 (year)
+    """
+    return _critical_path(task_graph(df), Rate_BASEMAT, Rate_INCV, Rate_CNT)
 
-    df_schedule = pd.DataFrame(schedule_data)
-    df_schedule = df_schedule.sort_values('Start Time (Year)').reset_index(drop=True)
 
+def _critical_path(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT):
+    # 최장 경로 길이만 필요하면 forward pass 로 충분
+    _, earliest_finish = forward_pass(graph, task_durations(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT))
+    return _project_duration(graph, earliest_finish)
 
 
-    # Print the schedule DataFrame
-    #print("\n=== Task Schedule (in Years) ===")
-    #print(df_schedule.to_string(index=False))
-    #print(f"\nCritical Path Duration: {critical_path_duration:.4f} years")
+def Rate(df, Rate_BASEMAT, Rate_INCV, Rate_CNT):
+    """
+    Calculate DURATION for each task based on Concrete Volume and Rate
+    Then perform CPM analysis to find the critical path (최장 경로)
+
+    Parameters:
+    df: DataFrame - SOURCE_DATA 엑셀 파일
+    Rate_BASEMAT: float - BASEMAT 작업용 Rate
+    Rate_INCV: float - IN-CV 작업용 Rate
+    Rate_CNT: float - CNT 작업용 Rate
+
+    Returns:
+    df: DataFrame - DURATION 열이 업데이트된 DataFrame
+    critical_path_duration: float - 최장 경로의 총 기간 (CPM)
+    """
+
+    graph = task_graph(df)
+
+    # Make a copy to avoid modifying original
+    df = df.copy()
+
+    # Calculate DURATION based on Sub-Class (in years, months / 12)
+    rates = np.array([Rate_BASEMAT, Rate_INCV, Rate_CNT], dtype=float)
+    rated = graph.row_kind >= 0
+    if rated.any():
+        df['DURATION'] = df['DURATION'].astype(float)
+        df.loc[rated, 'DURATION'] = (graph.row_volume[rated] / rates[graph.row_kind[rated]]) / 12
 
+    # CPM forward pass
+    critical_path_duration = float(_critical_path(graph, Rate_BASEMAT, Rate_INCV, Rate_CNT)[0])
 
     return df, critical_path_duration
 
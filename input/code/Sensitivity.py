@@ -0,0 +1,156 @@
+"""
+ReactorConfig 입력별 LCOE / NPV 민감도 (dLCOE/dθ, dNPV/dθ) 를 한 번의 batch 계산으로 구함
+
+- 전체 계산 (Rate -> RS.Core -> Fuel -> EQ/CON scaling -> CAPEX -> CFS -> LCOE/NPV) 을
+  시나리오 방향으로 vectorize 한 batch 함수들 (Scheduling.Rate_BATCH, EQ.scaling_batch, CON.scaling_batch,
+  ESCALATION.CAPEX_BATCH, CF.CASH_FLOW_BATCH, ANALYSIS.LCOE_BATCH / NPV_BATCH) 로 연결
+- 기준값 1개 + 숫자 입력마다 (+h, -h) 2개 시나리오를 한 batch 에 넣어 중심차분
+
+EQ/CON scaling 은 pandas 표, 공기는 CPM (max), CFS 는 연도 경계 / 세금 부호에 따른 분기가 있어
+dual number 를 끝까지 전달할 수 없으므로, 모든 방향 미분을 한 번의 batch 계산으로 대신한다.
+"""
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+
+import input.code.Reactor_Selection as RS
+import input.code.EQcost as EQ
+import input.code.CONSTRUCTIONcost as CON
+import input.code.Fuel_Cost_Input as Fuel
+import input.code.Cash_Flow_Statement as CF
+import input.code.Escalation as ESCALATION
+import input.code.Analysis as ANALYSIS
+import input.code.Scheduling as SCHEDULING
+from input.code.Schedule_Risk import MIN_CONSTRUCTION_PERIOD
+
+# 민감도를 구하는 결과 (main 의 metrics 와 같은 이름, LCOE_FUEL 은 Front-end + Interim Storage)
+SENSITIVITY_METRICS = ('LCOE_TOTAL', 'LCOE_CON', 'LCOE_OM', 'LCOE_FUEL', 'LCOE_FUEL_IS', 'NPV')
+
+
+def numeric_fields(config):
+    """ReactorConfig 의 숫자 (int / float, bool 제외) 필드 이름 목록"""
+    return [f.name for f in dataclasses.fields(config)
+            if isinstance(getattr(config, f.name), (int, float)) and not isinstance(getattr(config, f.name), bool)]
+
+
+def scaling_groups(analysis):
+    """
+    EQ / Construction scaling group 별 base cost 합산 (시나리오와 무관) 을 analysis 에 한 번만 계산해 둠
+    run() 이 다른 표 (다른 노형의 EQ 시트 등) 를 쓰게 되면 다시 계산
+
+    Returns:
+    - (EQ.scaling_groups 결과, CON.scaling_groups 결과)
+    """
+    tables = (analysis.df_EQcost_base, analysis.df_scaling_power, analysis.df_CP_List)
+    cached = getattr(analysis, '_scaling_groups', None)
+    if cached is None or any(a is not b for a, b in zip(cached[0], tables)):
+        cached = (tables, EQ.scaling_groups(*tables), CON.scaling_groups(analysis.df_CP_List, analysis.df_scaling_power))
+        analysis._scaling_groups = cached
+    return cached[1], cached[2]
+
+
+def pipeline_batch(analysis, inputs=None, n=None):
+    """
+    run() 과 같은 계산을 N개 입력 조합에 대해 한 번에 수행
+
+    Parameters:
+    - analysis: run() 을 한 번 실행한 economic_analysis (시트, SNU, df_EQcost_base, df_CAPEX_schedule 재사용,
+      scaling group 합산은 scaling_groups 로 analysis 에 한 번만 계산)
+    - inputs: {ReactorConfig 필드: 스칼라 또는 길이 N 배열}, 없는 필드는 analysis.config 값
+    - n: 시나리오 수 (None 이면 inputs 배열 길이, 없으면 1)
+
+    Returns:
+    - {SENSITIVITY_METRICS: 길이 N 배열}
+    """
+    config = analysis.config
+    inputs = {} if inputs is None else inputs
+    if n is None:
+        n = max([np.size(v) for v in inputs.values()], default=1)
+    get = lambda name: np.broadcast_to(np.asarray(inputs.get(name, getattr(config, name)), dtype=float), (n,))
+    prep_period = analysis.preconstructionPeriod
+
+    # 공기 (CPM)
+    construction_period = np.maximum(
+        SCHEDULING.Rate_BATCH(analysis.df_scheduling, get('Rate_BASEMAT'), get('Rate_INCV'), get('Rate_CNT')),
+        MIN_CONSTRUCTION_PERIOD)
+
+    # 노심 / 연료
+    module_number = get('moduleNumber')
+    _, capacity, _, _, _, _ = RS.Core(get('powerDensity'), get('activeCoreD'), get('activeCoreH'), get('activeCoreDpct'),
+                                      get('activeCoreHpct'), get('TGefficiency'), module_number)
+    annual_cask_cost = Fuel.InterimStorage(get('COSTperHM'), get('HMperASSEMBLY'), get('BatchNumber'),
+                                           get('BatchCycleLength'), get('ASSEMBLYperCORE'), module_number)
+    annual_fuel_cost = Fuel.FrontEnd_BATCH(get('Feed'), get('Product'), get('Tail'), get('totalFuelQty'),
+                                           get('U3O8Price'), get('EnrichmentPrice'), get('FabricationPrice'),
+                                           get('ConversionPrice'), module_number, get('BatchNumber'),
+                                           get('BatchCycleLength'), get('CoreDesignFactor'))
+
+    # CP별 EQ / Construction 비용 -> 연도별 CAPEX
+    eq_groups, con_groups = scaling_groups(analysis)
+    eq_cost = EQ.scaling_batch(analysis.df_EQcost_base, analysis.df_scaling_power, analysis.df_country_specific,
+                               analysis.df_CP_List, capacity, module_number, config.Country,
+                               get('DesignSimplification_safetyPIPING'), get('DesignSimplification_safetyVALVES'),
+                               get('DesignSimplification_safetyPUMPS'), get('DesignSimplification_safetyCABLES'),
+                               get('DesignSimplification_safetyMECH'), groups=eq_groups)[config.minMeanMAX]
+    construction_cost = CON.scaling_batch(analysis.df_CP_List, analysis.df_scaling_power, analysis.df_country_specific,
+                                          config.Country, module_number, capacity, groups=con_groups)
+    plant_lifetime = get('plantLifetime')
+    capex = ESCALATION.CAPEX_BATCH(analysis.df_CAPEX_schedule, prep_period, construction_period.max(),
+                                   plant_lifetime.max(), get('escalationNSSS'), get('escalationTG'),
+                                   get('escalationBOP'), get('escalationLabor'),
+                                   eq_cost=eq_cost, construction_cost=construction_cost)
+
+    # CFS -> LCOE / NPV
+    batch = CF.CASH_FLOW_BATCH(prep_period, construction_period, plant_lifetime, analysis.SNU, capacity,
+                               module_number, get('electricityPrice'), get('salesToRevenueRatio'),
+                               get('capacityFactor'), annual_fuel_cost, get('interimCOST_initial'), annual_cask_cost,
+                               get('interimCOST_OM'), get('yearsForInterimStorage'), get('BatchCycleLength'), capex,
+                               get('debtToEquityRatio'), get('interestRate'), get('loanTenor'), get('taxRate'))
+    LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = ANALYSIS.LCOE_BATCH(
+        batch, get('discountRate'), get('electricityPrice'), get('salesToRevenueRatio'))
+    return {
+        'LCOE_TOTAL': LCOE_TOTAL,
+        'LCOE_CON': LCOE_CON,
+        'LCOE_OM': LCOE_OM,
+        'LCOE_FUEL': LCOE_FUEL + LCOE_FUEL_IS,
+        'LCOE_FUEL_IS': LCOE_FUEL_IS,
+        'NPV': ANALYSIS.NPV_BATCH(batch, get('discountRate')),
+    }
+
+
+def GRADIENTS(analysis, fields=None, rel_step=1e-6):
+    """
+    숫자 ReactorConfig 필드별 d(결과)/d(입력) (중심차분, 모든 방향을 한 batch 로 계산)
+
+    Parameters:
+    - analysis: run() 을 한 번 실행한 economic_analysis (미분 기준점은 analysis.config, MWe 스케일링 적용 후 값)
+    - fields: 미분할 필드 목록 (None 이면 numeric_fields 전체)
+    - rel_step: 상대 증분 h = rel_step * max(|θ|, 1)
+
+    Returns:
+    - base: {SENSITIVITY_METRICS: 기준값}
+    - DataFrame (행: 필드, 열: Value, d<결과> ..., Elasticity LCOE_TOTAL = dLCOE/dθ * θ / LCOE)
+      계산에 쓰이지 않는 필드는 0, 정수 계단 입력 (loanTenor 등) 은 계단 사이에서 0
+    """
+    config = analysis.config
+    fields = numeric_fields(config) if fields is None else list(fields)
+    value = np.array([float(getattr(config, name)) for name in fields])
+    step = rel_step * np.maximum(np.abs(value), 1.0)
+
+    # 행 0: 기준, 행 2k+1 / 2k+2: k번째 필드 +h / -h
+    n = 1 + 2 * len(fields)
+    inputs = {name: np.full(n, v) for name, v in zip(fields, value)}
+    for k, name in enumerate(fields):
+        inputs[name][2*k + 1] += step[k]
+        inputs[name][2*k + 2] -= step[k]
+    results = pipeline_batch(analysis, inputs, n)
+
+    base = {metric: float(results[metric][0]) for metric in SENSITIVITY_METRICS}
+    delta = np.array([inputs[name][2*k + 1] - inputs[name][2*k + 2] for k, name in enumerate(fields)])
+    df = pd.DataFrame({'Value': value}, index=pd.Index(fields, name='Input'))
+    for metric in SENSITIVITY_METRICS:
+        df[f'd{metric}'] = (results[metric][1::2] - results[metric][2::2]) / delta
+    df['Elasticity LCOE_TOTAL'] = df['dLCOE_TOTAL'] * value / base['LCOE_TOTAL']
+    return base, df
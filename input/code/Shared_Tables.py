@@ -0,0 +1,76 @@
+"""
+프로세스 사이에서 읽기 전용 데이터 공유 (multiprocessing.shared_memory)
+
+pickle protocol 5 의 out-of-band buffer 로 numpy 배열 (DataFrame 블록 포함) 을 분리해
+SharedMemory 한 블록에 한 번만 복사한다 (블록 = [pickle 본문][배열 1][배열 2]...).
+worker 는 블록에 붙어 (attach) 배열을 복사 없이 읽기 전용 view 로 복원하고,
+pickle 본문 (열 이름, 문자열 열, dict 구조 등 작은 부분) 만 worker 마다 역직렬화한다.
+"""
+
+import pickle
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+ALIGNMENT = 64  # 배열 시작 위치 정렬 (bytes)
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """
+    공유 블록 위치 (worker 로 보내는 작은 객체)
+
+    - name: SharedMemory 이름
+    - header: pickle 본문 (offset, length)
+    - buffers: out-of-band 배열 (offset, length) 목록
+    """
+    name: str
+    header: tuple
+    buffers: tuple
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def share(obj):
+    """
+    obj 를 새 SharedMemory 블록에 복사
+
+    Returns:
+    - SharedMemory: 만든 쪽이 사용이 끝나면 close() + unlink()
+    - SharedHandle: attach() 에 전달
+    """
+    buffers = []
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+
+    layout = [(0, len(header))]
+    offset = len(header)
+    for raw in raws:
+        offset = _aligned(offset)
+        layout.append((offset, raw.nbytes))
+        offset += raw.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    shm.buf[:len(header)] = header
+    for (start, length), raw in zip(layout[1:], raws):
+        shm.buf[start:start + length] = raw
+    for raw in raws:
+        raw.release()
+    return shm, SharedHandle(shm.name, layout[0], tuple(layout[1:]))
+
+
+def attach(handle):
+    """
+    공유 블록에서 obj 복원 (배열은 공유 메모리의 읽기 전용 view)
+
+    Returns:
+    - obj
+    - SharedMemory: 배열을 쓰는 동안 열어 두어야 함 (close / unlink 하지 말 것)
+    """
+    shm = shared_memory.SharedMemory(name=handle.name)
+    view = shm.buf.toreadonly()
+    start, length = handle.header
+    obj = pickle.loads(view[start:start + length],
+                       buffers=[view[start:start + length] for start, length in handle.buffers])
+    return obj, shm
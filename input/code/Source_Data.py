@@ -0,0 +1,77 @@
+"""
+SOURCE_DATA.xlsx 읽기 + 파싱 결과 캐시
+
+openpyxl 파싱이 한 번의 run 시간 대부분을 차지하므로, 모든 시트를 한 번에 읽은 뒤
+워크북 옆에 바이너리 캐시(<워크북 이름>.cache.pkl)로 저장해 둔다.
+캐시는 워크북 내용의 SHA-256 해시로 구분되므로 xlsx가 바뀌면 자동으로 다시 만들어진다.
+"""
+
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+CACHE_VERSION = 1
+
+# 같은 프로세스 안에서는 디스크 캐시도 다시 읽지 않음: (경로, 해시) -> {시트 이름: DataFrame}
+_loaded = {}
+
+
+def file_hash(source_file):
+    """워크북 내용의 SHA-256 해시"""
+    h = hashlib.sha256()
+    with open(source_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_path(source_file):
+    """캐시 파일 경로 (워크북과 같은 폴더)"""
+    source_file = Path(source_file)
+    return source_file.with_name(source_file.stem + ".cache.pkl")
+
+
+def _read_cache(cache_file, digest):
+    try:
+        data = pd.read_pickle(cache_file)
+    except Exception:
+        return None  # 캐시 없음 / 손상 -> 엑셀에서 다시 읽음
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("hash") != digest:
+        return None
+    return data["sheets"]
+
+
+def _write_cache(cache_file, digest, sheets):
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        pd.to_pickle({"version": CACHE_VERSION, "hash": digest, "sheets": sheets}, tmp_file)
+        tmp_file.replace(cache_file)
+    except OSError as e:
+        # 읽기 전용 폴더 등: 캐시 없이 계속 진행
+        print(f"Warning: could not write source cache {cache_file}: {e}")
+
+
+def load(source_file):
+    """
+    SOURCE_DATA.xlsx 의 모든 시트를 반환
+
+    Parameters:
+    - source_file: 워크북 경로
+
+    Returns:
+    - {시트 이름: DataFrame} (여러 호출이 같은 DataFrame을 공유하므로 수정하지 말 것)
+    """
+    source_file = Path(source_file).resolve()
+    digest = file_hash(source_file)
+    key = (str(source_file), digest)
+
+    if key not in _loaded:
+        cache_file = cache_path(source_file)
+        sheets = _read_cache(cache_file, digest)
+        if sheets is None:
+            sheets = pd.read_excel(source_file, sheet_name=None)
+            _write_cache(cache_file, digest, sheets)
+        _loaded[key] = sheets
+
+    return dict(_loaded[key])
@@ -0,0 +1,152 @@
+"""
+economic_analysis.run() 단계(stage)별 결과 캐시
+
+각 단계는 자신이 읽는 ReactorConfig 필드, 원본 표, 앞 단계를 Stage 로 선언한다.
+캐시 키는 (단계 이름, 필드 값, 원본 표 내용 해시, 앞 단계 키) 의 SHA-256 이므로
+앞 단계 입력이 바뀌면 뒤 단계도 자동으로 다시 계산된다 (중간 결과 자체는 해시하지 않음).
+
+- 메모리: 크기 제한 LRU (maxsize 개 결과)
+- 디스크 (선택): <directory>/<단계 이름>/<키>.pkl, 프로세스 사이에서 재사용
+  단계 계산 코드가 바뀌면 CACHE_VERSION 을 올려 예전 디스크 캐시를 무효화한다.
+- 여러 스레드가 같은 StageCache 를 공유할 수 있음 (LRU / 통계는 lock 으로 보호, 계산은 lock 밖에서)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from input.code.EQcost import frame_fingerprint
+
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    run() 의 한 단계가 읽는 입력
+
+    - fields: ReactorConfig 필드 이름
+    - tables: 원본 표 (economic_analysis 속성 이름, 예: 'df_CP_List')
+    - upstream: 결과를 사용하는 앞 단계 이름
+    """
+    fields: tuple = ()
+    tables: tuple = ()
+    upstream: tuple = ()
+
+
+class StageCache:
+    """
+    단계 결과 ({속성 이름: 값}) 캐시
+
+    Parameters:
+    - maxsize: 메모리에 보관할 결과 수 (LRU)
+    - directory: 디스크 캐시 폴더 (None 이면 메모리만 사용)
+    """
+
+    def __init__(self, maxsize=256, directory=None):
+        self.maxsize = maxsize
+        self.directory = None if directory is None else Path(directory)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # 원본 표는 프로세스 동안 같은 객체를 공유하므로 id 별로 한 번만 해시 (객체를 보관해 id 재사용 방지)
+        self._fingerprints = {}
+        self.hits = {}
+        self.misses = {}
+
+    def _fingerprint(self, df):
+        entry = self._fingerprints.get(id(df))
+        if entry is None or entry[0] is not df:
+            entry = (df, frame_fingerprint(df))
+            with self._lock:
+                self._fingerprints[id(df)] = entry
+        return entry[1]
+
+    def key(self, name, stage, config, tables, upstream_keys):
+        """
+        단계 캐시 키
+
+        Parameters:
+        - name: 단계 이름
+        - stage: Stage
+        - config: ReactorConfig
+        - tables: {표 이름: DataFrame} (stage.tables 순서)
+        - upstream_keys: stage.upstream 순서의 앞 단계 키
+
+        Returns:
+        - SHA-256 hex 문자열
+        """
+        parts = (CACHE_VERSION, name,
+                 tuple((field, getattr(config, field)) for field in stage.fields),
+                 tuple((table, self._fingerprint(tables[table])) for table in stage.tables),
+                 tuple(upstream_keys))
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+    def _path(self, name, key):
+        return self.directory / name / f"{key}.pkl"
+
+    def contains(self, name, key):
+        """메모리 또는 디스크에 결과가 있는지 (get_or_compute 가 계산 없이 반환할지)"""
+        return key in self._memory or (self.directory is not None and self._path(name, key).exists())
+
+    def get_or_compute(self, name, key, compute):
+        """
+        캐시된 결과를 반환, 없으면 compute() 결과를 저장 후 반환
+
+        결과는 여러 run() 이 공유하므로 수정하지 말 것.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits[name] = self.hits.get(name, 0) + 1
+                return self._memory[key]
+
+        # 같은 키를 두 스레드가 동시에 계산할 수 있으나 결과가 같으므로 나중 값으로 덮어씀
+        values = None
+        if self.directory is not None:
+            try:
+                values = pd.read_pickle(self._path(name, key))
+            except Exception:
+                values = None  # 캐시 없음 / 손상 -> 다시 계산
+        hit = values is not None
+        if not hit:
+            values = compute()
+            if self.directory is not None:
+                self._write(name, key, values)
+
+        with self._lock:
+            counter = self.hits if hit else self.misses
+            counter[name] = counter.get(name, 0) + 1
+            self._memory[key] = values
+            if len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+        return values
+
+    def _write(self, name, key, values):
+        path = self._path(name, key)
+        tmp_file = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")  # 프로세스 / 스레드별 임시 파일
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            pd.to_pickle(values, tmp_file)
+            tmp_file.replace(path)
+        except OSError as e:
+            # 읽기 전용 폴더 등: 메모리 캐시만 사용
+            print(f"Warning: could not write stage cache {path}: {e}")
+
+    def clear(self):
+        """메모리 캐시와 통계 초기화 (디스크 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+    def stats(self):
+        """단계별 hit / miss 수"""
+        names = sorted(set(self.hits) | set(self.misses))
+        return pd.DataFrame({'hits': [self.hits.get(n, 0) for n in names],
+                             'misses': [self.misses.get(n, 0) for n in names]},
+                            index=pd.Index(names, name='Stage'))
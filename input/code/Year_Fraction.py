@@ -0,0 +1,80 @@
+"""
+소수점 기간 (start, end) -> 연도별 비율 (Cash Flow Statement / Escalation 공통)
+
+REVENUE, OM, FUEL, D&A, CP별 CAPEX 분배 모두 같은 규칙을 사용한다.
+- 첫 해 ceil(start): ceil(start) - start
+- 중간 연도 ceil(start)+1 ~ floor(end): 1
+- 마지막 해 floor(end)+1: end - floor(end) (0보다 클 때만)
+- 첫 해와 마지막 해가 같은 연도이면 마지막 해 값 사용 (기존 코드의 덮어쓰기 순서와 동일)
+
+운영 AGE 는 첫 해 부분 연도만큼, 이후 1, 2, 3, ... (OM 상관식용)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def year_weights(years, year_start, year_end):
+    """
+    (N x 연도) 연도별 비율과 AGE
+
+    Parameters:
+    - years: 연도 배열 (CFS 연도 grid)
+    - year_start, year_end: 길이 N 배열 (소수점 가능)
+
+    Returns:
+    - weights: (N x 연도) 비율 (기간 밖은 0)
+    - age: (N x 연도) 운영 AGE (비율이 0인 연도의 값은 의미 없음)
+    """
+    years = np.asarray(years)
+    year_start = np.asarray(year_start, dtype=float).reshape(-1, 1)
+    year_end = np.asarray(year_end, dtype=float).reshape(-1, 1)
+
+    start_year_int = np.ceil(year_start)
+    start_fraction = start_year_int - year_start  # 첫 해 비율
+    end_year_int = np.floor(year_end)
+    end_fraction = year_end - end_year_int  # 마지막 해 비율
+
+    first = years == start_year_int
+    middle = (years > start_year_int) & (years <= end_year_int)
+    last = (years == end_year_int + 1) & (end_fraction > 0)
+    weights = np.where(last, end_fraction, np.where(middle, 1.0, np.where(first, start_fraction, 0.0)))
+    age = np.where(first, start_fraction, years - start_year_int)
+    return weights, age
+
+
+@lru_cache(maxsize=4096)
+def _window(first_year, last_year, year_start, year_end):
+    weights, age = year_weights(np.arange(first_year, last_year + 1), [year_start], [year_end])
+    weights, age = weights[0], age[0]
+    weights.setflags(write=False)
+    age.setflags(write=False)
+    return weights, age
+
+
+def window(years, year_start, year_end):
+    """
+    기간 1개의 연도별 비율과 AGE (1차원, 같은 기간은 캐시된 배열 반환 -> 수정하지 말 것)
+
+    Parameters:
+    - years: 연속된 연도 배열
+    - year_start, year_end: 기간 (소수점 가능)
+    """
+    return _window(int(years[0]), int(years[-1]), float(year_start), float(year_end))
+
+
+def allocate(years, year_start, year_end):
+    """
+    여러 기간의 (N x 연도) 연도별 비율과 AGE (같은 기간은 한 번만 계산)
+
+    Parameters:
+    - years: 연도 배열
+    - year_start, year_end: 스칼라 또는 길이 N 배열
+    """
+    year_start, year_end = np.broadcast_arrays(np.atleast_1d(np.asarray(year_start, dtype=float)),
+                                               np.atleast_1d(np.asarray(year_end, dtype=float)))
+    windows, inverse = np.unique(np.column_stack([year_start, year_end]), axis=0, return_inverse=True)
+    weights, age = year_weights(years, windows[:, 0], windows[:, 1])
+    inverse = inverse.reshape(-1)
+    return weights[inverse], age[inverse]
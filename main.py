@@ -4,7 +4,6 @@ import numpy as np
 import yaml
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
-import os
 
 import input.code.Reactor_Selection as RS
 import input.code.readInput as read
@@ -15,6 +14,7 @@ import input.code.Cash_Flow_Statement as CF
 import input.code.Escalation as ESCALATION
 import input.code.Analysis as ANALYSIS
 import input.code.Scheduling as SCHEDULING
+import input.code.Source_Data as SOURCE
 
 
 @dataclass
@@ -109,6 +109,9 @@ class economic_analysis():
         # This is more robust than os.getcwd() which depends on where you run the command from
         self.project_root = Path(__file__).resolve().parent
 
+        # report=False 이면 CFS.xlsx / RESULTS.xlsx 저장을 생략 (sweep 용)
+        self.report = True
+
         '''
         # STEP 1: 엑셀 파일에서 INPUT 변수 및 값들 읽어오기 ####################################################################################################
         이건 input 파일에서 변수들을 읽어와서 전역변수로 생성하는 함수인데 그냥 init에 다 합쳐버려도 될듯. xlsx를 csv로 바꾸어서 다 해버립시다.. 
@@ -195,21 +198,24 @@ class economic_analysis():
             # # return 없음 - None 반환
 
     def step_2_read_source_excel(self, source_file):
+        # 모든 시트를 한 번에 읽음 (파싱 결과는 SOURCE_DATA.cache.pkl 에 캐시)
+        self.source_sheets = SOURCE.load(source_file)
+
         self.SNU = False
         if self.config.reactorType == 'SNU':
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost_SNU') # EQ Cost 원본 데이터
+            self.df_EQcost_original = self.source_sheets['EQcost_SNU'] # EQ Cost 원본 데이터
             self.config.reactorType = 'AP1000'
             self.SNU = True
         # for key, value in self.config.__dict__.items():
         elif self.config.reactorType == 'Nuscale':
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost_Nuscale') # EQ Cost 원본 데이터
+            self.df_EQcost_original = self.source_sheets['EQcost_Nuscale'] # EQ Cost 원본 데이터
         else:
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost') # EQ Cost 원본 데이터
-        self.df_currency = pd.read_excel(source_file, sheet_name='Currency') # 환율 데이터
-        self.df_dollarValue = pd.read_excel(source_file, sheet_name='dollarValue') # CPI 데이터
-        self.df_CP_List = pd.read_excel(source_file, sheet_name='CP_List') # CP List 데이터
-        self.df_scaling_power = pd.read_excel(source_file, sheet_name='SCALING_POWER_EXPONENT') # Scaling Power Exponent 데이터
-        self.df_country_specific = pd.read_excel(source_file, sheet_name='COUNTRY_SPECIFIC') # Country Specific 데이터
+            self.df_EQcost_original = self.source_sheets['EQcost'] # EQ Cost 원본 데이터
+        self.df_currency = self.source_sheets['Currency'] # 환율 데이터
+        self.df_dollarValue = self.source_sheets['dollarValue'] # CPI 데이터
+        self.df_CP_List = self.source_sheets['CP_List'] # CP List 데이터
+        self.df_scaling_power = self.source_sheets['SCALING_POWER_EXPONENT'] # Scaling Power Exponent 데이터
+        self.df_country_specific = self.source_sheets['COUNTRY_SPECIFIC'] # Country Specific 데이터
 
         ''''# INPUT 수정 기회  ##############################################################################################################
         # '''
@@ -224,7 +230,7 @@ class economic_analysis():
         '''
 
         # Schedule 데이터 (임시!!!)
-        self.df_schedule = pd.read_excel(source_file, sheet_name='SCHEDULE') # Schedule 데이터 (임시!!!)
+        self.df_schedule = self.source_sheets['SCHEDULE'] # Schedule 데이터 (임시!!!)
 
         # print(f"df_EQcost_original: {self.df_EQcost_original}")
         # print(f"df_currency: {self.df_currency}")
@@ -249,18 +255,17 @@ class economic_analysis():
         '''
         # STEP 3: EQ Cost 계산 ##############################################################################################################
         '''
-        self.df_EQcost_original = EQ.convert_currency(self.df_EQcost_original, self.df_currency) # 환율 변환 후 우측에 4개 열 추가
-        self.df_EQcost_original = EQ.adjust_dollar_value(self.df_EQcost_original, self.df_dollarValue) # 딜러가치 변환 우측에 4개 열 추가 
-        self.df_EQcost_original = EQ.mergeEQcost(self.df_EQcost_original) # min / Mean / MAX 구하기
-        #print(self.df_EQcost_original) 
+        # 환율 / 달러가치 / min / Mean / MAX: 시나리오와 무관하므로 캐시된 결과 사용 (원본은 수정하지 않음)
+        self.df_EQcost_base = EQ.base_cost(self.df_EQcost_original, self.df_currency, self.df_dollarValue)
+        #print(self.df_EQcost_base) 
 
-        self.df_EQcost_original = EQ.scaling(self.config.Country, self.df_EQcost_original, self.df_scaling_power, self.df_country_specific, ElectricCapacityPerModule, self.config.moduleNumber, 
+        self.df_EQcost_scaled = EQ.scaling(self.config.Country, self.df_EQcost_base, self.df_scaling_power, self.df_country_specific, ElectricCapacityPerModule, self.config.moduleNumber, 
                         self.config.DesignSimplification_safetyPIPING, self.config.DesignSimplification_safetyVALVES, 
                         self.config.DesignSimplification_safetyPUMPS, self.config.DesignSimplification_safetyCABLES, 
                         self.config.DesignSimplification_safetyMECH) # min / Mean / MAX 구하기
-        return self.df_EQcost_original
-        #print(self.self.df_EQcost_original) 
-        #self.self.df_EQcost_original.to_excel('/Users/seungminkwak/Economics/EQcost_output.xlsx', index=False) # 엑셀 파일로 출력
+        return self.df_EQcost_scaled
+        #print(self.df_EQcost_scaled) 
+        #self.df_EQcost_scaled.to_excel('/Users/seungminkwak/Economics/EQcost_output.xlsx', index=False) # 엑셀 파일로 출력
 
     def step_5_calculate_capex(self, CPpivot, CPconst):
         '''
@@ -306,7 +311,9 @@ class economic_analysis():
         output_file = output_dir / "CFS.xlsx"
 
         # 저장
-        CFS.to_excel(output_file, index=False)  # index=False는 보통 깔끔하게 저장할 때 사용 
+        if self.report:
+            CFS = CFS.to_frame()  # 배열로 계산한 CFS -> DataFrame (출력할 때만 생성)
+            CFS.to_excel(output_file, index=False)  # index=False는 보통 깔끔하게 저장할 때 사용 
 
         return CFS
     
@@ -315,11 +322,12 @@ class economic_analysis():
         # STEP 7: Analysis ####################################################################################################################################
         '''
         # Cash Flow Statement 출력 
-        ANALYSIS.CASHFLOW(CFS)
-        LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = ANALYSIS.LCOE(CFS, self.config.discountRate, self.config.electricityPrice, self.config.salesToRevenueRatio)
-        ANALYSIS.IRR(CFS)
-        ANALYSIS.BEP(CFS)
-        ANALYSIS.CONSTRUCTION_COST(CFS)
+        if self.report:
+            results = ANALYSIS.METRICS(CFS, self.config.discountRate, self.config.electricityPrice, self.config.salesToRevenueRatio)
+            LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = results["LCOE"]
+            ANALYSIS.RESULTS(CFS, results)  # CFS 시트 + LCOE / IRR / BEP / 건설비를 한 번에 저장
+        else:
+            LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = ANALYSIS.LCOE_COMPONENTS(CFS, self.config.discountRate, self.config.electricityPrice, self.config.salesToRevenueRatio)
 
         # for 형탁 (평소에는 삭제)
         print("--------------------------------")
@@ -358,9 +366,7 @@ class economic_analysis():
         """------------------------------------------------------------------------------------------"""
         
 
-        current_directory = os.getcwd()
-        source_file =  os.path.join(current_directory, "input", "data", "SOURCE_DATA.xlsx")
-        df_scheduling = pd.read_excel(source_file, sheet_name = self.config.reactorType) # EQ Cost 원본 데이터
+        df_scheduling = self.source_sheets[self.config.reactorType] # step_2 에서 읽은 시트 (작업 폴더와 무관)
         df_result, critical_path_duration = SCHEDULING.Rate(df_scheduling, self.config.Rate_BASEMAT, self.config.Rate_INCV, self.config.Rate_CNT)
         self.constructionPeriod = max(critical_path_duration,10.45)  # years
         self.preconstructionPeriod = 2  # years
@@ -377,8 +383,8 @@ class economic_analysis():
         # print(f"annualCost_CASK: {annualCost_CASK}")
 
         # step 3-2. eq cost 계산
-        self.df_EQcost_original = self.step_3_calculate_eq_cost(ElectricCapacityPerModule) # self.self.df_EQcost_original 생성
-        CPpivot = EQ.sum_by_CP(self.df_EQcost_original, self.df_CP_List, self.config.minMeanMAX) # CP별 합산한 값 반환
+        df_EQcost_scaled = self.step_3_calculate_eq_cost(ElectricCapacityPerModule) # 스케일링된 EQ Cost (원본 유지)
+        CPpivot = EQ.sum_by_CP(df_EQcost_scaled, self.df_CP_List, self.config.minMeanMAX) # CP별 합산한 값 반환
         print(CPpivot)
         print("--------------------------------")
         print(f"ElectricCapacityPerModule[MWe]: {ElectricCapacityPerModule}")
@@ -388,7 +394,7 @@ class economic_analysis():
         # output_dir = self.project_root / "output"
         # output_dir.mkdir(parents=True, exist_ok=True)
         
-        # self.df_EQcost_original.to_csv(output_dir / "df_EQcost_original.csv", index=False)
+        # df_EQcost_scaled.to_csv(output_dir / "df_EQcost_scaled.csv", index=False)
         # CPpivot.to_csv(output_dir / "CPpivot.csv", index=False)
         # exit()
 
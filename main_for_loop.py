@@ -4,8 +4,13 @@ import numpy as np
 import yaml
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
-import os
 import argparse
+import contextlib
+import dataclasses
+import io
+import sys
+import threading
+from types import MappingProxyType
 
 import input.code.Reactor_Selection as RS
 import input.code.readInput as read
@@ -16,6 +21,10 @@ import input.code.Cash_Flow_Statement as CF
 import input.code.Escalation as ESCALATION
 import input.code.Analysis as ANALYSIS
 import input.code.Scheduling as SCHEDULING
+import input.code.Source_Data as SOURCE
+import input.code.Schedule_Risk as RISK
+import input.code.Sensitivity as SENSITIVITY
+import input.code.Stage_Cache as STAGE_CACHE
 
 
 @dataclass
@@ -97,120 +106,266 @@ class ReactorConfig:
     Licensing_Duration: float
 
 
+# Base MWe mapping: run() 의 target_mwe 스케일링 기준 (powerDensity * target_mwe / base MWe)
+BASE_MWE = {
+    "APR1400": 1400,
+    "AP1000": 1027,
+    "SMART": 109.5,
+    "NuScale": 876,
+    "SNU": 100,
+    # "NuScale": 77 # Check if user meant 222 total (which is often 77*modules?) User said 222.
+    # >> Nuscale: 73*12=876
+}
+
+# run() 단계별 입력 (STAGE_CACHE.StageCache 키): ReactorConfig 필드, 원본 표 (속성 이름), 앞 단계
+RUN_STAGES = {
+    'schedule': STAGE_CACHE.Stage(fields=('Rate_BASEMAT', 'Rate_INCV', 'Rate_CNT'),
+                                  tables=('df_scheduling',)),
+    'core': STAGE_CACHE.Stage(fields=('powerDensity', 'activeCoreD', 'activeCoreH', 'activeCoreDpct', 'activeCoreHpct',
+                                      'TGefficiency', 'moduleNumber')),
+    'interim_storage': STAGE_CACHE.Stage(fields=('COSTperHM', 'HMperASSEMBLY', 'BatchNumber', 'BatchCycleLength',
+                                                 'ASSEMBLYperCORE', 'moduleNumber')),
+    'eq_cost': STAGE_CACHE.Stage(fields=('Country', 'moduleNumber', 'DesignSimplification_safetyPIPING',
+                                         'DesignSimplification_safetyVALVES', 'DesignSimplification_safetyPUMPS',
+                                         'DesignSimplification_safetyCABLES', 'DesignSimplification_safetyMECH',
+                                         'minMeanMAX'),
+                                 tables=('df_EQcost_original', 'df_currency', 'df_dollarValue', 'df_scaling_power',
+                                         'df_country_specific', 'df_CP_List'),
+                                 upstream=('core',)),
+    'construction_cost': STAGE_CACHE.Stage(fields=('Country', 'moduleNumber'),
+                                           tables=('df_CP_List', 'df_scaling_power', 'df_country_specific'),
+                                           upstream=('core',)),
+    'capex': STAGE_CACHE.Stage(fields=('plantLifetime', 'escalationNSSS', 'escalationTG', 'escalationBOP',
+                                       'escalationLabor'),
+                               tables=('df_schedule',),
+                               upstream=('schedule', 'eq_cost', 'construction_cost')),
+    'cash_flow': STAGE_CACHE.Stage(fields=('reactorType', 'plantLifetime', 'moduleNumber', 'electricityPrice',
+                                           'salesToRevenueRatio', 'capacityFactor', 'Feed', 'Product', 'Tail',
+                                           'totalFuelQty', 'U3O8Price', 'EnrichmentPrice', 'FabricationPrice',
+                                           'ConversionPrice', 'BatchNumber', 'BatchCycleLength', 'CoreDesignFactor',
+                                           'interimCOST_initial', 'interimCOST_OM', 'yearsForInterimStorage'),
+                                   upstream=('schedule', 'core', 'interim_storage', 'capex')),
+    'financing': STAGE_CACHE.Stage(fields=('plantLifetime', 'debtToEquityRatio', 'interestRate', 'loanTenor', 'taxRate'),
+                                   upstream=('schedule', 'cash_flow')),
+}
+
+
+def read_config(yaml_file, project_root):
+    """
+    YAML 파일에서 변수를 읽어와 ReactorConfig dataclass로 반환
+    (use_yaml=False 이면 project_root/input/data/INPUT.xlsx 값으로 덮어씀)
+    """
+    with open(yaml_file, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    # Dataclass를 사용하여 검증 및 자동완성 지원
+    config = ReactorConfig(**data)
+
+    if not config.use_yaml:
+        print(f"Reading input from Excel (use_yaml={config.use_yaml})")
+        # Excel file path
+        input_excel = project_root / "input" / "data" / "INPUT.xlsx"
+
+        if input_excel.exists():
+            df = pd.read_excel(input_excel, header=None)
+            loaded_count = 0
+
+            for i in range(len(df)):
+                var_name = df.iloc[i, 1]    # Column 2: Variable Name
+                var_value = df.iloc[i, 2]   # Column 3: Variable Value
+
+                # Update config if the attribute exists
+                if hasattr(config, var_name):
+                    # Enforce type based on ReactorConfig definition
+                    if var_name in config.__annotations__:
+                        target_type = config.__annotations__[var_name]
+                        try:
+                            # Handle optional or specific types if needed, but for now simple casting
+                            # Special handling for boolean if 'TRUE'/'FALSE' strings are used in Excel
+                            if target_type == bool and isinstance(var_value, str):
+                                var_value = var_value.lower() == 'true'
+
+                            # Cast the value
+                            converted_value = target_type(var_value)
+                            setattr(config, var_name, converted_value)
+                        except (ValueError, TypeError) as e:
+                            print(f"Warning: Failed to cast {var_name}='{var_value}' to {target_type}. Keeping original. Error: {e}")
+                            setattr(config, var_name, var_value)
+                    else:
+                        setattr(config, var_name, var_value)
+
+                    loaded_count += 1
+
+            print(f"Updated {loaded_count} configuration variables from {input_excel.name}")
+        else:
+            print(f"Warning: {input_excel} not found. Using YAML defaults.")
+    else:
+        print(f"Reading input from YAML (use_yaml={config.use_yaml})")
+    # read input from excel
+        # def step_1_read_input(self, excel_file):
+        # """
+        # Excel 파일에서 변수를 읽어와 호출한 모듈의 전역변수로 생성
+        # """
+        # df = pd.read_excel(excel_file, header=None)
+
+        # # 호출한 모듈의 globals() 찾기
+        # caller_globals = inspect.currentframe().f_back.f_globals
+
+        # for i in range(len(df)):
+        #     var_name = df.iloc[i, 1]    # 2열: 변수 이름
+        #     var_value = df.iloc[i, 2]   # 3열: 변수 값
+
+        #     # 호출한 모듈의 전역변수로 생성
+        #     caller_globals[var_name] = var_value
+        #     #print(f"{var_name} = {var_value}")
+
+        # #print(f"총 {len(df)}개 변수가 생성되었습니다.")
+        # # return 없음 - None 반환
+    return config
+
+
+def reactor_sheets(reactorType):
+    """
+    reactorType -> (EQ Cost 시트, 공정 시트, SNU 여부)
+    SNU 는 EQcost_SNU 시트와 AP1000 공정을 사용 (config.reactorType 은 'SNU' 그대로 둠)
+    """
+    if reactorType == 'SNU':
+        return 'EQcost_SNU', 'AP1000', True
+    if reactorType == 'Nuscale':
+        return 'EQcost_Nuscale', reactorType, False
+    return 'EQcost', reactorType, False
+
+
+@dataclass(frozen=True)
+class AnalysisContext:
+    """
+    한 번 읽어서 여러 economic_analysis / evaluate() 가 공유하는 읽기 전용 데이터
+
+    - project_root: 입력 / 출력 경로의 기준 폴더 (os.getcwd() 와 무관)
+    - config: input.yaml 의 ReactorConfig (공유 원본: 수정하지 말고 dataclasses.replace 로 복사해서 사용)
+    - source_sheets: SOURCE_DATA.xlsx 의 {시트 이름: DataFrame} (읽기 전용 mapping, DataFrame 도 수정 금지)
+    - eq_sheet: SNU 가 아닌 reactorType 이 쓰는 EQ Cost 시트 (input.yaml 의 reactorType 기준)
+    """
+    project_root: Path
+    config: ReactorConfig
+    source_sheets: MappingProxyType
+    eq_sheet: str
+
+    @classmethod
+    def load(cls, project_root=None):
+        """project_root/input/data 의 input.yaml 과 SOURCE_DATA.xlsx 를 읽어 context 생성"""
+        project_root = Path(__file__).resolve().parent if project_root is None else Path(project_root)
+        config = read_config(project_root / "input" / "data" / "input.yaml", project_root)
+        # 워크북 전체를 한 번만 파싱해서 보관 (파싱 결과는 SOURCE_DATA.cache.pkl 에 캐시)
+        source_sheets = SOURCE.load(project_root / "input" / "data" / "SOURCE_DATA.xlsx")
+        return cls(project_root, config, MappingProxyType(dict(source_sheets)), reactor_sheets(config.reactorType)[0])
+
+
+class _ThreadStdout:
+    """
+    sys.stdout 대신 설치되는 출력 분배기: quiet() 안의 스레드 출력만 버리고 나머지는 원래 stdout 으로
+    (contextlib.redirect_stdout 은 프로세스 전체의 sys.stdout 을 바꾸므로 스레드끼리 섞임)
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(getattr(self._local, 'stream', None) or self._stream, name)
+
+
+_stdout_lock = threading.Lock()
+_stdout_router = None  # quiet() 사용 중에만 설치됨
+_quiet_users = 0
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    현재 스레드의 print 출력을 버림 (다른 스레드의 출력은 그대로)
+    _ThreadStdout 은 quiet() 가 하나라도 열려 있는 동안만 설치되고, 마지막 quiet() 가 끝나면 원래 stdout 으로 되돌림
+    """
+    global _stdout_router, _quiet_users
+    with _stdout_lock:
+        if _quiet_users == 0:
+            _stdout_router = _ThreadStdout(sys.stdout)
+            sys.stdout = _stdout_router
+        _quiet_users += 1
+        router = _stdout_router
+    previous = getattr(router._local, 'stream', None)
+    router._local.stream = io.StringIO()
+    try:
+        yield
+    finally:
+        router._local.stream = previous
+        with _stdout_lock:
+            _quiet_users -= 1
+            if _quiet_users == 0:
+                if sys.stdout is router:  # 그 사이 다른 코드가 stdout 을 바꿨으면 건드리지 않음
+                    sys.stdout = router._stream
+                _stdout_router = None
+
+
 class economic_analysis():
 
-    def __init__(self):
+    def __init__(self, context=None):
         super().__init__()
 
         '''
         # Step 0: 변수 선언 및 초기화 ##########################################################################################################################
         '''
         # 0. 기본 변수들
+        # input.yaml / SOURCE_DATA.xlsx 는 AnalysisContext 가 한 번만 읽음 (context 를 넘기면 다시 읽지 않고 공유)
         # Use Path(__file__).parent to get the directory where the script is located
         # This is more robust than os.getcwd() which depends on where you run the command from
-        self.project_root = Path(__file__).resolve().parent
+        if context is None:
+            context = AnalysisContext.load(Path(__file__).resolve().parent)
+        self.context = context
+        self.project_root = context.project_root
+        self.target_mwe = None
+
+        # report=False 이면 CFS.xlsx / RESULTS.xlsx 저장을 생략 (sweep 용)
+        self.report = True
+
+        # STAGE_CACHE.StageCache 를 지정하면 report=False 인 run() 이 단계 결과를 재사용 (RUN_STAGES)
+        self.stage_cache = None
+        self._stage_keys = {}
+        self.stage_log = {}  # 마지막 run() 의 단계별 재사용 여부 {단계 이름: True (캐시) / False (계산)}
 
         '''
         # STEP 1: 엑셀 파일에서 INPUT 변수 및 값들 읽어오기 ####################################################################################################
         이건 input 파일에서 변수들을 읽어와서 전역변수로 생성하는 함수인데 그냥 init에 다 합쳐버려도 될듯. xlsx를 csv로 바꾸어서 다 해버립시다.. 
         data도 folder 잘 정리해서 하면 될 듯?
         '''
-        input_yaml = self.project_root / "input" / "data" / "input.yaml"
-        self.step_1_read_yaml(input_yaml)
+        self.config = dataclasses.replace(context.config) # context 의 config 는 공유 원본이므로 복사본 사용
+        self.input_config = None  # 마지막 run() 의 MWe 스케일링 전 config
+        self._run_config = None   # 마지막 run() 이 만든 (스케일링 후) config
         '''
         # STEP 2: Source 데이터 읽어오기 및 계산 (하나의 파일에서 여러 시트 읽기) #########################################################################################################₩
         '''
-        source_file = self.project_root / "input" / "data" / "SOURCE_DATA.xlsx"
-        self.step_2_read_source_excel(source_file)
+        self.step_2_read_source_excel(context)
 
     def step_1_read_yaml(self, yaml_file):
         """
         YAML 파일에서 변수를 읽어와
         ReactorConfig dataclass로 변환하여 self.config에 저장
         """
-        with open(yaml_file, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-
-        # Dataclass를 사용하여 검증 및 자동완성 지원
-        self.config = ReactorConfig(**data)
-
-        if not self.config.use_yaml:
-            print(f"Reading input from Excel (use_yaml={self.config.use_yaml})")
-            # Excel file path
-            input_excel = self.project_root / "input" / "data" / "INPUT.xlsx"
-            
-            if input_excel.exists():
-                df = pd.read_excel(input_excel, header=None)
-                loaded_count = 0
-                
-                for i in range(len(df)):
-                    var_name = df.iloc[i, 1]    # Column 2: Variable Name
-                    var_value = df.iloc[i, 2]   # Column 3: Variable Value
-                    
-                    # Update config if the attribute exists
-                    if hasattr(self.config, var_name):
-                        # Enforce type based on ReactorConfig definition
-                        if var_name in self.config.__annotations__:
-                            target_type = self.config.__annotations__[var_name]
-                            try:
-                                # Handle optional or specific types if needed, but for now simple casting
-                                # Special handling for boolean if 'TRUE'/'FALSE' strings are used in Excel
-                                if target_type == bool and isinstance(var_value, str):
-                                    var_value = var_value.lower() == 'true'
-                                
-                                # Cast the value
-                                converted_value = target_type(var_value)
-                                setattr(self.config, var_name, converted_value)
-                            except (ValueError, TypeError) as e:
-                                print(f"Warning: Failed to cast {var_name}='{var_value}' to {target_type}. Keeping original. Error: {e}")
-                                setattr(self.config, var_name, var_value)
-                        else:
-                            setattr(self.config, var_name, var_value)
-                            
-                        loaded_count += 1
-                
-                print(f"Updated {loaded_count} configuration variables from {input_excel.name}")
-            else:
-                print(f"Warning: {input_excel} not found. Using YAML defaults.")
-        else:
-            print(f"Reading input from YAML (use_yaml={self.config.use_yaml})")
-        # read input from excel
-            # def step_1_read_input(self, excel_file):
-            # """
-            # Excel 파일에서 변수를 읽어와 호출한 모듈의 전역변수로 생성
-            # """
-            # df = pd.read_excel(excel_file, header=None)
-            
-            # # 호출한 모듈의 globals() 찾기
-            # caller_globals = inspect.currentframe().f_back.f_globals
-            
-            # for i in range(len(df)):
-            #     var_name = df.iloc[i, 1]    # 2열: 변수 이름
-            #     var_value = df.iloc[i, 2]   # 3열: 변수 값
-                
-            #     # 호출한 모듈의 전역변수로 생성
-            #     caller_globals[var_name] = var_value
-            #     #print(f"{var_name} = {var_value}")
-            
-            # #print(f"총 {len(df)}개 변수가 생성되었습니다.")
-            # # return 없음 - None 반환
-
-    def step_2_read_source_excel(self, source_file):
-        self.SNU = False
-        if self.config.reactorType == 'SNU':
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost_SNU') # EQ Cost 원본 데이터
-            self.config.reactorType = 'AP1000'
-            self.SNU = True
-        # for key, value in self.config.__dict__.items():
-        elif self.config.reactorType == 'Nuscale':
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost_Nuscale') # EQ Cost 원본 데이터
-        else:
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost') # EQ Cost 원본 데이터
-        self.df_currency = pd.read_excel(source_file, sheet_name='Currency') # 환율 데이터
-        self.df_dollarValue = pd.read_excel(source_file, sheet_name='dollarValue') # CPI 데이터
-        self.df_CP_List = pd.read_excel(source_file, sheet_name='CP_List') # CP List 데이터
-        self.df_scaling_power = pd.read_excel(source_file, sheet_name='SCALING_POWER_EXPONENT') # Scaling Power Exponent 데이터
-        self.df_country_specific = pd.read_excel(source_file, sheet_name='COUNTRY_SPECIFIC') # Country Specific 데이터
+        self.config = read_config(yaml_file, self.project_root)
+
+    def step_2_read_source_excel(self, context):
+        # 워크북은 AnalysisContext 가 한 번만 파싱 (run()에서 SNU / 스케줄 시트를 다시 읽지 않도록)
+        # 시트는 여러 economic_analysis 가 공유하므로 수정하지 않음
+        self.source_sheets = context.source_sheets
+
+        # SNU 는 reactorType 을 'SNU' 그대로 두고 EQcost_SNU / AP1000 공정 시트를 사용 (reactor_sheets)
+        _, _, self.SNU = reactor_sheets(self.config.reactorType)
+        self.df_EQcost_original = self.source_sheets[context.eq_sheet] # EQ Cost 원본 데이터
+        self.df_currency = self.source_sheets['Currency'] # 환율 데이터
+        self.df_dollarValue = self.source_sheets['dollarValue'] # CPI 데이터
+        self.df_CP_List = self.source_sheets['CP_List'] # CP List 데이터
+        self.df_scaling_power = self.source_sheets['SCALING_POWER_EXPONENT'] # Scaling Power Exponent 데이터
+        self.df_country_specific = self.source_sheets['COUNTRY_SPECIFIC'] # Country Specific 데이터
 
         ''''# INPUT 수정 기회  ##############################################################################################################
         # '''
@@ -225,7 +380,7 @@ class economic_analysis():
         '''
 
         # Schedule 데이터 (임시!!!)
-        self.df_schedule = pd.read_excel(source_file, sheet_name='SCHEDULE') # Schedule 데이터 (임시!!!)
+        self.df_schedule = self.source_sheets['SCHEDULE'] # Schedule 데이터 (임시!!!)
 
         # print(f"df_EQcost_original: {self.df_EQcost_original}")
         # print(f"df_currency: {self.df_currency}")
@@ -250,18 +405,18 @@ class economic_analysis():
         '''
         # STEP 3: EQ Cost 계산 ##############################################################################################################
         '''
-        self.df_EQcost_original = EQ.convert_currency(self.df_EQcost_original, self.df_currency) # 환율 변환 후 우측에 4개 열 추가
-        self.df_EQcost_original = EQ.adjust_dollar_value(self.df_EQcost_original, self.df_dollarValue) # 딜러가치 변환 우측에 4개 열 추가 
-        self.df_EQcost_original = EQ.mergeEQcost(self.df_EQcost_original) # min / Mean / MAX 구하기
-        #print(self.df_EQcost_original) 
+        # 환율 / 달러가치 / min / Mean / MAX: 시나리오와 무관하므로 캐시된 결과 사용 (원본은 수정하지 않음)
+        self.df_EQcost_base = EQ.base_cost(self.df_EQcost_original, self.df_currency, self.df_dollarValue)
+        #print(self.df_EQcost_base) 
 
-        self.df_EQcost_original = EQ.scaling(self.config.Country, self.df_EQcost_original, self.df_scaling_power, self.df_country_specific, ElectricCapacityPerModule, self.config.moduleNumber, 
+        self.df_EQcost_scaled = EQ.scaling(self.config.Country, self.df_EQcost_base, self.df_scaling_power, self.df_country_specific, ElectricCapacityPerModule, self.config.moduleNumber, 
                         self.config.DesignSimplification_safetyPIPING, self.config.DesignSimplification_safetyVALVES, 
                         self.config.DesignSimplification_safetyPUMPS, self.config.DesignSimplification_safetyCABLES, 
-                        self.config.DesignSimplification_safetyMECH) # min / Mean / MAX 구하기
-        return self.df_EQcost_original
-        #print(self.self.df_EQcost_original) 
-        #self.self.df_EQcost_original.to_excel('/Users/seungminkwak/Economics/EQcost_output.xlsx', index=False) # 엑셀 파일로 출력
+                        self.config.DesignSimplification_safetyMECH,
+                        export=self.project_root / "result_df_output.xlsx" if self.report else False) # min / Mean / MAX 구하기
+        return self.df_EQcost_scaled
+        #print(self.df_EQcost_scaled) 
+        #self.df_EQcost_scaled.to_excel('/Users/seungminkwak/Economics/EQcost_output.xlsx', index=False) # 엑셀 파일로 출력
 
     def step_5_calculate_capex(self, CPpivot, CPconst):
         '''
@@ -271,9 +426,11 @@ class economic_analysis():
         #print(CAPEX)
 
         df_CAPEX = ESCALATION.addSCHEDULE(CAPEX,self.df_schedule) # CAPEX 표에 START, END 열 추가
+        self.df_CAPEX_schedule = df_CAPEX # escalation 전 CP별 비용 + START/END (step_8 에서 재사용)
         #print(df_CAPEX)
 
         df_CAPEX = ESCALATION.CAPEX(df_CAPEX, self.preconstructionPeriod, self.constructionPeriod, self.config.plantLifetime,self.config.escalationNSSS, self.config.escalationTG, self.config.escalationBOP, self.config.escalationLabor)
+        self.df_CAPEX_escalated = df_CAPEX # CP별 연도별 CAPEX (step_11 에서 재사용)
         #print(df_CAPEX)
 
         return df_CAPEX    
@@ -282,6 +439,14 @@ class economic_analysis():
         '''
         # STEP 6: Cash Flow Output ####################################################################################################################################
         '''
+        CFS = self.step_6_operating_rows(df_CAPEX, ElectricCapacityPerModule, annualCost_CASK)
+        CFS = self.step_6_financing_rows(CFS)
+        return self.step_6_save(CFS)
+
+    def step_6_operating_rows(self, df_CAPEX, ElectricCapacityPerModule, annualCost_CASK):
+        '''
+        STEP 6-1: 연도 ~ CAPEX 행 (금융 조건과 무관)
+        '''
         CFS = CF.YEARS(self.preconstructionPeriod, self.constructionPeriod, self.config.plantLifetime)   #연도 생성 
         CFS = CF.REVENUE(CFS, ElectricCapacityPerModule, self.config.moduleNumber, self.config.electricityPrice, self.config.salesToRevenueRatio, self.config.capacityFactor, self.constructionPeriod, self.constructionPeriod + self.config.plantLifetime)  #Revenue 행 생성 
         CFS = CF.OM_ANNUAL(self.SNU, CFS, self.constructionPeriod, self.constructionPeriod + self.config.plantLifetime, ElectricCapacityPerModule, self.config.moduleNumber)  #OM_ANNUAL 행 생성
@@ -290,6 +455,12 @@ class economic_analysis():
         CFS = CF.GROSS_PROFIT(CFS)  #GROSS_PROFIT 행 생성
         CFS = CF.OM_CAPITAL(CFS, self.constructionPeriod, self.constructionPeriod + self.config.plantLifetime, ElectricCapacityPerModule, self.config.moduleNumber)  #OM_ANNUAL 행 생성
         CFS = CF.CAPEX(CFS, df_CAPEX)  #CAPEX 행 생성
+        return CFS
+
+    def step_6_financing_rows(self, CFS):
+        '''
+        STEP 6-2: CAPEX (DEBT portion) ~ CASH FLOW 행 (debtToEquityRatio / interestRate / loanTenor / taxRate), CFS 를 직접 수정
+        '''
         CFS = CF.CAPEX_DEBT(self.config.debtToEquityRatio, CFS) #Debt에 해당하는 CAPEX 행 생성 
         CFS = CF.INTERESTnDEBTrepayment(CFS, self.config.interestRate, self.config.loanTenor, self.constructionPeriod) #건설중이자 + 운영중이자 + 원금상환
         CFS = CF.DEPRECIATIONandAMORTIZATION(CFS, self.constructionPeriod, self.config.plantLifetime) # 감가상각비 처리 
@@ -298,6 +469,13 @@ class economic_analysis():
         CFS = CF.TAX(CFS,self.config.taxRate)
         CFS = CF.NI(CFS)
         CFS = CF.CASH_FLOW(CFS)
+        return CFS
+
+    def step_6_save(self, CFS):
+        '''
+        STEP 6-3: 배열 CFS 보관, report 이면 CFS.xlsx 저장 (DataFrame 반환)
+        '''
+        self.CFS_statement = CFS # 배열 CFS (step_9 에서 재사용)
 
         # output 폴더 경로
         output_dir = self.project_root / "output"
@@ -307,7 +485,9 @@ class economic_analysis():
         output_file = output_dir / "CFS.xlsx"
 
         # 저장
-        CFS.to_excel(output_file, index=False)  # index=False는 보통 깔끔하게 저장할 때 사용 
+        if self.report:
+            CFS = CFS.to_frame()  # 배열로 계산한 CFS -> DataFrame (출력할 때만 생성)
+            CFS.to_excel(output_file, index=False)  # index=False는 보통 깔끔하게 저장할 때 사용 
 
         return CFS
     
@@ -316,11 +496,12 @@ class economic_analysis():
         # STEP 7: Analysis ####################################################################################################################################
         '''
         # Cash Flow Statement 출력 
-        ANALYSIS.CASHFLOW(CFS)
-        LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = ANALYSIS.LCOE(CFS, self.config.discountRate, self.config.electricityPrice, self.config.salesToRevenueRatio)
-        ANALYSIS.IRR(CFS)
-        ANALYSIS.BEP(CFS)
-        ANALYSIS.CONSTRUCTION_COST(CFS)
+        if self.report:
+            results = ANALYSIS.METRICS(CFS, self.config.discountRate, self.config.electricityPrice, self.config.salesToRevenueRatio)
+            LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = results["LCOE"]
+            ANALYSIS.RESULTS(CFS, results, self.project_root / "output" / "RESULTS.xlsx")  # CFS 시트 + LCOE / IRR / BEP / 건설비를 한 번에 저장
+        else:
+            LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = ANALYSIS.LCOE_COMPONENTS(CFS, self.config.discountRate, self.config.electricityPrice, self.config.salesToRevenueRatio)
 
         # for 형탁 (평소에는 삭제)
         print("--------------------------------")
@@ -345,20 +526,122 @@ class economic_analysis():
         print(f"  total fuel Qty: {self.config.totalFuelQty} [tU]")
         print(f"  Batch Number: {self.config.BatchNumber}")
         print(f"  Batch Cycle Length: {self.config.BatchCycleLength} [months]")
-        return
+
+        # 위에서 출력한 값들을 그대로 dict로 반환 (run_sweep.py 에서 사용)
+        metrics = {
+            "LCOE_TOTAL": LCOE_TOTAL,
+            "LCOE_CON": LCOE_CON,
+            "LCOE_OM": LCOE_OM,
+            "LCOE_FUEL": LCOE_FUEL + LCOE_FUEL_IS,
+            "LCOE_FUEL_IS": LCOE_FUEL_IS,
+            "LCOE_U3O8": LCOE_FUEL*self.ratio['U3O8'],
+            "LCOE_Conversion": LCOE_FUEL*self.ratio['Conversion'],
+            "LCOE_Enrichment": LCOE_FUEL*self.ratio['Enrichment'],
+            "LCOE_Fabrication": LCOE_FUEL*self.ratio['Fabrication'],
+            "Average EFPD": EFPD,
+            "Average Discharged_BU": Discharged_BU/1000,
+        }
+        return metrics
+
+    def step_8_schedule_risk(self, n_samples, Rate_BASEMAT=None, Rate_INCV=None, Rate_CNT=None,
+                             method='triangular', low=1.0, high=1.0, seed=None):
+        '''
+        # STEP 8: 건설 공기 Monte Carlo (run() 이후 호출) ###########################################################################################################
+        Rate_* 는 (min, mode, max) 분포 또는 스칼라 (None 이면 config 값 고정)
+        '''
+        rates = [self.config.Rate_BASEMAT if Rate_BASEMAT is None else Rate_BASEMAT,
+                 self.config.Rate_INCV if Rate_INCV is None else Rate_INCV,
+                 self.config.Rate_CNT if Rate_CNT is None else Rate_CNT]
+        risk = RISK.simulate(self.df_scheduling, n_samples, *rates, method=method, low=low, high=high, seed=seed)
+        df_LCOE = RISK.lcoe_distribution(risk, self.df_CAPEX_schedule, self.preconstructionPeriod, self.config,
+                                         self.ElectricCapacityPerModule, self.annualCost_CASK, self.SNU)
+
+        print(risk.quantiles())
+        print(risk.criticality_index().head(10))
+        print(df_LCOE['LCOE_TOTAL'].describe(percentiles=[0.05, 0.5, 0.95]))
+        return risk, df_LCOE
+
+    def step_9_break_even(self, input_name='electricityPrice', discountRate=None, target_irr=None):
+        '''
+        # STEP 9: NPV(discountRate) = 0 또는 IRR = target_irr 이 되는 입력값 (run() 이후 호출) ##################################################################
+        REVENUE 에 비례하는 입력 (ANALYSIS.REVENUE_LINEAR_INPUTS) 만 지원: 마지막 run() 의 CFS 를 재사용
+        그 외 입력은 sweep_engine.SweepEngine.break_even 사용 (입력마다 전체 계산 반복)
+        '''
+        if input_name not in ANALYSIS.REVENUE_LINEAR_INPUTS:
+            raise ValueError(f"{input_name} is not proportional to REVENUE; use SweepEngine.break_even")
+        if discountRate is None and target_irr is None:
+            discountRate = self.config.discountRate
+        value = ANALYSIS.BREAK_EVEN(self.CFS_statement, getattr(self.config, input_name), self.config.taxRate,
+                                    discountRate=discountRate, target_irr=target_irr)[0]
+        print(f"Break-even {input_name}: {value}")
+        return value
+
+    def step_10_sensitivities(self, fields=None, rel_step=1e-6):
+        '''
+        # STEP 10: 숫자 ReactorConfig 입력별 dLCOE/dθ, dNPV/dθ (run() 이후 호출) ##############################################################################
+        모든 입력의 (+h, -h) 를 한 번의 batch 계산으로 처리 (SENSITIVITY.GRADIENTS)
+        '''
+        base, df_sensitivity = SENSITIVITY.GRADIENTS(self, fields=fields, rel_step=rel_step)
+        print(df_sensitivity.reindex(df_sensitivity['dLCOE_TOTAL'].abs().sort_values(ascending=False).index).head(15))
+        return base, df_sensitivity
+
+    def step_11_linear_lcoe(self):
+        '''
+        # STEP 11: 마지막 run() 의 LCOE 선형 계수 (CP별 / 항목별 비용 배율, 가격 변화는 재계산 없이 내적) ###################################################
+        '''
+        return ANALYSIS.LINEAR_LCOE(self.CFS_statement, self.df_CAPEX_escalated, self.constructionPeriod,
+                                    self.config.discountRate, self.config.electricityPrice,
+                                    self.config.salesToRevenueRatio, self.config.debtToEquityRatio,
+                                    self.config.interestRate, self.config.loanTenor)
+
+    def step_12_cp_attribution(self):
+        '''
+        # STEP 12: 마지막 run() 의 CP별 LCOE_CON 분해 (EQ / Construction / escalation / 이자) ##################################################################
+        '''
+        components = ESCALATION.CAPEX_COMPONENTS(self.df_CAPEX_schedule, self.preconstructionPeriod, self.constructionPeriod,
+                                                 self.config.plantLifetime, self.config.escalationNSSS,
+                                                 self.config.escalationTG, self.config.escalationBOP,
+                                                 self.config.escalationLabor)
+        df_attribution = ANALYSIS.CP_ATTRIBUTION(self.CFS_statement, components, self.df_CAPEX_schedule['CPlist'].tolist(),
+                                                 self.constructionPeriod, self.config.discountRate,
+                                                 self.config.electricityPrice, self.config.salesToRevenueRatio,
+                                                 self.config.debtToEquityRatio, self.config.interestRate,
+                                                 self.config.loanTenor)
+        print(df_attribution.sort_values('LCOE_CON', ascending=False).head(10))
+        return df_attribution
+
+    def _stage(self, name, compute):
+        '''
+        run() 한 단계 실행: compute() 는 {속성 이름: 값} 을 반환하고, 결과는 self 의 속성이 된다.
+        stage_cache 가 있고 report=False 이면 RUN_STAGES[name] 의 입력이 같은 이전 결과를 재사용
+        (report=True 이면 엑셀 출력 등 부수 효과가 있으므로 항상 계산)
+        '''
+        if self.stage_cache is None or self.report:
+            values = compute()
+            self.stage_log[name] = False
+        else:
+            stage = RUN_STAGES[name]
+            key = self.stage_cache.key(name, stage, self.config, {table: getattr(self, table) for table in stage.tables},
+                                       [self._stage_keys[upstream] for upstream in stage.upstream])
+            self._stage_keys[name] = key
+            self.stage_log[name] = self.stage_cache.contains(name, key)
+            values = self.stage_cache.get_or_compute(name, key, compute)
+        for attribute, value in values.items():
+            setattr(self, attribute, value)
+        return values
 
     def run(self): 
         # step 1,2 Initialize the input data
         # self.init()  
         
-        # Initialize SNU flag
-        self.SNU = False
-        
-        # Special handling for SNU reloading triggered by args
-        if self.config.reactorType == 'SNU':
-            self.SNU = True
-            source_file = self.project_root / "input" / "data" / "SOURCE_DATA.xlsx"
-            self.df_EQcost_original = pd.read_excel(source_file, sheet_name='EQcost_SNU')
+        # 이전 run() 이 스케일링한 config 가 그대로 있으면 스케일링 전 입력에서 다시 시작 (반복 호출해도 같은 결과)
+        if self.config is self._run_config:
+            self.config = self.input_config
+        self.input_config = self.config
+
+        # SNU: EQcost_SNU 시트 / AP1000 공정, 그 외: input.yaml 기준 EQ 시트 (이전 run() 과 무관)
+        eq_sheet, sched_sheet, self.SNU = reactor_sheets(self.config.reactorType)
+        self.df_EQcost_original = self.source_sheets[eq_sheet if self.SNU else self.context.eq_sheet]
             
         # wanna print config, row by row
         for key, value in self.config.__dict__.items():
@@ -366,21 +649,12 @@ class economic_analysis():
 
         """------------------------------------------------------------------------------------------"""
         """------------------------------------------------------------------------------------------"""
-        # Base MWe mapping
-        base_mwe_map = {
-            "APR1400": 1400,
-            "AP1000": 1027,
-            "SMART": 109.5,
-            "NuScale": 876,
-            "SNU": 100,
-            # "NuScale": 77 # Check if user meant 222 total (which is often 77*modules?) User said 222.
-            # >> Nuscale: 73*12=876
-        }
-        
-        base_mwe = base_mwe_map.get(self.config.reactorType, 1400) # Default to 1400 if unknown
+        # Base MWe mapping (BASE_MWE)
+        base_mwe = BASE_MWE.get(self.config.reactorType, 1400) # Default to 1400 if unknown
 
-        if hasattr(self, 'target_mwe') and self.target_mwe is not None:
-             self.config.powerDensity = self.config.powerDensity * (self.target_mwe / base_mwe)
+        if self.target_mwe is not None:
+             # 입력 config 는 수정하지 않고 스케일링한 복사본을 self.config 로 사용
+             self.config = dataclasses.replace(self.config, powerDensity=self.config.powerDensity * (self.target_mwe / base_mwe))
         else:
              # Default fallback if no argument is passed (original logic was 100/1400, preserving user's manual change for now if they run without args? 
              # Actually user's code had 100/1400 hardcoded. I will make sure we respect that if no arg is passed, OR maybe just default to 100/1400 if that was their intent.
@@ -390,7 +664,8 @@ class economic_analysis():
              # User said "그럼 내가 태깅한 코드는 APR1400에 대해서 100으로 스케일링한 것을 알겠지?" implies they were manually testing 100.
              # I will use the manual hardcode just as a fallback or remove it if I am sure.
              # Safest is to use the arg if present.
-             self.config.powerDensity = self.config.powerDensity
+             pass
+        self._run_config = self.config
         
         print(f"BaseMWe: {base_mwe}")
         print(f"ModifiedPowerDensity: {self.config.powerDensity}")
@@ -399,33 +674,44 @@ class economic_analysis():
         """------------------------------------------------------------------------------------------"""
         
 
-        current_directory = os.getcwd()
-        source_file =  os.path.join(current_directory, "input", "data", "SOURCE_DATA.xlsx")
-        
-        # SNU uses AP1000 scheduling sheet
-        sched_sheet = self.config.reactorType
-        if sched_sheet == 'SNU':
-            sched_sheet = 'AP1000'
-            
-        df_scheduling = pd.read_excel(source_file, sheet_name = sched_sheet) # EQ Cost 원본 데이터
-        df_result, critical_path_duration = SCHEDULING.Rate(df_scheduling, self.config.Rate_BASEMAT, self.config.Rate_INCV, self.config.Rate_CNT)
-        self.constructionPeriod = max(critical_path_duration,10.45)  # years
-        self.preconstructionPeriod = 2  # years
+        # SNU uses AP1000 scheduling sheet (reactor_sheets)
+        df_scheduling = self.source_sheets[sched_sheet] # EQ Cost 원본 데이터
+        self.df_scheduling = df_scheduling
+        self._stage_keys = {}
+        self.stage_log = {}
+
+        def schedule():
+            df_result, critical_path_duration = SCHEDULING.Rate(df_scheduling, self.config.Rate_BASEMAT, self.config.Rate_INCV, self.config.Rate_CNT)
+            return {'constructionPeriod': max(critical_path_duration,10.45),  # years
+                    'preconstructionPeriod': 2}  # years
+        self._stage('schedule', schedule)
         #print(f"Construction Period: {self.constructionPeriod} years")
         
         # step 2-2. Reactor Selection Output: 사실상 ElectricalCapacityPerModule 뽑는 용도
-        (ThermalCapacityPerModule, ElectricCapacityPerModule, 
-        TotalCapacity, CoreH, CoreD, RPVvolume) = RS.Core(self.config.powerDensity, self.config.activeCoreD, self.config.activeCoreH, self.config.activeCoreDpct, 
-            self.config.activeCoreHpct, self.config.TGefficiency, self.config.moduleNumber)
+        def core():
+            (ThermalCapacityPerModule, ElectricCapacityPerModule, 
+            TotalCapacity, CoreH, CoreD, RPVvolume) = RS.Core(self.config.powerDensity, self.config.activeCoreD, self.config.activeCoreH, self.config.activeCoreDpct, 
+                self.config.activeCoreHpct, self.config.TGefficiency, self.config.moduleNumber)
+            return {'ThermalCapacityPerModule': ThermalCapacityPerModule, 'ElectricCapacityPerModule': ElectricCapacityPerModule}
+        self._stage('core', core)
+        ThermalCapacityPerModule = self.ThermalCapacityPerModule
+        ElectricCapacityPerModule = self.ElectricCapacityPerModule
 
         # step 3-1. Fuel Interim Storage 계산
-        annualCost_CASK = Fuel.InterimStorage(self.config.COSTperHM, self.config.HMperASSEMBLY,self.config.BatchNumber, 
-            self.config.BatchCycleLength, self.config.ASSEMBLYperCORE, self.config.moduleNumber)
+        def interim_storage():
+            return {'annualCost_CASK': Fuel.InterimStorage(self.config.COSTperHM, self.config.HMperASSEMBLY,self.config.BatchNumber, 
+                self.config.BatchCycleLength, self.config.ASSEMBLYperCORE, self.config.moduleNumber)}
+        self._stage('interim_storage', interim_storage)
+        annualCost_CASK = self.annualCost_CASK
         # print(f"annualCost_CASK: {annualCost_CASK}")
 
         # step 3-2. eq cost 계산
-        self.df_EQcost_original = self.step_3_calculate_eq_cost(ElectricCapacityPerModule) # self.self.df_EQcost_original 생성
-        CPpivot = EQ.sum_by_CP(self.df_EQcost_original, self.df_CP_List, self.config.minMeanMAX) # CP별 합산한 값 반환
+        def eq_cost():
+            df_EQcost_scaled = self.step_3_calculate_eq_cost(ElectricCapacityPerModule) # 스케일링된 EQ Cost (원본 유지)
+            return {'df_EQcost_base': self.df_EQcost_base, 'df_EQcost_scaled': df_EQcost_scaled,
+                    'CPpivot': EQ.sum_by_CP(df_EQcost_scaled, self.df_CP_List, self.config.minMeanMAX)} # CP별 합산한 값 반환
+        self._stage('eq_cost', eq_cost)
+        CPpivot = self.CPpivot
         print(CPpivot)
         print("--------------------------------")
         print(f"ElectricCapacityPerModule: {ElectricCapacityPerModule}")
@@ -435,30 +721,89 @@ class economic_analysis():
         # output_dir = self.project_root / "output"
         # output_dir.mkdir(parents=True, exist_ok=True)
         
-        # self.df_EQcost_original.to_csv(output_dir / "df_EQcost_original.csv", index=False)
+        # df_EQcost_scaled.to_csv(output_dir / "df_EQcost_scaled.csv", index=False)
         # CPpivot.to_csv(output_dir / "CPpivot.csv", index=False)
         # exit()
 
         # 4. construction cost 계산
-        CPconst = CON.scaling(self.df_CP_List, self.df_scaling_power, self.df_country_specific,self.config.Country, self.config.moduleNumber, ElectricCapacityPerModule)
+        self._stage('construction_cost', lambda: {'CPconst': CON.scaling(self.df_CP_List, self.df_scaling_power, self.df_country_specific,self.config.Country, self.config.moduleNumber, ElectricCapacityPerModule)})
+        CPconst = self.CPconst
         # CPconst.to_csv(output_dir / "CPconst.csv", index=False)
         # exit()
 
         # 5. CAPEX 계산
-        df_CAPEX = self.step_5_calculate_capex(CPpivot, CPconst) # CAPEX 생성
+        def capex():
+            df_CAPEX = self.step_5_calculate_capex(CPpivot, CPconst) # CAPEX 생성
+            return {'df_CAPEX_schedule': self.df_CAPEX_schedule, 'df_CAPEX_escalated': df_CAPEX}
+        self._stage('capex', capex)
+        df_CAPEX = self.df_CAPEX_escalated
         #print(df_CAPEX)
         #df_CAPEX.to_csv(output_dir / "df_CAPEX.csv", index=False)
         # exit()
 
         # 6. Cash Flow Statement 계산
-        CFS = self.step_6_calculate_cash_flow(df_CAPEX, ElectricCapacityPerModule, annualCost_CASK) # CFS 생성
+        def cash_flow():
+            CFS = self.step_6_operating_rows(df_CAPEX, ElectricCapacityPerModule, annualCost_CASK) # CFS 생성 (CAPEX 행까지)
+            return {'CFS_operating': CFS, 'ratio': self.ratio}
+        self._stage('cash_flow', cash_flow)
+        # 금융 행은 캐시된 CFS_operating 의 복사본에 계산
+        self._stage('financing', lambda: {'CFS_statement': self.step_6_financing_rows(self.CFS_operating.copy())})
+        CFS = self.step_6_save(self.CFS_statement)
         # CFS.to_csv(output_dir / "CFS.csv", index=False)
         # exit()
 
         # 7. Analysis and save CFS
-        self.step_7_analysis(CFS, ThermalCapacityPerModule)
-
-        return
+        metrics = self.step_7_analysis(CFS, ThermalCapacityPerModule)
+        metrics.update({
+            "ThermalCapacityPerModule": ThermalCapacityPerModule,
+            "ElectricCapacityPerModule": ElectricCapacityPerModule,
+            "BaseMWe": base_mwe,
+            "ModifiedPowerDensity": self.config.powerDensity,
+        })
+
+        return metrics
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """
+    evaluate() 결과
+
+    - metrics: run() 의 반환값
+    - config: 계산에 쓰인 ReactorConfig (MWe 스케일링 후)
+    - analysis: 이 계산 전용 economic_analysis (CFS_statement, step_8 ~ step_12 사용 가능)
+    """
+    metrics: dict
+    config: ReactorConfig
+    analysis: economic_analysis
+
+
+def evaluate(context, config, target_mwe=None, stage_cache=None, verbose=False):
+    """
+    config 한 개에 대한 run() (부수 효과 없음)
+
+    호출마다 context 를 공유하는 새 economic_analysis 를 만들어 report=False 로 계산하므로
+    config / context / 작업 폴더를 수정하지 않고 엑셀도 쓰지 않는다.
+    같은 context 와 stage_cache 로 여러 스레드에서 동시에 호출할 수 있다.
+
+    Parameters:
+    - context: AnalysisContext
+    - config: ReactorConfig (수정하지 않음)
+    - target_mwe: MWe 스케일링 목표 (None 이면 스케일링 없음)
+    - stage_cache: STAGE_CACHE.StageCache (None 이면 모든 단계 계산)
+    - verbose: False 이면 이 스레드의 print 출력을 버림
+
+    Returns:
+    - Evaluation
+    """
+    analysis = economic_analysis(context)
+    analysis.report = False
+    analysis.stage_cache = stage_cache
+    analysis.config = config
+    analysis.target_mwe = target_mwe
+    with contextlib.nullcontext() if verbose else quiet():
+        metrics = analysis.run()
+    return Evaluation(metrics, analysis.config, analysis)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+import gc
+import itertools
+import multiprocessing
+import os
+import queue
+import weakref
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+import main_for_loop as MAIN
+from sweep_engine import SweepEngine
+import input.code.EQcost as EQ
+import input.code.Scheduling as SCHEDULING
+import input.code.Shared_Tables as SHARED
+
+# Columns of a SCHEDULE-type sheet (Scheduling.task_graph input)
+SCHEDULE_COLUMNS = ('NAME', 'PREDECESSOR', 'Sub-Class', 'Concrete Volume (CY)', 'DURATION')
+
+
+def shared_state(context):
+    """
+    Read-only state every worker needs, warmed once in the parent:
+    the AnalysisContext fields, the compiled CPM graph of every schedule sheet
+    (Scheduling._task_graph_cache) and the EQ base costs of the EQ sheets run() can use
+    (EQcost._base_cost_cache). Both caches are keyed by sheet content, so workers hit them as is.
+    """
+    sheets = dict(context.source_sheets)
+    for df in sheets.values():
+        if all(column in df.columns for column in SCHEDULE_COLUMNS):
+            SCHEDULING.task_graph(df)
+    for eq_sheet in {context.eq_sheet, MAIN.reactor_sheets('SNU')[0]}:
+        EQ.base_cost(sheets[eq_sheet], sheets['Currency'], sheets['dollarValue'])
+    return {
+        'project_root': context.project_root,
+        'config': context.config,
+        'eq_sheet': context.eq_sheet,
+        'sheets': sheets,
+        'task_graphs': dict(SCHEDULING._task_graph_cache),
+        'base_costs': dict(EQ._base_cost_cache),
+    }
+
+
+def _evaluate(engine, reactor, mwe, overrides=None):
+    return engine.evaluate(reactor, mwe, overrides=overrides)
+
+
+def _schedule_risk(engine, reactor, mwe, n_samples, seed, distribution):
+    # per-sample LCOE + per-task critical counts (the full ScheduleRisk stays in the worker)
+    risk, df_LCOE = engine.schedule_risk(reactor, mwe, n_samples, seed=seed, **distribution)
+    return df_LCOE, pd.Series(risk.schedule.critical.sum(axis=0), index=risk.schedule.graph.names)
+
+
+def _batch_run(engine, scenarios, chunk_size):
+    return list(engine.batch_run(scenarios, chunk_size))
+
+
+# Task name -> function(engine, *args) run in the worker
+TASKS = {'evaluate': _evaluate, 'schedule_risk': _schedule_risk, 'batch_run': _batch_run}
+
+
+def _worker(handle, tasks, results, cache_size, verbose, bases):
+    state, shm = SHARED.attach(handle)
+    SCHEDULING._task_graph_cache.update(state['task_graphs'])
+    EQ._base_cost_cache.update(state['base_costs'])
+    context = MAIN.AnalysisContext(state['project_root'], state['config'],
+                                   MappingProxyType(state['sheets']), state['eq_sheet'])
+    engine = SweepEngine(verbose=verbose, cache_size=cache_size, context=context, bases=bases)
+    try:
+        while True:
+            chunk = tasks.get()
+            if chunk is None:
+                break
+            generation, chunk_id, items = chunk
+            for index, (name, args) in items:
+                try:
+                    results.put(('result', generation, index, TASKS[name](engine, *args)))
+                except Exception as e:
+                    results.put(('error', generation, index, f"{type(e).__name__}: {e}"))
+            results.put(('done', generation, chunk_id, None))
+    finally:
+        # shared-memory views must be gone before the block is closed
+        SCHEDULING._task_graph_cache.clear()
+        EQ._base_cost_cache.clear()
+        del engine, context, state
+        gc.collect()
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+
+def _shutdown(processes, tasks, shm):
+    for _ in processes:
+        tasks.put(None)
+    for process in processes:
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+    shm.close()
+    shm.unlink()
+
+
+class ParallelSweep:
+    """
+    Process-pool version of SweepEngine for large sweeps and Monte Carlo batches.
+
+        with ParallelSweep(workers=8) as sweep:
+            for record in sweep.run(points):   # same records as SweepEngine.run
+                ...
+
+    The parent loads the AnalysisContext, compiles the CPM graphs and the EQ base costs once and
+    puts them in one shared-memory block (Shared_Tables); workers attach to it instead of
+    receiving pickled tables. Each worker runs its own SweepEngine (own stage cache).
+
+    Points are sent in chunks of `chunk_size`; at most `workers * 2` chunks are in flight, so
+    `points` can be a lazy iterator. Results stream back through a queue bounded by `queue_size`
+    (workers block when the consumer falls behind) and are yielded in input order.
+    `bases` is passed to every worker's SweepEngine (reactor name -> base yaml).
+    """
+
+    def __init__(self, workers=None, chunk_size=4, queue_size=256, cache_size=256, verbose=False, bases=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.window = 2 * self.workers
+        self._generation = itertools.count()
+        self.verbose = verbose
+
+        with MAIN.quiet():
+            context = MAIN.AnalysisContext.load()
+        self.shm, handle = SHARED.share(shared_state(context))
+
+        mp = multiprocessing.get_context()
+        self._tasks = mp.Queue()
+        self._results = mp.Queue(maxsize=queue_size)
+        self._processes = [mp.Process(target=_worker, args=(handle, self._tasks, self._results, cache_size, verbose, bases),
+                                      daemon=True)
+                           for _ in range(self.workers)]
+        for process in self._processes:
+            process.start()
+        self._close = weakref.finalize(self, _shutdown, self._processes, self._tasks, self.shm)
+
+    def close(self):
+        """Stops the workers and frees the shared-memory block."""
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get(self):
+        while True:
+            try:
+                return self._results.get(timeout=1.0)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self._processes):
+                    raise RuntimeError("A sweep worker exited unexpectedly")
+
+    def imap(self, tasks):
+        """
+        Runs (task name, args) pairs (TASKS) in the workers.
+
+        Yields (index, kind, value) in input order: kind "result" with the return value, or
+        "error" with the exception text.
+
+        Chunks and results carry the id of the imap call that sent them: when a generator is
+        abandoned mid-sweep, its chunks still run, and their results are dropped by the next call.
+        """
+        if not self._close.alive:
+            raise RuntimeError("ParallelSweep is closed")
+        generation = next(self._generation)
+        tasks = enumerate(tasks)
+        chunk_ids = itertools.count()
+        in_flight = 0
+        exhausted = False
+        pending = {}
+        next_index = 0
+
+        def feed():
+            nonlocal in_flight, exhausted
+            while in_flight < self.window and not exhausted:
+                items = list(itertools.islice(tasks, self.chunk_size))
+                if not items:
+                    exhausted = True
+                    return
+                self._tasks.put((generation, next(chunk_ids), items))
+                in_flight += 1
+
+        feed()
+        while in_flight:
+            kind, sender, key, value = self._get()
+            if sender != generation:
+                continue  # left over from an abandoned imap
+            if kind == 'done':
+                in_flight -= 1
+                feed()
+                continue
+            pending[key] = (kind, value)
+            while next_index in pending:
+                kind, value = pending.pop(next_index)
+                yield next_index, kind, value
+                next_index += 1
+
+    def run(self, points):
+        """
+        Yields a record per (reactor, MWe) or (reactor, MWe, overrides) point, like SweepEngine.run;
+        failed points are reported and skipped.
+        """
+        points, labels = itertools.tee(points)
+        tasks = (('evaluate', tuple(point)) for point in points)
+        for (_, kind, value), point in zip(self.imap(tasks), labels):
+            reactor, mwe = point[0], point[1]
+            print(f"Running {reactor} at {mwe} MWe...")
+            if kind == 'error':
+                print(f"Exception for {reactor} {mwe}: {value}")
+                continue
+            yield value
+
+    def batch_run(self, scenarios, batch_size=4096):
+        """
+        SweepEngine.batch_run over the workers: `scenarios` (e.g. a sweep_spec.SweepSpec) is cut lazily
+        into batches of `batch_size`, each vectorized in one worker. Records are yielded in input order.
+        """
+        scenarios = iter(scenarios)
+        batches = iter(lambda: list(itertools.islice(scenarios, batch_size)), [])
+        for _, kind, value in self.imap(('batch_run', (batch, batch_size)) for batch in batches):
+            if kind == 'error':
+                raise RuntimeError(f"Batch sweep failed: {value}")
+            yield from value
+
+    def schedule_risk(self, reactor, mwe, n_samples, chunk_samples=2000, seed=None, **distribution):
+        """
+        Monte Carlo construction-schedule risk split over the workers.
+
+        The samples are drawn in chunks of `chunk_samples` with independent streams spawned from
+        `seed` (numpy SeedSequence), so a run is reproducible for a given (seed, chunk_samples)
+        but does not reproduce SweepEngine.schedule_risk's single stream.
+
+        Returns (DataFrame of per-sample LCOE, Series criticality index sorted high to low).
+        """
+        sizes = [min(chunk_samples, n_samples - start) for start in range(0, n_samples, chunk_samples)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        tasks = (('schedule_risk', (reactor, mwe, size, child, distribution)) for size, child in zip(sizes, seeds))
+
+        frames, critical = [], None
+        for _, kind, value in self.imap(tasks):
+            if kind == 'error':
+                raise RuntimeError(f"Schedule risk failed for {reactor} {mwe}: {value}")
+            df_LCOE, counts = value
+            frames.append(df_LCOE)
+            critical = counts if critical is None else critical + counts
+        criticality = (critical / n_samples).rename('Criticality Index')
+        return pd.concat(frames, ignore_index=True), criticality.sort_values(ascending=False, kind='stable')
@@ -1,102 +1,40 @@
 
-import subprocess
 import pandas as pd
-import sys
 import os
+import argparse
+from pathlib import Path
+
+from sweep_engine import SweepEngine
+from parallel_sweep import ParallelSweep
+from sweep_spec import SweepSpec
+
+_engine = None
+_workers = 1  # > 1: points run in a ParallelSweep process pool (--workers)
+DEFAULT_SPEC = Path(__file__).resolve().parent / "input" / "data" / "sweep.yaml"
+
+
+def get_engine(bases=None):
+    """
+    Returns the process-wide SweepEngine, or ParallelSweep when _workers > 1 (SOURCE_DATA.xlsx is loaded on first use).
+    `bases` (reactor name -> base yaml) is applied when the engine is created.
+    """
+    global _engine
+    if _engine is None:
+        _engine = ParallelSweep(workers=_workers, bases=bases) if _workers > 1 else SweepEngine(bases=bases)
+    return _engine
+
 
 def run_single_simulation(reactor, mwe):
-    """Runs a single simulation and returns the parsed result dict."""
-    print(f"Running {reactor} at {mwe} MWe...")
-    try:
-        # Run main_for_loop.py with arguments
-        cmd = [sys.executable, "main_for_loop.py", "--reactor", reactor, "--target_mwe", str(mwe)]
-        
-        # Capture output
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"Error running {reactor} {mwe}: {result.stderr}")
-            return None
-        
-        output = result.stdout
-        
-        # Parse output
-        # Capture key-value pairs from the entire output
-        # We expect lines like "Key: Value"
-        parsed_data = {}
-        
-        lines = output.splitlines()
-        
-        # We want to capture specific keys from the config dump at the start
-        # and the result metrics at the end.
-        
-        # List of config keys we want to ensure we capture if present
-        config_keys = ["powerDensity", "capacityFactor", "plantLifetime", "BatchNumber", "BatchCycleLength", "totalFuelQty", "U3O8Price", "EnrichmentPrice", "FabricationPrice", "ConversionPrice"]
-        
-        # List of result keys we definitely want
-        result_keys = [
-            "LCOE_TOTAL", "LCOE_CON", "LCOE_OM", "LCOE_FUEL", "LCOE_FUEL_IS",
-            "LCOE_U3O8", "LCOE_Conversion", "LCOE_Enrichment", "LCOE_Fabrication",
-            "Average EFPD", "Average Discharged_BU", "ThermalCapacityPerModule",
-            "ElectricCapacityPerModule", "BaseMWe", "ModifiedPowerDensity"
-        ]
-
-        for line in lines:
-            line = line.strip()
-            if ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    key = parts[0].strip()
-                    val_str = parts[1].strip().split()[0] # Take first token (remove units like [days])
-                    
-                    try:
-                        val = float(val_str)
-                        parsed_data[key] = val
-                    except ValueError:
-                        # Keep string values for some config items if needed, mostly we care about numbers
-                        parsed_data[key] = val_str
-
-        # Check if we successfully parsed LCOE_TOTAL (indicator of success)
-        if "LCOE_TOTAL" in parsed_data:
-            row = {
-                "Reactor": reactor,
-                "MWe": mwe,
-            }
-            
-            # Add strictly defined result keys
-            for k in result_keys:
-                if k in parsed_data:
-                    row[k] = parsed_data[k]
-                else:
-                    row[k] = None
-                    
-            # Add interesting config keys
-            for k in config_keys:
-                 if k in parsed_data:
-                    row[k] = parsed_data[k]
-
-            return row
-        else:
-            print(f"Could not parse LCOE output for {reactor} {mwe}")
-            return None
-
-    except Exception as e:
-        print(f"Exception for {reactor} {mwe}: {e}")
-        return None
-
-def run_sweep():
-    reactors = ["APR1400", "AP1000", "NuScale", "SMART", "SNU"]
-    mwe_targets = list(range(100, 1100, 100))
-    
-    results = []
+    """Runs a single simulation in-process and returns the result dict."""
+    results = list(get_engine().run([(reactor, mwe)]))
+    return results[0] if results else None
 
-    print("Starting Sweep...")
-    
-    for reactor in reactors:
-        for mwe in mwe_targets:
-            res = run_single_simulation(reactor, mwe)
-            if res:
-                results.append(res)
+def run_sweep(spec_file=DEFAULT_SPEC):
+    """Runs the sweep described by a SweepSpec YAML (default: 5 reactors x 100..1000 MWe)."""
+    spec = SweepSpec.load(spec_file)
+    print(f"Starting Sweep... ({len(spec)} points from {spec_file})")
+
+    results = list(get_engine(spec.bases).run(spec))
     
     # Process results into tables
     if not results:
@@ -104,6 +42,7 @@ def run_sweep():
         return
 
     df_results = pd.DataFrame(results)
+    reactors = list(df_results['Reactor'].unique())
     
     # Define output directory
     output_dir = "output/lcoe_power"
@@ -112,6 +51,11 @@ def run_sweep():
     # Save raw results first (contains everything including defaults)
     df_results.to_csv(os.path.join(output_dir, "sweep_results_raw.csv"), index=False)
 
+    # Reactor x MWe tables need one point per cell; specs with more axes only get the raw file
+    if df_results.duplicated(['Reactor', 'MWe']).any():
+        print(f"\nSweep has axes beyond Reactor x MWe: see sweep_results_raw.csv in {output_dir}.")
+        return
+
     # 1. Total LCOE Table with MWth rows (Formatted)
     mwe_cols = sorted(list(set(df_results['MWe'])))
     
@@ -184,12 +128,7 @@ def run_base_cases():
         "SNU": 100
     }
     
-    results = []
-    
-    for reactor, mwe in base_cases.items():
-        res = run_single_simulation(reactor, mwe)
-        if res:
-            results.append(res)
+    results = list(get_engine().run(base_cases.items()))
             
     if not results:
         print("No base case results collected.")
@@ -209,5 +148,15 @@ def run_base_cases():
 
 
 if __name__ == "__main__":
-    run_sweep()
-    run_base_cases()
+    parser = argparse.ArgumentParser(description='LCOE sweep over reactors and MWe targets')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (1 = in-process)')
+    parser.add_argument('--spec', default=DEFAULT_SPEC, help='Sweep spec YAML (sweep_spec.SweepSpec)')
+    args = parser.parse_args()
+    _workers = args.workers
+
+    try:
+        run_sweep(args.spec)
+        run_base_cases()
+    finally:
+        if isinstance(_engine, ParallelSweep):
+            _engine.close()
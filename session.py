@@ -0,0 +1,88 @@
+import dataclasses
+import time
+
+import input.code.Analysis as ANALYSIS
+import input.code.Cash_Flow_Statement as CF
+from sweep_engine import SweepEngine
+
+
+class Session:
+    """
+    Interactive what-if session for one (reactor, MWe) point.
+
+        session = Session("APR1400", 1400)
+        session.set(interestRate=0.06)   # -> metrics of the edited point
+        session.reused                   # stages taken from the cache by the last call
+
+    Every edit re-runs economic_analysis.run() through the stage cache (main_for_loop.RUN_STAGES),
+    so only the stages that read an edited field, and the stages after them, are recomputed.
+    Financial edits (debtToEquityRatio, interestRate, loanTenor, taxRate) reuse the operating
+    CFS rows and recompute only the financing rows. No Excel files are written.
+    """
+
+    def __init__(self, reactor="APR1400", mwe=None, verbose=False, cache_size=64, cache_dir=None, **overrides):
+        self.engine = SweepEngine(verbose=verbose, cache_size=cache_size, cache_dir=cache_dir)
+        self.reactor = reactor
+        self.mwe = mwe
+        self.overrides = {}
+        self.metrics = None
+        self.stages = {}
+        self.elapsed = None
+        self.set(**overrides)
+
+    @property
+    def analysis(self):
+        """economic_analysis holding the current point (step_8 ... step_12 can be called on it)"""
+        return self.engine.analysis
+
+    @property
+    def config(self):
+        """ReactorConfig of the current point (powerDensity after the MWe scaling)"""
+        return self.engine.analysis.config
+
+    @property
+    def reused(self):
+        """Stages taken from the cache by the last set()/reset()"""
+        return [name for name, reused in self.stages.items() if reused]
+
+    @property
+    def recomputed(self):
+        """Stages computed by the last set()/reset()"""
+        return [name for name, reused in self.stages.items() if not reused]
+
+    def set(self, **changes):
+        """
+        Overrides ReactorConfig fields (kept for later calls) and returns the new metrics.
+        If the edited point fails, the exception is raised and the session keeps its previous state.
+        """
+        fields = {f.name for f in dataclasses.fields(self.engine._config_for(self.reactor))}
+        unknown = set(changes) - fields
+        if unknown:
+            raise KeyError(f"Unknown ReactorConfig field: {sorted(unknown)}")
+        return self._evaluate({**self.overrides, **changes})
+
+    def reset(self, *names):
+        """Drops the overrides of `names` (all overrides if none given) and returns the new metrics."""
+        dropped = set(names or self.overrides)
+        return self._evaluate({name: value for name, value in self.overrides.items() if name not in dropped})
+
+    def _evaluate(self, overrides):
+        # overrides / metrics are replaced only once the candidate point has been evaluated
+        start = time.perf_counter()
+        try:
+            record = self.engine.evaluate(self.reactor, self.mwe, overrides=overrides)
+            statement = self.analysis.CFS_statement
+            record["NPV"] = float(ANALYSIS.NPV_BATCH(CF.stack_statements([statement]), self.config.discountRate)[0])
+            with self.engine._quiet():
+                record["IRR"] = ANALYSIS.IRR(statement)
+        except Exception:
+            if self.metrics is not None:
+                # put the engine back on the current point (stage cache hits) so analysis / config match it
+                self.engine.evaluate(self.reactor, self.mwe, overrides=self.overrides)
+            raise
+        self.elapsed = time.perf_counter() - start
+
+        self.overrides = overrides
+        self.metrics = record
+        self.stages = dict(self.analysis.stage_log)
+        return record
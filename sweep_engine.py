@@ -0,0 +1,387 @@
+import contextlib
+import dataclasses
+import itertools
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import main_for_loop as MAIN
+import input.code.Analysis as ANALYSIS
+import input.code.Cash_Flow_Statement as CF
+import input.code.Fuel_Cost_Input as Fuel
+import input.code.Escalation as ESCALATION
+import input.code.Stage_Cache as STAGE_CACHE
+import input.code.Sensitivity as SENSITIVITY
+
+
+# Result metrics returned by economic_analysis.run() (same names as the printed labels)
+RESULT_KEYS = [
+    "LCOE_TOTAL", "LCOE_CON", "LCOE_OM", "LCOE_FUEL", "LCOE_FUEL_IS",
+    "LCOE_U3O8", "LCOE_Conversion", "LCOE_Enrichment", "LCOE_Fabrication",
+    "Average EFPD", "Average Discharged_BU", "ThermalCapacityPerModule",
+    "ElectricCapacityPerModule", "BaseMWe", "ModifiedPowerDensity"
+]
+
+# Scenario keys handled by Analysis.LinearLCOE (everything else in a scenario is a ReactorConfig override)
+MULTIPLIER_KEYS = ("cp_multiplier", "item_multiplier")
+
+# Overrides that leave the schedule, capacity and financing unchanged: LCOE is a dot product
+LINEAR_FIELDS = ANALYSIS.REVENUE_LINEAR_INPUTS + ANALYSIS.FUEL_COST_INPUTS
+
+# Valid range (low, high) searched by break_even; other fields are >= 0 when their base value is
+BREAK_EVEN_BOUNDS = {
+    # fractions
+    "capacityFactor": (0.0, 1.0),
+    "salesToRevenueRatio": (0.0, 1.0),
+    "debtToEquityRatio": (0.0, 1.0),
+    "taxRate": (0.0, 1.0),
+    # rates and divisors (> 0)
+    "Rate_BASEMAT": (1.0, np.inf),      # [CY/month]
+    "Rate_INCV": (1.0, np.inf),
+    "Rate_CNT": (1.0, np.inf),
+    "BatchCycleLength": (1.0, np.inf),  # [months]
+    "BatchNumber": (1.0, np.inf),
+    "powerDensity": (1e-3, np.inf),     # [W/cc]
+    # periods [years]
+    "plantLifetime": (1.0, 100.0),
+    "loanTenor": (1.0, 100.0),
+    "depreciationPeriod": (1.0, 100.0),
+}
+
+# Config values copied into every record (values before the MWe scaling is applied)
+CONFIG_KEYS = [
+    "powerDensity", "capacityFactor", "plantLifetime", "BatchNumber", "BatchCycleLength",
+    "totalFuelQty", "U3O8Price", "EnrichmentPrice", "FabricationPrice", "ConversionPrice"
+]
+
+
+class SweepEngine:
+    """
+    In-process replacement for `python main_for_loop.py --reactor R --target_mwe M`.
+
+    One main_for_loop.AnalysisContext is loaded per engine (input.yaml and SOURCE_DATA.xlsx
+    are read once) and every (reactor, MWe) point is a main_for_loop.evaluate() call on it:
+    no Excel reports, no console output, and no shared state between points.
+    `self.analysis` is the economic_analysis of the last evaluated point.
+
+    Pipeline stages are memoized (main_for_loop.RUN_STAGES): a point that only changes
+    downstream inputs (e.g. taxRate) reuses the cached schedule, cost tables and CAPEX.
+    `cache_size` bounds the in-memory LRU (0 disables the cache); `cache_dir` adds an
+    on-disk tier shared across processes. `context` reuses an already loaded
+    main_for_loop.AnalysisContext (e.g. one attached from shared memory by parallel_sweep).
+    `bases` maps reactor names to base yaml files (default input/data/<reactor>.yaml).
+    """
+
+    def __init__(self, verbose=False, cache_size=256, cache_dir=None, context=None, bases=None):
+        self.verbose = verbose
+        self.bases = dict(bases or {})
+        if context is None:
+            with self._quiet():
+                context = MAIN.AnalysisContext.load()
+        self.context = context
+        self.stage_cache = STAGE_CACHE.StageCache(maxsize=cache_size, directory=cache_dir) if cache_size else None
+        self.analysis = MAIN.economic_analysis(self.context)
+        self.analysis.report = False
+        self.project_root = self.context.project_root
+
+        # reactor yaml -> ReactorConfig (parsed once per reactor)
+        self._configs = {}
+
+    def _quiet(self):
+        if self.verbose:
+            return contextlib.nullcontext()
+        return MAIN.quiet()
+
+    def _config_for(self, reactor):
+        if reactor not in self._configs:
+            reactor_yaml = Path(self.bases.get(reactor, self.project_root / "input" / "data" / f"{reactor}.yaml"))
+            if reactor_yaml.exists():
+                with self._quiet():
+                    config = MAIN.read_config(reactor_yaml, self.project_root)
+            else:
+                print(f"Warning: Specific yaml for {reactor} not found. Using default input.yaml but overriding reactorType name.")
+                config = dataclasses.replace(self.context.config, reactorType=reactor)
+            self._configs[reactor] = config
+        # evaluate() never modifies its config, so the parsed config is shared
+        return self._configs[reactor]
+
+    def evaluate(self, reactor, mwe, overrides=None):
+        """
+        Evaluates one (reactor, MWe) point and returns a flat metric record.
+
+        `overrides` replaces ReactorConfig fields for this point only (e.g. {"U3O8Price": 120}).
+        """
+        config = self._config_for(reactor)
+        if overrides:
+            config = dataclasses.replace(config, **overrides)
+        record = {"Reactor": reactor, "MWe": mwe}
+
+        config_values = {k: getattr(config, k) for k in CONFIG_KEYS}
+
+        result = MAIN.evaluate(self.context, config, mwe, self.stage_cache, verbose=self.verbose)
+        self.analysis = result.analysis
+        metrics = result.metrics
+
+        for k in RESULT_KEYS:
+            record[k] = metrics.get(k)
+        for k, v in config_values.items():
+            record[k] = float(v) if isinstance(v, (int, float)) else v
+        for k, v in (overrides or {}).items():
+            record.setdefault(k, v)
+        return record
+
+    def schedule_risk(self, reactor, mwe, n_samples, **distribution):
+        """
+        Monte Carlo construction-schedule risk for one (reactor, MWe) point.
+
+        `distribution` is passed to economic_analysis.step_8_schedule_risk
+        (Rate_BASEMAT/Rate_INCV/Rate_CNT as (min, mode, max), method, low, high, seed).
+        Returns (Schedule_Risk.ScheduleRisk, DataFrame of per-sample LCOE).
+        """
+        self.evaluate(reactor, mwe)
+        with self._quiet():
+            return self.analysis.step_8_schedule_risk(n_samples, **distribution)
+
+    def sensitivities(self, reactor, mwe, fields=None, rel_step=1e-6):
+        """
+        dLCOE/dθ and dNPV/dθ for every numeric ReactorConfig field at one (reactor, MWe) point.
+
+        One full evaluation, then all perturbed inputs in a single batched pass
+        (economic_analysis.step_10_sensitivities). powerDensity is the value after the MWe scaling.
+        Returns (base metrics dict, DataFrame indexed by field).
+        """
+        self.evaluate(reactor, mwe)
+        with self._quiet():
+            return self.analysis.step_10_sensitivities(fields=fields, rel_step=rel_step)
+
+    def fast_lcoe(self, reactor, mwe, scenarios):
+        """
+        LCOE for many scenarios around one (reactor, MWe) point.
+
+        Each scenario is a dict with optional "cp_multiplier" ({CP: factor}), "item_multiplier"
+        ({"CON"/"OM"/"FUEL"/"FUEL_IS": factor}) and ReactorConfig overrides. Scenarios whose overrides
+        are all in LINEAR_FIELDS (price, sales ratio, capacity factor, front-end fuel inputs) are dot
+        products with the base point's Analysis.LinearLCOE. Any other override (construction period,
+        lifetime, capacity, escalation, financing, ...) changes timing or weights, so that scenario
+        falls back to a full evaluation and its own LinearLCOE.
+
+        Returns a DataFrame (one row per scenario) with LCOE_TOTAL, LCOE_CON, LCOE_OM, LCOE_FUEL
+        (front-end + interim storage, as in evaluate), LCOE_FUEL_IS and Path ("linear" / "full").
+        """
+        self.evaluate(reactor, mwe)
+        config = self.analysis.config
+        model = self.analysis.step_11_linear_lcoe()
+        fuel_args = lambda c: [getattr(c, k) for k in ("Feed", "Product", "Tail", "totalFuelQty", "U3O8Price",
+                                                       "EnrichmentPrice", "FabricationPrice", "ConversionPrice",
+                                                       "moduleNumber", "BatchNumber", "BatchCycleLength",
+                                                       "CoreDesignFactor")]
+        base_fuel_cost = Fuel.FrontEnd_BATCH(*fuel_args(config))[0]
+
+        records = []
+        for scenario in scenarios:
+            overrides = {k: v for k, v in scenario.items() if k not in MULTIPLIER_KEYS}
+            item_multiplier = dict(scenario.get("item_multiplier") or {})
+            if set(overrides) <= set(LINEAR_FIELDS):
+                path, point_model, energy_scale = "linear", model, 1.0
+                if overrides:
+                    point = dataclasses.replace(config, **overrides)
+                    energy_scale = point.capacityFactor / config.capacityFactor
+                    fuel_scale = Fuel.FrontEnd_BATCH(*fuel_args(point))[0] / base_fuel_cost
+                    item_multiplier["FUEL"] = item_multiplier.get("FUEL", 1.0) * fuel_scale
+            else:
+                path, energy_scale = "full", 1.0
+                self.evaluate(reactor, mwe, overrides=overrides)
+                point_model = self.analysis.step_11_linear_lcoe()
+            LCOE_CON, LCOE_OM, LCOE_FUEL, LCOE_FUEL_IS, LCOE_TOTAL = point_model.lcoe(
+                scenario.get("cp_multiplier"), item_multiplier, energy_scale)
+            records.append({"LCOE_TOTAL": LCOE_TOTAL[0], "LCOE_CON": LCOE_CON[0], "LCOE_OM": LCOE_OM[0],
+                            "LCOE_FUEL": LCOE_FUEL[0] + LCOE_FUEL_IS[0], "LCOE_FUEL_IS": LCOE_FUEL_IS[0],
+                            "Path": path})
+        return pd.DataFrame(records)
+
+    def cp_attribution(self, points):
+        """
+        Per-CP split of LCOE_CON for every (reactor, MWe) point of a sweep.
+
+        Each point is evaluated once. All points are then attributed in a single batched
+        matrix product (Analysis.CP_ATTRIBUTION_BATCH).
+        Returns a long DataFrame: Reactor, MWe, CP, Description, one column per
+        Analysis.CP_ATTRIBUTION_COLUMNS and LCOE_CON (the per-CP total).
+        """
+        points = list(points)
+        statements, components, configs, periods = [], [], [], []
+        for reactor, mwe in points:
+            self.evaluate(reactor, mwe)
+            analysis, config = self.analysis, self.analysis.config
+            statements.append(analysis.CFS_statement)
+            components.append(ESCALATION.CAPEX_COMPONENTS(
+                analysis.df_CAPEX_schedule, analysis.preconstructionPeriod, analysis.constructionPeriod,
+                config.plantLifetime, config.escalationNSSS, config.escalationTG, config.escalationBOP,
+                config.escalationLabor))
+            configs.append(config)
+            periods.append(analysis.constructionPeriod)
+        value = lambda name: np.array([getattr(c, name) for c in configs], dtype=float)
+        attribution = ANALYSIS.CP_ATTRIBUTION_BATCH(statements, components, np.array(periods), value("discountRate"),
+                                                    value("electricityPrice"), value("salesToRevenueRatio"),
+                                                    value("debtToEquityRatio"), value("interestRate"),
+                                                    value("loanTenor"))
+
+        cp_list = self.analysis.df_CP_List
+        n_cp = len(cp_list)
+        df = pd.DataFrame({
+            "Reactor": np.repeat([reactor for reactor, _ in points], n_cp),
+            "MWe": np.repeat([mwe for _, mwe in points], n_cp),
+            "CP": np.tile(cp_list.iloc[:, 0].to_numpy(), len(points)),
+            "Description": np.tile(cp_list.iloc[:, 1].to_numpy(), len(points)),
+        })
+        for k, column in enumerate(ANALYSIS.CP_ATTRIBUTION_COLUMNS):
+            df[column] = attribution[:, :, k].ravel()
+        df["LCOE_CON"] = attribution.sum(axis=2).ravel()
+        return df
+
+    def break_even(self, points, input_name="electricityPrice", discountRate=None, target_irr=None,
+                   bracket=None, tol=1e-10, max_iter=100):
+        """
+        Value of `input_name` that gives NPV(discountRate) = 0 or IRR = target_irr, per (reactor, MWe) point.
+
+        Inputs proportional to REVENUE (Analysis.REVENUE_LINEAR_INPUTS) reuse each point's cash flow
+        statement and are solved exactly in one batched call. Any other numeric ReactorConfig field is
+        solved by bracketed regula falsi over full evaluations (`bracket` = (low, high), default
+        base value x (0.5, 2) widened until the NPV changes sign). The default bracket never leaves the
+        field's valid range (BREAK_EVEN_BOUNDS, else >= 0 for a non-negative base value); a value the
+        pipeline cannot evaluate counts as out of range. Linear results outside the range are NaN too.
+
+        discountRate defaults to each reactor's config.discountRate. Returns an array (NaN = no solution
+        in the valid range, or no convergence within max_iter), like Analysis.BREAK_EVEN_SCALE.
+        """
+        if discountRate is not None and target_irr is not None:
+            raise ValueError("Give at most one of discountRate or target_irr")
+        points = list(points)
+        configs = [self._config_for(reactor) for reactor, _ in points]
+        if target_irr is None:
+            rates = np.array([c.discountRate if discountRate is None else discountRate for c in configs], dtype=float)
+        else:
+            rates = np.full(len(points), float(target_irr))
+
+        if input_name in ANALYSIS.REVENUE_LINEAR_INPUTS:
+            statements = []
+            for reactor, mwe in points:
+                self.evaluate(reactor, mwe)
+                statements.append(self.analysis.CFS_statement)
+            values = np.array([getattr(c, input_name) for c in configs], dtype=float)
+            taxes = np.array([c.taxRate for c in configs], dtype=float)
+            batch = CF.stack_statements(statements)
+            result = values * ANALYSIS.BREAK_EVEN_SCALE(batch, rates, taxes)
+            low, high = BREAK_EVEN_BOUNDS.get(input_name, (0.0, np.inf))
+            return np.where((result >= low) & (result <= high), result, np.nan)
+
+        return np.array([self._break_even_by_runs(reactor, mwe, input_name, rate, getattr(config, input_name),
+                                                  bracket, tol, max_iter)
+                         for (reactor, mwe), config, rate in zip(points, configs, rates)])
+
+    def _npv_with(self, reactor, mwe, input_name, value, rate):
+        self.evaluate(reactor, mwe, overrides={input_name: value})
+        cash_flow = self.analysis.CFS_statement["CASH FLOW"][None, :]
+        return float(ANALYSIS._npv_at(cash_flow, np.array([rate]))[0])
+
+    def _break_even_by_runs(self, reactor, mwe, input_name, rate, base_value, bracket, tol, max_iter):
+        def f(x):
+            try:
+                return self._npv_with(reactor, mwe, input_name, x, rate)
+            except Exception:
+                return np.nan  # 평가할 수 없는 값 = 유효 범위 밖
+
+        invalid = lambda fa, fb: np.isnan(fa) or np.isnan(fb) or np.sign(fa) == np.sign(fb)
+        if bracket is None:
+            low, high = BREAK_EVEN_BOUNDS.get(input_name, (0.0 if base_value >= 0 else -np.inf, np.inf))
+            clip = lambda x: min(max(x, low), high)
+            a, b = (0.5 * base_value, 2.0 * base_value) if base_value != 0 else (-1.0, 1.0)
+            a, b = clip(a), clip(b)
+        else:
+            a, b = bracket
+        fa, fb = f(a), f(b)
+        for _ in range(20):  # bracket 가 부호를 바꾸지 않으면 유효 범위 안에서 넓힘
+            if not invalid(fa, fb) or np.isnan(fa) or np.isnan(fb) or bracket is not None:
+                break
+            wider = clip(a - (b - a)), clip(b + (b - a))
+            if wider == (a, b):
+                break
+            a, b = wider
+            fa, fb = f(a), f(b)
+        if invalid(fa, fb):
+            return np.nan
+
+        # Illinois regula falsi
+        side = 0
+        for _ in range(max_iter):
+            x = b - fb * (b - a) / (fb - fa)
+            fx = f(x)
+            if np.isnan(fx):
+                return np.nan
+            if fx == 0 or abs(b - a) <= tol * (1 + abs(x)):
+                return x
+            if np.sign(fx) == np.sign(fb):
+                b, fb = x, fx
+                if side == -1:
+                    fa *= 0.5
+                side = -1
+            else:
+                a, fa = x, fx
+                if side == 1:
+                    fb *= 0.5
+                side = 1
+        return np.nan  # max_iter 안에 수렴하지 않음
+
+    def run(self, points):
+        """
+        Yields a record per (reactor, MWe) or (reactor, MWe, overrides) point (e.g. sweep_spec.SweepSpec);
+        failed points are reported and skipped.
+        """
+        for reactor, mwe, *overrides in points:
+            print(f"Running {reactor} at {mwe} MWe...")
+            try:
+                yield self.evaluate(reactor, mwe, *overrides)
+            except Exception as e:
+                print(f"Exception for {reactor} {mwe}: {e}")
+
+    def batch_run(self, scenarios, chunk_size=4096):
+        """
+        Yields a metric record per (reactor, MWe, overrides) scenario, vectorized with Sensitivity.pipeline_batch.
+
+        Consecutive scenarios with the same reactor, MWe and non-numeric overrides (Country, minMeanMAX, ...)
+        share one full evaluation; their numeric overrides run as one batch of up to `chunk_size`
+        scenarios, so a lazy scenario stream stays lazy. Records hold Reactor, MWe, the overrides and
+        Sensitivity.SENSITIVITY_METRICS (LCOE_FUEL = front-end + interim storage, as in evaluate).
+        Values agree with evaluate() to floating-point rounding.
+        """
+        is_number = lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)
+
+        def group_key(scenario):
+            reactor, mwe, overrides = scenario
+            return reactor, mwe, tuple(sorted((k, v) for k, v in overrides.items() if not is_number(v)))
+
+        for (reactor, mwe, fixed), group in itertools.groupby(scenarios, key=group_key):
+            self.evaluate(reactor, mwe, overrides=dict(fixed))
+            config = self.analysis.config
+            # run() scales powerDensity by MWe after the overrides are applied
+            scale = 1.0 if mwe is None else mwe / MAIN.BASE_MWE.get(config.reactorType, 1400)
+
+            def value(overrides, field):
+                if field not in overrides:
+                    return getattr(config, field)  # base point (powerDensity already scaled)
+                return overrides[field] * scale if field == "powerDensity" else overrides[field]
+
+            while True:
+                chunk = list(itertools.islice(group, chunk_size))
+                if not chunk:
+                    break
+                fields = {k for _, _, overrides in chunk for k, v in overrides.items() if is_number(v)}
+                inputs = {field: np.array([value(overrides, field) for _, _, overrides in chunk], dtype=float)
+                          for field in fields}
+                with self._quiet():
+                    results = SENSITIVITY.pipeline_batch(self.analysis, inputs, len(chunk))
+                for i, (_, _, overrides) in enumerate(chunk):
+                    record = {"Reactor": reactor, "MWe": mwe, **overrides}
+                    record.update({metric: float(results[metric][i]) for metric in SENSITIVITY.SENSITIVITY_METRICS})
+                    yield record
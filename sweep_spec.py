@@ -0,0 +1,195 @@
+import dataclasses
+import math
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import yaml
+
+from main_for_loop import ReactorConfig
+
+# Axis names that select the point instead of overriding a ReactorConfig field
+POINT_KEYS = ("reactor", "MWe")
+
+
+class Scenario(NamedTuple):
+    """One sweep point: unpacks as (reactor, mwe, overrides) for SweepEngine.run / ParallelSweep.run."""
+    reactor: str
+    mwe: float
+    overrides: dict
+
+
+class _Values:
+    """One field over a list of values."""
+
+    def __init__(self, field, values):
+        self.field = field
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        for value in self.values:
+            yield {self.field: value}
+
+
+class _Zip:
+    """Several fields stepped together (all value lists have the same length)."""
+
+    def __init__(self, axes):
+        lengths = {axis.field: len(axis) for axis in axes}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"zip axes must have the same length: {lengths}")
+        self.axes = axes
+
+    def __len__(self):
+        return len(self.axes[0]) if self.axes else 1
+
+    def __iter__(self):
+        if not self.axes:
+            yield {}
+            return
+        for values in zip(*(axis.values for axis in self.axes)):
+            yield {axis.field: value for axis, value in zip(self.axes, values)}
+
+
+class _Product:
+    """Cartesian product, first axis slowest. Re-iterates inner axes so nothing is materialized."""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def __len__(self):
+        return math.prod(len(node) for node in self.nodes)
+
+    def __iter__(self):
+        return self._expand(0)
+
+    def _expand(self, i):
+        if i == len(self.nodes):
+            yield {}
+            return
+        for head in self.nodes[i]:
+            for tail in self._expand(i + 1):
+                yield {**head, **tail}
+
+
+class _Range:
+    """Lazy numeric range (stop exclusive, like range(); ints stay ints)."""
+
+    def __init__(self, start, stop, step=1):
+        if step == 0:
+            raise ValueError("range step must not be 0")
+        self.start, self.step = start, step
+        self.n = max(0, math.ceil((stop - start) / step))
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return (self.start + i * self.step for i in range(self.n))
+
+
+def _values(field, spec):
+    """
+    Axis values: a list, {range: [start, stop, step]}, {linspace: [start, stop, num]},
+    {values: [...]} or a single scalar.
+    """
+    if isinstance(spec, dict):
+        if set(spec) == {"range"}:
+            return _Range(*spec["range"])
+        if set(spec) == {"linspace"}:
+            start, stop, num = spec["linspace"]
+            return np.linspace(start, stop, int(num)).tolist()
+        if set(spec) == {"values"}:
+            return list(spec["values"])
+        raise ValueError(f"Unknown axis specification for {field}: {spec}")
+    if isinstance(spec, (list, tuple)):
+        return list(spec)
+    return [spec]
+
+
+def _parse(spec, fields):
+    """Mapping -> product of its entries; `zip` and `product` entries nest."""
+    if not isinstance(spec, dict):
+        raise ValueError(f"Sweep block must be a mapping: {spec}")
+    nodes = []
+    for key, value in spec.items():
+        if key == "product":
+            nodes.append(_Product([_parse(block, fields) for block in value]))
+        elif key == "zip":
+            nodes.append(_Zip([_axis(field, values, fields) for field, values in value.items()]))
+        else:
+            nodes.append(_axis(key, value, fields))
+    return _Product(nodes)
+
+
+def _axis(field, spec, fields):
+    if field not in fields:
+        raise KeyError(f"Unknown sweep field: {field} (ReactorConfig field, 'reactor' or 'MWe')")
+    return _Values(field, _values(field, spec))
+
+
+@dataclasses.dataclass(frozen=True)
+class SweepSpec:
+    """
+    Declarative sweep over reactors, MWe targets and any ReactorConfig field.
+
+        bases:                      # optional: reactor name -> base yaml (default input/data/<reactor>.yaml)
+          APR1400_low: bases/APR1400_low.yaml
+        base:                       # optional: overrides applied to every scenario
+          discountRate: 0.07
+        sweep:                      # mapping = cartesian product (first entry slowest)
+          reactor: [APR1400, NuScale]
+          MWe: {range: [100, 1100, 100]}
+          zip:                      # fields stepped together
+            U3O8Price: [100, 150, 200]
+            EnrichmentPrice: [120, 140, 160]
+          product:                  # nested blocks (e.g. several zip groups)
+            - {taxRate: [0.2, 0.24]}
+            - zip: {interestRate: [0.04, 0.06], loanTenor: [15, 20]}
+
+    Axis values: list, scalar, {range: [start, stop, step]}, {linspace: [start, stop, num]}.
+    Iterating yields Scenario(reactor, mwe, overrides) lazily, so grids of millions of points
+    never exist in memory; len() is computed without expanding.
+    """
+    root: object
+    base: dict
+    bases: dict
+
+    @classmethod
+    def from_dict(cls, data, directory=None):
+        fields = {f.name for f in dataclasses.fields(ReactorConfig)} | set(POINT_KEYS)
+        unknown = set(data) - {"sweep", "base", "bases"}
+        if unknown:
+            raise KeyError(f"Unknown sweep spec keys: {sorted(unknown)}")
+        root = _parse(data.get("sweep") or {}, fields)
+        base = dict(data.get("base") or {})
+        for field in base:
+            if field not in fields:
+                raise KeyError(f"Unknown sweep field: {field}")
+        directory = Path(directory) if directory is not None else Path.cwd()
+        bases = {name: directory / path for name, path in (data.get("bases") or {}).items()}
+        spec = cls(root, base, bases)
+        next(iter(spec), None)  # surfaces a missing reactor now instead of mid-sweep
+        return spec
+
+    @classmethod
+    def load(cls, spec_file):
+        """Reads a sweep spec YAML (paths in `bases` are relative to the spec file)."""
+        spec_file = Path(spec_file)
+        with open(spec_file, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        return cls.from_dict(data, spec_file.parent)
+
+    def __len__(self):
+        return len(self.root)
+
+    def __iter__(self):
+        for assignment in self.root:
+            values = {**self.base, **assignment}
+            reactor = values.pop("reactor", None)
+            if reactor is None:
+                raise ValueError("Sweep spec must give a reactor (sweep axis or base)")
+            yield Scenario(reactor, values.pop("MWe", None), values)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from sweep_engine import SweepEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return SweepEngine()
+
+
+@pytest.mark.parametrize("input_name", ["Rate_CNT", "BatchCycleLength", "plantLifetime"])
+def test_invalid_values_give_nan(engine, input_name):
+    # widening used to evaluate values the pipeline cannot run (rate 0, cycle length 0, lifetime overflow)
+    result = engine.break_even([("APR1400", 1000)], input_name)
+    assert result.shape == (1,)
+    assert np.isnan(result[0])
+
+
+def test_root_inside_bounds(engine):
+    result = engine.break_even([("APR1400", 1000)], "BatchCycleLength", discountRate=0.005)
+    assert 1.0 <= result[0]
+    assert np.isfinite(result[0])
+
+
+@pytest.mark.parametrize("input_name", ["capacityFactor", "salesToRevenueRatio"])
+def test_linear_fractions_stay_in_range(engine, input_name):
+    result = engine.break_even([("APR1400", 1000), ("APR1400", 1400), ("NuScale", 300)], input_name)
+    finite = result[np.isfinite(result)]
+    assert ((finite >= 0.0) & (finite <= 1.0)).all()
+
+
+def test_linear_out_of_range_gives_nan(engine):
+    # the closed-form break-even capacity factor here is 1.698
+    assert np.isnan(engine.break_even([("APR1400", 1000)], "capacityFactor")[0])
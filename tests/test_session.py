@@ -0,0 +1,45 @@
+import pytest
+
+import input.code.Cash_Flow_Statement as CF
+from session import Session
+
+
+class StageFailure(Exception):
+    pass
+
+
+@pytest.fixture(scope="module")
+def session():
+    return Session("APR1400", 1400)
+
+
+def _raise(*args, **kwargs):
+    # patched into the financing stage (main_for_loop.RUN_STAGES), which interestRate edits recompute
+    raise StageFailure("financing failed")
+
+
+def test_failed_set_keeps_state(session, monkeypatch):
+    session.set(interestRate=0.06)
+    overrides, metrics, stages = dict(session.overrides), dict(session.metrics), dict(session.stages)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CF, "INTERESTnDEBTrepayment", _raise)
+        with pytest.raises(StageFailure):
+            session.set(interestRate=0.07)
+
+    assert session.overrides == overrides
+    assert session.metrics == metrics
+    assert session.stages == stages
+    assert session.config.interestRate == 0.06
+
+
+def test_set_after_failure(session, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setattr(CF, "INTERESTnDEBTrepayment", _raise)
+        with pytest.raises(StageFailure):
+            session.set(interestRate=0.07)
+
+    metrics = session.set(taxRate=0.2)
+    assert session.overrides["taxRate"] == 0.2
+    assert session.overrides.get("interestRate") != 0.07
+    assert metrics == session.metrics